@@ -6,6 +6,10 @@ implementations.
 Listing
 --------------
 _mp_objmethod, function
+_init_worker_oracle, function
+_mp_hitat, function
+_mp_search, function
+BudgetExhausted(Exception), class
 MOSOSolver(object), class
 RASolver(MOSOSolver), class
 RLESolver(RASolver), class
@@ -13,10 +17,11 @@ Oracle(object), class
 """
 from statistics import mean, variance
 from math import sqrt, ceil, floor
-from .prng.mrg32k3a import get_next_prnstream, jump_substream, mrg32k3a, bsm
+from .prng.mrg32k3a import get_next_prnstream, jump_substream, jump_substreams, mrg32k3a, bsm
 import multiprocessing as mp
 import sys
-from .chnutils import perturb, argsort, enorm, get_setnbors, get_nbors, is_lwep, get_nondom, does_strict_dominate, does_weak_dominate, does_dominate, get_biparetos
+import time
+from .chnutils import perturb, argsort, enorm, get_setnbors, get_nbors, is_lwep, get_nondom, does_strict_dominate, does_weak_dominate, does_dominate, get_biparetos, get_archive, get_schedule, param_bool
 
 
 def _mp_objmethod(instance, name, args=(), kwargs=None):
@@ -50,6 +55,120 @@ def _mp_objmethod(instance, name, args=(), kwargs=None):
     return getattr(instance, name)(*args, **kwargs)
 
 
+# the Oracle of a worker process, sent once when the process starts
+_worker_oracle = None
+
+# the shared data of each Oracle class, loaded once per process
+_oracle_data = dict()
+
+# the chnutils.Scheduler of a worker process which shares its workers
+# between runs and their parallel replications
+_rep_scheduler = None
+
+
+def _init_worker_oracle(orc):
+    """
+    Keep an Oracle in a worker process for all of its tasks, so that 
+    tasks send only random number states and points. 
+    
+    Parameters
+    ----------
+    orc : Oracle
+    """
+    global _worker_oracle
+    _worker_oracle = orc
+
+
+def _mp_hitat(state, obsstate, x, m, orc=None, name='hit'):
+    """
+    Simulate a point with the worker Oracle, or 'orc', starting from 
+    given random number states, for use in multiprocessing functions.
+    
+    Parameters
+    ----------
+    state : tuple
+        The state of 'orc.rng' at which to start
+    obsstate : tuple
+        The rewind state 'orc.crn_obsold' at which to start
+    x : tuple of int
+    m : int
+    orc : Oracle, optional
+    name : str, optional
+        Either 'hit', the default, or 'bump'
+    
+    Returns
+    -------
+    tuple
+        The output of 'orc.hit(x, m)' or 'orc.bump(x, m)'
+    """
+    if orc is None:
+        orc = _worker_oracle
+    orc.rng.setstate(state)
+    orc.crn_obsold = obsstate
+    return getattr(orc, name)(x, m)
+
+
+def _mp_search(solver, name, args, state, obsstate, sstate, budget):
+    """
+    Call a search method of a solver starting from given random number 
+    states, for use in multiprocessing functions.
+    
+    Parameters
+    ----------
+    solver : RASolver
+    name : str
+        The name of the 'solver' method to call
+    args : tuple
+        Positional arguments of 'solver.name'
+    state : tuple
+        The state of 'solver.orc.rng' at which to start
+    obsstate : tuple
+        The rewind state 'solver.orc.crn_obsold' at which to start
+    sstate : tuple
+        The state of 'solver.sprn' at which to start
+    budget : int
+        The budget of the search copy of 'solver'
+    
+    Returns
+    -------
+    res
+        The output of 'solver.name(*args)', or None if the search ran
+        out of budget
+    newg : dict
+        Entries of 'solver.gbar' added by the search
+    newse : dict
+        Entries of 'solver.sehat' added by the search
+    ncalls : int
+        The number of calls to orc.g made by the search
+    exhausted : bool
+        True if the search ran out of budget
+    """
+    solver.orc.rng.setstate(state)
+    solver.orc.crn_obsold = obsstate
+    solver.sprn.setstate(sstate)
+    solver.budget = budget
+    oldx = set(solver.gbar)
+    old_calls = solver.num_calls
+    exhausted = False
+    try:
+        res = getattr(solver, name)(*args)
+    except BudgetExhausted:
+        res = None
+        exhausted = True
+    newg = {x: solver.gbar[x] for x in solver.gbar if not x in oldx}
+    newse = {x: solver.sehat[x] for x in newg}
+    ncalls = solver.num_calls - old_calls
+    return res, newg, newse, ncalls, exhausted
+
+
+class BudgetExhausted(Exception):
+    """
+    Raised by an RASolver with 'preempt' set when the budget cannot
+    pay for the next simulation, or when its time budget runs out. 
+    """
+    pass
+
+
 class MOSOSolver(object):
     """
     Base class for solver implentations.
@@ -104,6 +223,14 @@ class RASolver(MOSOSolver):
 		Affects the iteration sample sizes. Default is 2
 	bconst : int
 		Affects the iteration sampling search limits. 
+	mschedule : chnutils.Schedule
+		Computes the iteration sample sizes from 'mconst', chosen by 
+		the name 'mschedule' among chnutils.SCHEDULES with the rate 
+		'mrate'. Default is 'geometric' with rate 1.1. 
+	bschedule : chnutils.Schedule
+		Computes the iteration search limits from 'bconst', chosen by 
+		the name 'bschedule' with the rate 'brate'. Default is 
+		'geometric' with rate 1.2.
 	sprn : prng.MRG32k3a object. Default is 8.
 		Pseudo-random number stream available to the solver, should
 		generate independently of orc.rng.
@@ -125,6 +252,35 @@ class RASolver(MOSOSolver):
 		The iteration number
 	endseed : tuple of int
 		The next seed to be used by 'orc.rng'
+	workers : int
+		Number of processes with which to simulate independent points,
+		e.g. the vertices of a simplex in 'pli'. Default is 1.
+	specdepth : int
+		Number of line search steps in 'spli' to simulate together when
+		'workers' > 1. Steps beyond the one that ends the search are 
+		still charged to the search limit 'b'. Default is 1.
+	parsearch : bool
+		If True and 'workers' > 1, independent searches, e.g. the
+		SPLINE search of each objective in 'get_min' or the epsilon
+		chains of R-Pe, run at the same time. Each search draws from its own substreams, so results
+		differ from, but are as reproducible as, the default False.
+	preempt : bool
+		If True, stop as soon as the budget cannot pay for the next
+		point, even in the middle of an iteration, and report the 
+		non-dominated points estimated so far in that iteration. 
+		Default is False, i.e. stop only between iterations.
+	budget : int
+		The budget of the current 'solve'
+	time_budget : float
+		Wall-clock seconds allowed to each 'solve'. When they run out,
+		the solver stops at the next iteration or simulation, as with
+		'preempt'. Default is float('inf'). 
+	deadline : float
+		The time.time() at which the current 'solve' must stop
+	start_time : float
+		The time.time() at which the current 'solve' started
+	pool : multiprocessing.Pool
+		The pool of 'workers' processes while solving, or None
 		
 	Parameters
 	----------
@@ -141,6 +297,28 @@ class RASolver(MOSOSolver):
         self.nbor_rad = kwargs.pop('radius', 1)
         self.mconst = kwargs.pop('mconst', 2)
         self.bconst = kwargs.pop('bconst', 8)
+        self.m = 0
+        self.b = 0
+        self.gbar = dict()
+        self.sehat = dict()
+        mname = kwargs.pop('mschedule', 'geometric')
+        bname = kwargs.pop('bschedule', 'geometric')
+        try:
+            self.mschedule = get_schedule(mname, 'm', kwargs.pop('mrate', None))
+            self.bschedule = get_schedule(bname, 'b', kwargs.pop('brate', None))
+            self.parsearch = param_bool(kwargs.pop('parsearch', False))
+            self.preempt = param_bool(kwargs.pop('preempt', False))
+        except ValueError:
+            print('--* Error: ', sys.exc_info()[1])
+            print('--* Aborting. ')
+            sys.exit()
+        self.workers = int(kwargs.pop('workers', 1))
+        self.specdepth = int(kwargs.pop('specdepth', 1))
+        self.budget = float('inf')
+        self.time_budget = float(kwargs.pop('time_budget', float('inf')))
+        self.deadline = float('inf')
+        self.start_time = None
+        self.pool = None
         try:
             self.sprn = kwargs.pop('sprn')
             self.x0 = kwargs.pop('x0')
@@ -150,6 +328,18 @@ class RASolver(MOSOSolver):
             sys.exit()
         super().__init__(orc)
 
+    def __getstate__(self):
+        """
+        Copy the solver for other processes, without the pool.
+        
+        Returns
+        -------
+        state : dict
+        """
+        state = self.__dict__.copy()
+        state['pool'] = None
+        return state
+
     def solve(self, budget):
         """
         Solves the MOSO problem implicitly implemented in orc.
@@ -162,22 +352,66 @@ class RASolver(MOSOSolver):
 		Returns
 		-------
 		resdict : dict
+			Includes 'simtimes', the seconds elapsed at the end of each
+			iteration
         """
-        seed1 = self.orc.rng.get_seed()
-        self.endseed = seed1
         lesnu = dict()
         simcalls = dict()
+        simtimes = dict()
         lesnu[0] = set() | {self.x0}
         simcalls[0] = 0
+        simtimes[0] = 0.0
+        for state in self.iter_solve(budget):
+            nu = state['nu']
+            lesnu[nu] = state['ales']
+            simcalls[nu] = state['simcalls']
+            simtimes[nu] = state['simtime']
+        # name the data keys and return the results
+        resdict = {'itersoln': lesnu, 'simcalls': simcalls, 'endseed': self.endseed, 'simtimes': simtimes}
+        return resdict
+
+    def iter_solve(self, budget):
+        """
+        Solve as 'solve' does, but yield the state of each iteration as
+        soon as it finishes instead of keeping every iteration. The 
+        caller may stop early by leaving the loop. 
+        
+        Parameters
+        ----------
+        budget : int
+			The maximum number of calls allowed to orc.g
+		
+		Yields
+		------
+		state : dict
+			The state of the iteration, with keys 'nu', 'ales' (the
+			solution), 'simcalls' (the cumulative calls to orc.g), 'm',
+			'b', 'simtime' (seconds elapsed since the start), and 
+			'endseed' (the seed from which to continue)
+        """
+        self.start_time = time.time()
+        self.deadline = self.start_time + self.time_budget
+        seed1 = self.orc.rng.get_seed()
+        self.endseed = seed1
+        self.budget = budget
         # initialize the iteration counter
         self.nu = 0
         # invoke the Retrospective approximation algorithm
-        self.rasolve(lesnu, simcalls, budget)
-        # name the data keys and return the results
-        resdict = {'itersoln': lesnu, 'simcalls': simcalls, 'endseed': self.endseed}
-        return resdict
+        if self.workers > 1 and mp.current_process().daemon:
+            print('--* Warning: Cannot start workers inside a parallel run. ')
+            print('--* Continuing: points are simulated one at a time. ')
+            self.workers = 1
+        if self.workers > 1:
+            with mp.Pool(self.workers, _init_worker_oracle, (self.orc, )) as pool:
+                self.pool = pool
+                try:
+                    yield from self.iter_rasolve({self.x0}, budget)
+                finally:
+                    self.pool = None
+        else:
+            yield from self.iter_rasolve({self.x0}, budget)
 
-    def rasolve(self, phatnu, simcalls, budget):
+    def rasolve(self, phatnu, simcalls, budget, simtimes=None):
         """
         Repeatedly solve the sample-path problem using a sequence of 
         increasing sample sizes. 
@@ -190,27 +424,110 @@ class RASolver(MOSOSolver):
 			Dictionary of {iteration int : int of calls to orc.g}
 		budget : int
 			Total number of calls allowed to orc.g across all iterations
+		simtimes : dict, optional
+			Dictionary of {iteration int : float seconds elapsed since
+			'simtimes[0]' was recorded}
 			
 		Notes
 		-----
 		This updates does not return anything, it updates the simcalls,
 		phatnu dictionaries and the endseed value.  
         """
+        if simtimes is None:
+            simtimes = {self.nu: 0.0}
+        self.start_time = time.time() - simtimes[self.nu]
+        for state in self.iter_rasolve(phatnu[self.nu], budget):
+            nu = state['nu']
+            phatnu[nu] = state['ales']
+            simcalls[nu] = state['simcalls']
+            simtimes[nu] = state['simtime']
+
+    def iter_rasolve(self, aold, budget):
+        """
+        Repeatedly solve the sample-path problem using a sequence of 
+        increasing sample sizes, yielding the state of each iteration.
         
-        while self.num_calls < budget:
+        Parameters
+        ----------
+        aold : set of tuple of int
+			The solution of iteration 'nu' from which to start
+		budget : int
+			Total number of calls allowed to orc.g across all iterations
+		
+		Yields
+		------
+		state : dict
+			See 'iter_solve'
+        """
+        while self.num_calls < budget and not self.past_deadline():
+            # with preempt, do not start an iteration which cannot 
+            # estimate a single point
+            if self.calc_m(self.nu + 1) > self.budget_left():
+                break
             self.nu += 1
             self.m = self.calc_m(self.nu)
             self.b = self.calc_b(self.nu)
             self.gbar = dict()
             self.sehat = dict()
             #print(self.nu)
-            #print('warm start: ', phatnu[self.nu - 1])
-            aold = phatnu[self.nu - 1]
-            phatnu[self.nu] = self.spsolve(aold)
-            #print('spsolve: ', phatnu[self.nu])
-            simcalls[self.nu] = self.num_calls
+            #print('warm start: ', aold)
+            exhausted = False
+            try:
+                anew = self.spsolve(aold)
+            except BudgetExhausted:
+                anew = self.budget_soln(aold)
+                exhausted = True
+            #print('spsolve: ', anew)
+            simtime = time.time() - self.start_time
             self.orc.crn_advance()
             self.endseed = self.orc.rng.get_seed()
+            yield {'nu': self.nu, 'ales': anew, 'simcalls': self.num_calls, 'm': self.m, 'b': self.b, 'simtime': simtime, 'endseed': self.endseed}
+            if exhausted:
+                break
+            aold = anew
+
+    def budget_left(self):
+        """
+        Compute the number of calls to orc.g left in the budget.
+        
+        Returns
+        -------
+        float
+            The remaining budget if 'preempt' is set, otherwise 
+            float('inf')
+        """
+        if not self.preempt:
+            return float('inf')
+        return self.budget - self.num_calls
+
+    def past_deadline(self):
+        """
+        Check whether the time budget has run out.
+        
+        Returns
+        -------
+        bool
+        """
+        return time.time() >= self.deadline
+
+    def budget_soln(self, aold):
+        """
+        Choose the solution of an iteration which ran out of budget: 
+        the non-dominated points estimated in the iteration. 
+        
+        Parameters
+        ----------
+        aold : set of tuple of int
+            The solution of the previous iteration, kept if no point 
+            was estimated
+        
+        Returns
+        -------
+        set of tuple of int
+        """
+        if not self.gbar:
+            return aold
+        return get_nondom(self.gbar)
 
     def get_min(self, mcS):
         """
@@ -234,15 +551,78 @@ class RASolver(MOSOSolver):
         xmin = set()
         krange = range(self.num_obj)
         mcT = set()
+        searches = []
         for k in krange:
             kmin = min(mcS | {self.x0}, key=lambda t: self.gbar[t][k])
-            tb, xmink, _, _ = self.spline(kmin, unconst, k, kcon)
+            searches.append((kmin, unconst, k, kcon))
+        for tb, xmink, _, _ in self.search_many('spline', searches):
             xmin |= {xmink}
             mcT |= tb
         tmp = {x: self.gbar[x] for x in xmin | mcS | mcT | {self.x0}}
         xmin = get_nondom(tmp)
         return xmin
 
+    def search_many(self, name, argslst):
+        """
+        Call a search method once for each tuple of arguments. If 
+        'parsearch' is set and the solver has a pool, the searches run
+        at the same time on copies of the solver, each starting at its
+        own block of substreams, and their estimates are merged in the
+        order of 'argslst' afterwards. 
+        
+        Parameters
+        ----------
+        name : str
+            The name of the search method, e.g. 'spline'
+        argslst : list of tuple
+            Positional arguments of each search
+        
+        Returns
+        -------
+        list
+            The output of each search, in the order of 'argslst'
+        
+        Notes
+        -----
+        The searches run in order when 'orc.simpar' is more than 1, 
+        since the pool processes cannot start the pools of parallel 
+        replications. 
+        """
+        if not self.parsearch or self.pool is None or len(argslst) < 2 or not self.orc.simpar == 1:
+            return [getattr(self, name)(*args) for args in argslst]
+        # substreams reserved for each search
+        numsub = 2**32
+        # the searches share what is left of the budget equally
+        budget = self.budget
+        if self.preempt:
+            budget = self.num_calls + (self.budget - self.num_calls)//len(argslst)
+        orc = self.orc
+        starts = []
+        for args in argslst:
+            starts.append((orc.rng.getstate(), orc.crn_obsold, self.sprn.getstate()))
+            jump_substreams(orc.rng, numsub)
+            orc.crn_setobs()
+            orc.crn_check()
+            jump_substreams(self.sprn, numsub)
+        pres = [self.pool.apply_async(_mp_search, (self, name, args) + st + (budget, )) for args, st in zip(argslst, starts)]
+        # the solver is sent to the pool lazily, so wait for every
+        # search before changing it
+        outs = [r.get() for r in pres]
+        reslst = []
+        exhausted = False
+        for res, newg, newse, ncalls, exh in outs:
+            # points estimated by more than one search keep the first value
+            for x in newg:
+                if not x in self.gbar:
+                    self.gbar[x] = newg[x]
+                    self.sehat[x] = newse[x]
+            self.num_calls += ncalls
+            exhausted = exhausted or exh
+            reslst.append(res)
+        if exhausted:
+            raise BudgetExhausted
+        return reslst
+
     def spline(self, x0, e=float('inf'), nobj=0, kcon=0):
         """
         Generate an sample path local minimizer using pseudo-gradients
@@ -334,9 +714,13 @@ class RASolver(MOSOSolver):
         nbor_rad = self.nbor_rad
         # optimize the case for neighborhood radius of 1
         if nbor_rad == 1:
+            xl = list(x)
             for i in range(q):
-                xp1 = tuple(x[j] + 1 if i == j else x[j] for j in range(q))
-                xm1 = tuple(x[j] - 1 if i == j else x[j] for j in range(q))
+                xl[i] = x[i] + 1
+                xp1 = tuple(xl)
+                xl[i] = x[i] - 1
+                xm1 = tuple(xl)
+                xl[i] = x[i]
                 isfeas1, fxp1, vxp1 = self.estimate(xp1, e, kcon)
                 if isfeas1:
                     n += m
@@ -403,22 +787,25 @@ class RASolver(MOSOSolver):
         p.reverse()
         z = sorted(zi, reverse=True)
         w = tuple(z[i] - z[i + 1] for i in range(q + 1))
-        prevx = x0
+        # each vertex steps the previous one in a single coordinate
+        xl = list(x0)
         for i in range(1,q + 1):
-            x1 = tuple(prevx[j] + 1 if j == p[i] else prevx[j] for j in range(q))
-            simp.append(x1)
-            prevx = x1
+            if p[i] < q:
+                xl[p[i]] += 1
+            simp.append(tuple(xl))
         n = 0
         t = 0
         gbat = 0
         ghat = {}
         xbest = None
         fxbest = None
+        # the vertices are independent, so simulate them together
+        ests = self.estimate_many(simp)
         for i in range(q + 1):
-            isfeas, fx, vx = self.estimate(simp[i])
+            isfeas, fx, vx = ests[i]
             if isfeas:
-                isfeas2, fx, vx = self.estimate(simp[i], e, kcon)
-                if isfeas2:
+                # the constraint check of estimate, without the lookup
+                if not fx[kcon] > e:
                     if not xbest:
                             xbest = simp[i]
                             fxbest = fx
@@ -487,6 +874,8 @@ class RASolver(MOSOSolver):
         fxs = fx0
         sexs = sex0
         n = 0
+        # speculate on the line search only when points can run in parallel
+        depth = max(self.specdepth, 1) if self.pool else 1
         stop_loop = False
         while not stop_loop:
             x1 = perturb(x0, sprn)
@@ -504,12 +893,23 @@ class RASolver(MOSOSolver):
                 break
             i = 0
             x0 = xs
+            gnorm = enorm(gamma)
+            steps = []
             should_stop = False
             while not should_stop:
                 i += 1
-                s = ss*pow(c, i - 1)
-                x1 = tuple(int(floor(x0[j] - s*gamma[j]/enorm(gamma))) for j in range(q))
-                isfeas, fx1, sex1 = self.estimate(x1, e, kcon)
+                if not steps:
+                    # the step points depend only on x0 and gamma, so
+                    # simulate the next 'depth' of them together
+                    for k in range(i, i + depth):
+                        s = ss*pow(c, k - 1)
+                        steps.append(tuple(int(floor(x0[j] - s*gamma[j]/gnorm)) for j in range(q)))
+                    unseen = {x for x in steps if x not in self.gbar}
+                    ests = self.estimate_many(steps, e, kcon)
+                    isnew = [x in unseen and x in self.gbar for x in steps]
+                x1 = steps.pop(0)
+                isfeas, fx1, sex1 = ests.pop(0)
+                isnew.pop(0)
                 if isfeas:
                     n += m
                     if fx1[nobj] < fxs[nobj]:
@@ -518,6 +918,8 @@ class RASolver(MOSOSolver):
                         sexs = sex1
                 if not x1 == xs or n > b:
                     should_stop = True
+            # charge the simulated steps the search did not reach
+            n += m*len({x for x, new in zip(steps, isnew) if new})
             x0 = xs
             if i <= 2:
                 stop_loop = True
@@ -557,45 +959,10 @@ class RASolver(MOSOSolver):
             vx = self.sehat[x]
         #if not, perform sampling
         else:
+            if m > self.budget_left() or self.past_deadline():
+                raise BudgetExhausted
             #print('in: ', self.orc.rng.get_seed())
-            try:
-                isfeas, fx, vx = self.orc.hit(x, m)
-            except TypeError:
-                print('--* Error: Unable to simulate ', type(self.orc).__name__, '. ')
-                print('--* Message: ', sys.exc_info()[1])
-                print('--* Ensure the g signature is g(self, x, rng). ')
-                print('--* Ensure isfeas, (obj1, obj2, ...) is returned. ')
-                print('--* Aborting. ')
-                sys.exit()
-            except ZeroDivisionError:
-                print('--* Error: Unable to simulate ', type(self.orc).__name__, '. ')
-                print('--* Message: ', sys.exc_info()[1])
-                print('--* Aborting. ')
-                sys.exit()
-            except ValueError:
-                print('--* Error: Unable to simulate ', type(self.orc).__name__, '. ')
-                print('--* Message: ', sys.exc_info()[1])
-                print('--* Ensure the g signature is g(self, x, rng). ')
-                print('--* Ensure isfeas, (obj1, obj2, ...) is returned. ')
-                print('--* Aborting. ')
-                sys.exit()
-            except AttributeError:
-                print('--* Error: Unable to simulate ', type(self.orc).__name__, '. ')
-                print('--* Message: ', sys.exc_info()[1])
-                print('--* Are you missing an import?')
-                print('--* Aborting. ')
-                sys.exit()
-            except IndexError:
-                print('--* Error: Unable to simulate ', type(self.orc).__name__, '. ')
-                print('--* Message: ', sys.exc_info()[1])
-                print('--* Ensure len(obj1, obj2, ..) == num_obj')
-                print('--* Aborting. ')
-                sys.exit()
-            except:
-                print('--* Error: Unable to simulate ', type(self.orc).__name__, '. ')
-                print('--* Message: ', sys.exc_info()[1])
-                print('--* Aborting. ')
-                sys.exit()
+            isfeas, fx, vx = self.simulate([x])[0]
             if isfeas:
                 #print('out: ', self.orc.rng.get_seed())
                 self.num_calls += m
@@ -608,6 +975,127 @@ class RASolver(MOSOSolver):
                 isfeas = False
         return isfeas, fx, vx
 
+    def simulate(self, xlst):
+        """
+        Take the iteration sample size of replications at each point of
+        a list, in parallel on 'pool' if the solver has one, and abort
+        with a message if the oracle fails. 
+        
+        Parameters
+        ----------
+        xlst : list of tuple of int
+            Points to simulate
+        
+        Returns
+        -------
+        list of tuple
+            The output of 'orc.hit' for each point of 'xlst'
+        """
+        m = self.m
+        try:
+            return self.orc.hit_many(xlst, m, self.pool)
+        except TypeError:
+            print('--* Error: Unable to simulate ', type(self.orc).__name__, '. ')
+            print('--* Message: ', sys.exc_info()[1])
+            print('--* Ensure the g signature is g(self, x, rng). ')
+            print('--* Ensure isfeas, (obj1, obj2, ...) is returned. ')
+            print('--* Aborting. ')
+            sys.exit()
+        except ZeroDivisionError:
+            print('--* Error: Unable to simulate ', type(self.orc).__name__, '. ')
+            print('--* Message: ', sys.exc_info()[1])
+            print('--* Aborting. ')
+            sys.exit()
+        except ValueError:
+            print('--* Error: Unable to simulate ', type(self.orc).__name__, '. ')
+            print('--* Message: ', sys.exc_info()[1])
+            print('--* Ensure the g signature is g(self, x, rng). ')
+            print('--* Ensure isfeas, (obj1, obj2, ...) is returned. ')
+            print('--* Aborting. ')
+            sys.exit()
+        except AttributeError:
+            print('--* Error: Unable to simulate ', type(self.orc).__name__, '. ')
+            print('--* Message: ', sys.exc_info()[1])
+            print('--* Are you missing an import?')
+            print('--* Aborting. ')
+            sys.exit()
+        except IndexError:
+            print('--* Error: Unable to simulate ', type(self.orc).__name__, '. ')
+            print('--* Message: ', sys.exc_info()[1])
+            print('--* Ensure len(obj1, obj2, ..) == num_obj')
+            print('--* Aborting. ')
+            sys.exit()
+        except:
+            print('--* Error: Unable to simulate ', type(self.orc).__name__, '. ')
+            print('--* Message: ', sys.exc_info()[1])
+            print('--* Aborting. ')
+            sys.exit()
+
+    def estimate_many(self, xlst, con=float('inf'), nobj=0):
+        """
+        Estimate a list of points as repeated calls to 'estimate' would,
+        except that the points not yet sampled in this iteration are 
+        simulated together, up to the next repeat of one, so in parallel
+        if the solver has a pool. The random number streams and call 
+        counts are those of the repeated calls, which simulate a 
+        repeated point again if it was infeasible. 
+        
+        Parameters
+        ----------
+        xlst : list of tuple of int
+            Points to simulate
+        con : float
+            Constraint value to check feasibility, default is
+            float('inf') i.e. unconstrained
+        nobj : int
+            Index of objective to constrain, default is 0
+        
+        Returns
+        -------
+        list of tuple
+            The output of 'estimate' for each point of 'xlst'
+        """
+        m = self.m
+        ests = []
+        start = 0
+        while start < len(xlst):
+            ## simulate together the new points up to the next repeat of 
+            ## one, which 'estimate' simulates again if it was infeasible
+            newx = []
+            stop = start
+            while stop < len(xlst) and not xlst[stop] in newx:
+                if not xlst[stop] in self.gbar:
+                    newx.append(xlst[stop])
+                stop += 1
+            infeas = dict()
+            while newx:
+                # simulate only the points the budget can pay for
+                nfit = len(newx)
+                if m*nfit > self.budget_left():
+                    nfit = max(int(self.budget_left()//m), 0)
+                if nfit and self.past_deadline():
+                    nfit = 0
+                if not nfit:
+                    raise BudgetExhausted
+                for x, res in zip(newx[:nfit], self.simulate(newx[:nfit])):
+                    isfeas, fx, vx = res
+                    if isfeas:
+                        self.num_calls += m
+                        self.gbar[x] = fx
+                        self.sehat[x] = vx
+                    else:
+                        infeas[x] = res
+                ## infeasible points cost nothing, so more may now fit
+                newx = newx[nfit:]
+            for x in xlst[start:stop]:
+                if x in self.gbar:
+                    isfeas = not self.gbar[x][nobj] > con
+                    ests.append((isfeas, self.gbar[x], self.sehat[x]))
+                else:
+                    ests.append(infeas[x])
+            start = stop
+        return ests
+
     # def spsolve(self, warm_start):
     #     """Solve a sample path problem. Implement this in the child class."""
     #     pass
@@ -648,10 +1136,7 @@ class RASolver(MOSOSolver):
 		int
 			The sample size
         """
-        
-        mmul = 1.1
-        m_init = self.mconst
-        return ceil(m_init*pow(mmul, nu))
+        return self.mschedule(self, nu, self.mconst, self.m)
 
     def calc_b(self, nu):
         """
@@ -667,9 +1152,7 @@ class RASolver(MOSOSolver):
 		int
 			The sample limit
         """
-        mmul = 1.2
-        m_init = self.bconst*(self.dim - 1)
-        return ceil(m_init*pow(mmul, nu))
+        return self.bschedule(self, nu, self.bconst*(self.dim - 1), self.b)
 
     def remove_nlwep(self, mcS):
         """
@@ -787,6 +1270,8 @@ class RLESolver(RASolver):
         """
         try:
             anew = self.accel(warm_start)
+        except BudgetExhausted:
+            raise
         except AttributeError:
             print('--* ', type(self).__name__, 'Error: Unable to run accel(). ')
             print('--* Message: ', sys.exc_info()[1])
@@ -846,27 +1331,34 @@ class RLESolver(RASolver):
         #     sys.exit()
         b = self.b
         n = 0
+        # keep the non-dominated candidates in an archive which is
+        # updated as points are found instead of refiltering each loop
+        archive = get_archive(self.num_obj)
         # try:
-        tmp = {s: self.gbar[s] for s in mcS | mcXw}
+        for s in mcS | mcXw:
+            archive.insert(s, self.gbar[s])
         # except KeyError:
         #     print('--* RLE Error: No simulated points.')
         #     print('--* Message: ', sys.exc_info()[1])
         #     print('--* Is x0 feasible?')
         #     print('--* Aborting. ')
         #     sys.exit()
-        mcS = get_nondom(tmp)
+        mcS = archive.points()
         mcNnc = self.get_ncn(mcS)
         while n <= b and mcNnc:
             old_calls = self.num_calls
             mcNw, mcNd = self.remove_nlwep(mcNnc)
             mcNd -= mcS
             rlwepcalls = self.num_calls - old_calls
-            mcS |= mcNw
+            for s in mcNw:
+                archive.insert(s, self.gbar[s])
             if not mcNw:
                 mcXw = self.seek_lwep(mcNd, mcS)
-                mcS |= mcXw
-            tmp = {s: self.gbar[s] for s in mcS | {self.x0}}
-            mcS = get_nondom(tmp)
+                for s in mcXw:
+                    archive.insert(s, self.gbar[s])
+            # x0 need not be offered again: whatever removed it from
+            # the archive, or a point dominating that, is still there
+            mcS = archive.points()
             old_calls = self.num_calls
             mcNnc = self.get_ncn(mcS)
             ncncalls = self.num_calls - old_calls
@@ -1014,6 +1506,13 @@ class Oracle(object):
 		Defaults to off.
 	simpar : int
 		Number of processes to use when doing simulations. Defaults to 1
+	simblocks : int
+		Number of blocks of replications per process when doing 
+		simulations in parallel. Defaults to 4
+	simmin : int
+		Fewest replications which 'hit' simulates in parallel when 
+		'simpar' is more than 1, fewer are simulated serially. 
+		Defaults to 2
 	dim : int
 		Number of dimensions of feasible points
 	num_obj : int
@@ -1030,9 +1529,40 @@ class Oracle(object):
         self.crnold_state = rng.getstate()
         self.crnflag = False
         self.simpar = 1
+        self.simblocks = 4
+        self.simmin = 2
         self.crn_obsold = rng.getstate()
         super().__init__()
 
+    @classmethod
+    def load_data(cls):
+        """
+        Load data which every Oracle of the class uses and never 
+        changes, such as large lookup tables. Sub-classes with such 
+        data override this and call 'get_data' to obtain it. 
+        
+        Returns
+        -------
+        None
+        """
+        return None
+
+    @classmethod
+    def get_data(cls):
+        """
+        Return the 'load_data' output of the class, loading it once per
+        process. Worker processes load it when they start, and then 
+        every Oracle they build uses the same copy. 
+        
+        Returns
+        -------
+        data
+            The output of 'load_data'
+        """
+        if cls not in _oracle_data:
+            _oracle_data[cls] = cls.load_data()
+        return _oracle_data[cls]
+
     def set_crnflag(self, crnflag):
         """
         Set the common random number (crn) flag and intialize the 
@@ -1065,12 +1595,13 @@ class Oracle(object):
 
     def crn_advance(self):
         """
-        Jump ahead to the new crn baseline, and set the new rewind point
+        Jump ahead to the new crn baseline, and set the new rewind point.
+        Parallel replications use the substreams of this stream, as 
+        serial ones do, so the next baseline is one stream ahead 
+        whatever 'simpar' is. 
         """
-        numjumps = self.simpar
         self.crn_reset()
-        for i in range(numjumps):
-            self.rng = get_next_prnstream(self.rng.get_seed(), self.crnflag)
+        self.rng = get_next_prnstream(self.rng.get_seed(), self.crnflag)
         new_oldstate = self.rng.getstate()
         self.set_crnold(new_oldstate)
         self.crn_obsold = new_oldstate
@@ -1101,6 +1632,56 @@ class Oracle(object):
         jump_substream(self.rng)
         self.crn_setobs()
 
+    def skip_hit(self, m):
+        """
+        Advance the random number streams as 'hit' with 'm' 
+        replications does, without simulating. 
+        
+        Parameters
+        ----------
+        m : int
+        """
+        for i in range(m):
+            self.crn_nextobs()
+        self.crn_check()
+
+    def hit_many(self, xlst, m, pool=None):
+        """
+        Simulate 'm' replications at each point of a list. With a pool,
+        each point is simulated in parallel starting from the streams
+        it would have in turn, so that the results and final streams are
+        those of calling 'hit' on each point in order. The processes of
+        the pool must have been started with '_init_worker_oracle' and
+        this Oracle. 
+        
+        Parameters
+        ----------
+        xlst : list of tuple of int
+            points at which to simulate
+        m : int
+            number of replications to simulate each point
+        pool : multiprocessing.Pool, optional
+        
+        Returns
+        -------
+        list of tuple
+            The output of 'hit' for each point of 'xlst'
+        
+        Notes
+        -----
+        Points are simulated in order when 'simpar' is more than 1, 
+        since the replications are then already parallel. 
+        """
+        if pool is None or len(xlst) < 2 or not self.simpar == 1:
+            return [self.hit(x, m) for x in xlst]
+        ## record the streams of each point, then advance past them all
+        starts = []
+        for x in xlst:
+            starts.append((self.rng.getstate(), self.crn_obsold))
+            self.skip_hit(m)
+        pres = [pool.apply_async(_mp_hitat, (st[0], st[1], x, m)) for x, st in zip(xlst, starts)]
+        return [r.get() for r in pres]
+
     def bump(self, x, m):
         """
         Simulate 'm' replications at 'x' and return the replication 
@@ -1181,8 +1762,9 @@ class Oracle(object):
             obse = [0 for o in objd]
             self.crn_nextobs()
         else:
-            if self.simpar == 1:
-                ## do not parallelize replications
+            if self.simpar == 1 or m < self.simmin:
+                ## do not parallelize replications, either by choice or
+                ## because too few of them repay the overhead
                 feas = []
                 objm = []
                 for i in mr:
@@ -1198,61 +1780,51 @@ class Oracle(object):
             else:
                 sim_old = self.simpar
                 ## obtain replications in parallel
-                ## divide m into chunks for the processors
+                ## divide m into small blocks which idle processes take in 
+                ## turn, so that slow replications do not hold up the rest
                 nproc = self.simpar
                 if self.simpar > m:
                     nproc = m
-                pr = range(nproc)
-                num_rands = [int(m/nproc) for i in pr]
-                for i in range(m % nproc):
-                    num_rands[i] += 1
-                ## create prn for each process by jumping ahead 2^127 spots
-                ## and a hit function for each using an oracle object
-                start_seed = self.rng.get_seed()
+                nblocks = min(m, nproc*self.simblocks)
+                bsize = ceil(m/nblocks)
+                num_rands = [bsize for i in range(m//bsize)]
+                if m % bsize:
+                    num_rands.append(m % bsize)
+                pr = range(len(num_rands))
+                ## block i starts sum(num_rands[:i]) substreams after the
+                ## first, as in serial replications, whichever process 
+                ## takes it. then move past all m substreams
+                starts = []
+                for r in num_rands:
+                    starts.append((self.rng.getstate(), self.crn_obsold))
+                    for i in range(r):
+                        self.crn_nextobs()
                 ## turn off simpar during parallelization
                 self.simpar = 1
-                orclst = [self]
-                prnrng = range(len(num_rands) - 1)
-                for i in prnrng:
-                    nextprn = get_next_prnstream(start_seed)
-                    start_seed = nextprn.get_seed()
-                    myorc = Oracle(nextprn)
-                    myorc.num_obj = self.num_obj
-                    myorc.dim = self.dim
-                    myorc.g = self.g
-                    orclst.append(myorc)
-                ## take the replications in parallel
-                pres = []
+                ## take the replications in parallel, each process keeps a 
+                ## copy of this oracle so tasks carry only the streams. 
+                ## blocks return their observations, so that the statistics
+                ## are computed from the same values in the same order as 
+                ## serial replications
                 feas = []
-                means = []
-                ses = []
-                with mp.Pool(nproc) as p:
-                    #[print('cha1: ', orc.rng.get_seed()) for orc in orclst]
-                    for i, r in enumerate(num_rands):
-                        # this is weird but i guess possible
-                        pres.append(p.apply_async(_mp_objmethod, (orclst[i], 'hit', (x, r))))
-                    for i in pr:
-                        ## 0 = feas, 1 = mean, 2 = se
-                        res = pres[i].get()
-                        feas.append(res[0])
-                        means.append(res[1])
-                        ses.append(res[2])
+                objm = []
+                if _rep_scheduler is not None:
+                    ## share the workers of the runs of a testsolve
+                    reslst = _rep_scheduler.map_hits([starts[i] + (x, r) for i, r in enumerate(num_rands)], 'bump')
+                else:
+                    with mp.Pool(nproc, _init_worker_oracle, (self, )) as p:
+                        pres = [p.apply_async(_mp_hitat, starts[i] + (x, r, None, 'bump')) for i, r in enumerate(num_rands)]
+                        reslst = [pres[i].get() for i in pr]
+                for res in reslst:
+                    ## 0 = feas, 1 = observations
+                    feas.append(res[0])
+                    objm.extend(res[1])
                 ## turn simpar back on before returning
                 self.simpar = sim_old
                 if all(feas):
                     isfeas = True
-                    ## weighted average of replications
-                    obmean = tuple([sum([means[i][k]*num_rands[i]/m for i in pr]) for k in dr])
-                    ### convert se output back to variance
-                    obvar = [[num_rands[i]*ses[i][k]**2 for k in dr] for i in pr]
-                    ### compute pooled variance
-                    ##### special case 1 :(
-                    if m == nproc:
-                        pvar = [variance([means[i][k] for i in pr], obmean[k]) for k in dr]
-                    else:
-                        pvar = [sum([obvar[i][k]*(num_rands[i] - 1) for i in pr])/(m - nproc) for k in dr]
-                    ### compute standard error
-                    obse = tuple([sqrt(pvar[k]/m) for k in dr])
-                #[print('cha2: ', orc.rng.get_seed()) for orc in orclst]
+                    obmean = tuple([mean([objm[i][k] for i in mr]) for k in dr])
+                    obvar = [variance([objm[i][k] for i in mr], obmean[k]) for k in dr]
+                    obse = tuple([sqrt(obvar[i]/m) for i in dr])
         self.crn_check()
         return isfeas, obmean, obse
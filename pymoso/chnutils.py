@@ -6,13 +6,30 @@ MOSO algorithms, and computing metrics.
 Listing
 --------------
 solve
+iter_solve
+get_solve_args
 testsolve
+get_testsolve_jobs
 get_testsolve_prnstreams
 get_solv_prnstreams
+param_value
+param_bool
 do_work
-combine_runs
 isp_run
 par_runs
+Scheduler, class
+calibrate
+Schedule, class
+GeometricSchedule(Schedule), class
+PolynomialSchedule(Schedule), class
+VarianceSchedule(Schedule), class
+BudgetSchedule(Schedule), class
+get_schedule
+get_frontiers
+get_hvref
+MetricError, class
+MetricCache, class
+add_cache_stats
 gen_metric
 par_diff
 does_weak_dominate
@@ -23,21 +40,35 @@ is_lwep
 get_biparetos
 front
 get_nondom
+BiParetoArchive, class
+NDTreeArchive, class
+get_archive
+IntervalSweep, class
 get_nbors
 argsort
 get_setnbors
 enorm
 perturb
 edist
+sqdist
 dxB
 dAB
 dH
+KDTree, class
+hv
+igd
+igdplus
 """
 
-from itertools import product, filterfalse
+from itertools import product, filterfalse, chain, islice
+from bisect import bisect_left, bisect_right
 from math import ceil, floor, sqrt
+from copy import copy, deepcopy
 import multiprocessing as mp
-from statistics import mean, variance
+import os
+import queue
+import time
+from statistics import mean, variance, median
 from .prng.mrg32k3a import MRG32k3a, get_next_prnstream
 
 def solve(problem, solver, x0, **kwargs
@@ -51,6 +82,10 @@ def solve(problem, solver, x0, **kwargs
 	x0 : tuple of int
 		Feasible starting point for the algorithms
 	kwargs : dict
+		Options 'budget', 'seed', 'simpar' (or 'auto', see 
+		calibrate), 'crn', 'time_budget' (wall-clock seconds), 
+		'tuning' (a dict updated with the calibration, if any), and 
+		solver parameters
 	
 	Returns
 	-------
@@ -59,14 +94,65 @@ def solve(problem, solver, x0, **kwargs
 		is a tuple of int of length 6
 	"""
 	
+    budget, orc, paramargs = get_solve_args(problem, x0, kwargs)
+    res = isp_run(solver, budget, orc, **paramargs)
+    lastnu = len(res['itersoln']) - 1
+    return res['itersoln'][lastnu], res['endseed']
+
+
+def iter_solve(problem, solver, x0, **kwargs):
+	"""
+	Uses a specified MOSO algorithm to solve a MOSO problem, yielding 
+	the state of every iteration as soon as it finishes. 
+	
+	Parameters
+	----------
+	problem : chnbase.Oracle class
+	solver : chnbase.RASolver class
+	x0 : tuple of int
+		Feasible starting point for the algorithms
+	kwargs : dict
+		As in 'solve'
+	
+	Yields
+	------
+	state : dict
+		See chnbase.RASolver.iter_solve
+	"""
+    budget, orc, paramargs = get_solve_args(problem, x0, kwargs)
+    paramargs['sprn'] = paramargs.pop('solvprn')
+    yield from solver(orc, **paramargs).iter_solve(budget)
+
+
+def get_solve_args(problem, x0, kwargs):
+	"""
+	Create the oracle and solver arguments of a 'solve' call. 
+	
+	Parameters
+	----------
+	problem : chnbase.Oracle class
+	x0 : tuple of int
+	kwargs : dict
+		The keyword arguments of 'solve'. If 'simpar' is 'auto', the 
+		Oracle is calibrated (see calibrate) and the 'tuning' dict, if
+		given, is updated with the outcome
+	
+	Returns
+	-------
+	budget : int
+	orc : chnbase.Oracle object
+	paramargs : dict
+		Keyword arguments of 'isp_run'
+	"""
     budget = kwargs.pop('budget', 50000)
     default_seed = (12345, 12345, 12345, 12345, 12345, 12345)
     seed = kwargs.pop('seed', default_seed)
     simpar = kwargs.pop('simpar', 1)
     crn = kwargs.pop('crn', False)
+    tuning = kwargs.pop('tuning', None)
     paramtups = []
     for i, p in enumerate(kwargs):
-        ptup = (p, float(kwargs[p]))
+        ptup = (p, param_value(kwargs[p]))
         paramtups.append(ptup)
     ## generate all prn streams
     orcstream, solvstream = get_solv_prnstreams(seed, crn)
@@ -74,14 +160,18 @@ def solve(problem, solver, x0, **kwargs
     paramlst = [('solvprn', solvstream), ('x0', x0), ]
     orc = problem(orcstream)
     orc.set_crnflag(crn)
+    if simpar == 'auto':
+        tuned = calibrate(orc, x0, budget=budget)
+        if tuning is not None:
+            tuning.update(tuned)
+        simpar = tuned['simpar']
+        orc.simmin = tuned['simmin']
     orc.simpar = simpar
     ## create arguments for (unknown) optional named parameters
     if paramtups:
         paramlst.extend(paramtups)
     paramargs = dict(paramlst)
-    res = isp_run(solver, budget, orc, **paramargs)
-    lastnu = len(res['itersoln']) - 1
-    return res['itersoln'][lastnu], res['endseed']
+    return budget, orc, paramargs
 
 
 def testsolve(tester, solver, x0, **kwargs):
@@ -95,11 +185,24 @@ def testsolve(tester, solver, x0, **kwargs):
 	x0 : tuple of int
 		Feasible starting point for the algorithms
 	kwargs : dict
+		Options 'budget', 'seed', 'isp', 'proc', 'simpar' (shares the 
+		'proc' processes, see Scheduler), 'ranx0', 'crn', 
+		'time_budget' (wall-clock seconds for each run), 'sink', 
+		'chunksize', and 'cache_stats' (see par_runs), 'metric' (the 
+		'metname' of par_runs, computed with each run if given, see 
+		MetricError), 
+		'tuning' (a dict updated with the calibration, if any), 
+		'skip' (isp numbers not to run, such as those an interrupted 
+		experiment finished), and solver parameters. 'proc' and 
+		'simpar' may be 'auto', see calibrate
 	
 	Returns
 	-------
 	res : dict
-		Keys must include 'itersoln', 'simcalls'
+		Keys are the isp numbers and values are 'solve' outputs, 
+		whose keys include 'itersoln', 'simcalls'. Empty if 'sink' 
+		is given. Every run uses the same streams whichever runs are 
+		skipped. 
 	endseed : tuple of int
 		The mrg32k3a seed representing the next seed which generates 
 		an independent stream. 
@@ -112,27 +215,101 @@ def testsolve(tester, solver, x0, **kwargs):
     proc = kwargs.pop('proc', 1)
     ranx0 = kwargs.pop('ranx0')
     crn = kwargs.pop('crn', False)
+    sink = kwargs.pop('sink', None)
+    chunksize = kwargs.pop('chunksize', 1)
+    metname = kwargs.pop('metric', None)
+    cache_stats = kwargs.pop('cache_stats', None)
+    simpar = kwargs.pop('simpar', 1)
+    tuning = kwargs.pop('tuning', None)
+    skip = kwargs.pop('skip', ())
+    mettester = None
+    if metname:
+        ## fail before solving if the tester cannot compute the metric
+        try:
+            MetricCache(tester(), metname)
+        except Exception as e:
+            raise MetricError('Cannot compute metric ' + str(metname) + ': ' + str(e)) from e
+        mettester = tester()
+    ## the runs are solved in daemonic processes, which cannot start the
+    ## pools of solver workers
+    workers = kwargs.pop('workers', 1)
+    if param_value(workers) > 1:
+        print('--* Warning: testsolve solves every run in its own process and ignores workers. ')
+        print('--* Continuing: points are simulated one at a time. ')
     paramtups = []
     for i, p in enumerate(kwargs):
-        ptup = (p, float(kwargs[p]))
+        ptup = (p, param_value(kwargs[p]))
         paramtups.append(ptup)
     orcstreams, solvstreams, x0stream, endseed = get_testsolve_prnstreams(isp, seed, crn)
-    joblist = []
+    simmin = 2
+    if proc == 'auto' or simpar == 'auto':
+        ## calibrate on the Oracle and x0 of the first run, using copies
+        ## of their streams
+        currtest = tester()
+        orc = currtest.ranorc(deepcopy(orcstreams[0]))
+        orc.set_crnflag(crn)
+        calx0 = x0
+        if ranx0:
+            calx0 = currtest.get_ranx0(deepcopy(x0stream))
+        ## only the runs not skipped compete for the processes
+        torun = isp - len(set(skip) & set(range(isp)))
+        tuned = calibrate(orc, calx0, proc, simpar, torun, budget)
+        if tuning is not None:
+            tuning.update(tuned)
+        proc, simpar, simmin = tuned['proc'], tuned['simpar'], tuned['simmin']
+    joblist = get_testsolve_jobs(tester, solver, x0, budget, isp, ranx0, crn, paramtups, orcstreams, solvstreams, x0stream, simpar, simmin, skip)
+    res = par_runs(joblist, proc, sink, chunksize, mettester, metname, cache_stats, tester().ranorc, simpar)
+    return res, endseed
+
+
+def get_testsolve_jobs(tester, solver, x0, budget, isp, ranx0, crn, paramtups, orcstreams, solvstreams, x0stream, simpar=1, simmin=2, skip=()):
+	"""
+	Generate the par_runs jobs of testsolve one at a time. Each job 
+	carries the Oracle class of the tester and the stream of the Oracle,
+	and the process which takes the job builds the Oracle. 
+	
+	Parameters
+	----------
+	tester : class
+	solver : chnbase.MOSOSolver class
+	x0 : tuple of int
+	budget : int
+	isp : int
+	ranx0 : bool
+	crn : bool
+	paramtups : list of tuple
+		Solver parameter names and values
+	orcstreams, solvstreams : list of prng.MRG32k3a objects
+	x0stream : prng.MRG32k3a object
+	simpar : int, optional
+		The 'simpar' of each Oracle, default is 1
+	simmin : int, optional
+		The 'simmin' of each Oracle, default is 2
+	skip : iterable of int, optional
+		The isp numbers whose jobs are None. Their starting points are
+		still drawn, so the other runs start where they always do
+	
+	Yields
+	------
+	tuple
+		Positional and keyword arguments of isp_run, or None
+	"""
     currtest = tester()
+    skip = set(skip)
     for i in range(isp):
         if ranx0:
             x0 = currtest.get_ranx0(x0stream)
+        if i in skip:
+            yield None
+            continue
         paramlst = [('solvprn', solvstreams[i]), ('x0', x0), ]
-        orc = currtest.ranorc(orcstreams[i])
-        orc.set_crnflag(crn)
+        orc = (currtest.ranorc, orcstreams[i], crn, simpar, simmin)
         ## create arguments for (unknown) optional named parameters
         if paramtups:
             paramlst.extend(paramtups)
         paramargs = dict(paramlst)
         mainparms = (solver, budget, orc)
-        joblist.append((mainparms, paramargs))
-    res = par_runs(joblist, proc)
-    return res, endseed
+        yield mainparms, paramargs
 
 
 def get_testsolve_prnstreams(num_trials, iseed, crn):
@@ -198,6 +375,57 @@ def get_solv_prnstreams(iseed, crn):
     return orcstream, solvstream
 
 
+def param_value(val):
+    """
+    Convert a solver parameter string to float, unless it is a name, 
+    such as that of a schedule. Values which are not strings, such as 
+    Schedule objects, are returned unchanged. 
+    
+    Parameters
+    ----------
+    val : str or object
+    
+    Returns
+    -------
+    float, str, or object
+    """
+    if not isinstance(val, str):
+        return val
+    try:
+        return float(val)
+    except ValueError:
+        return val
+
+
+def param_bool(val):
+    """
+    Convert an on/off solver parameter value to bool. Strings from the
+    CLI are 'True' or 'False' in any case, or '1' or '0'. 
+    
+    Parameters
+    ----------
+    val : bool, str, int, or float
+    
+    Returns
+    -------
+    bool
+    
+    Raises
+    ------
+    ValueError
+        If 'val' is not one of the accepted values
+    """
+    if isinstance(val, str):
+        lval = val.strip().lower()
+        if lval in ('true', '1'):
+            return True
+        if lval in ('false', '0'):
+            return False
+    elif val in (True, False):
+        return bool(val)
+    raise ValueError('Invalid on/off parameter value ' + repr(val) + ', use True or False.')
+
+
 def do_work(func, args, kwargs=None):
     """
     Wrap a function with arguments and return the result for 
@@ -226,25 +454,6 @@ def do_work(func, args, kwargs=None):
     return result
 
 
-def combine_runs(runsets):
-    """
-    Combine the output results of many runs into a single dictionary.
-    
-    Parameters
-    ----------
-    runsets : list
-		Outputs of multiple calls to 'chnbase.MOSOSolver.solve'
-	
-	Returns
-	-------
-	rundatdict : dict
-    """
-    rundatdict = dict()
-    for i, st in enumerate(runsets):
-        rundatdict[i] = st
-    return rundatdict
-
-
 def isp_run(boovsolver, budget, orc, **kwargs):
     """
     Solve multiple sample paths of a problem using the same algorithm.
@@ -253,7 +462,12 @@ def isp_run(boovsolver, budget, orc, **kwargs):
     ----------
     boovsolver : chnbase.MOSOSolver class
     budget : int
-    orc : chnbase.Oracle object
+    orc : chnbase.Oracle object or tuple
+		Either the Oracle, or a tuple of an Oracle class (or any 
+		callable which returns an Oracle, such as a tester's 'ranorc'),
+		its prng.MRG32k3a stream, its crn flag, and optionally its 
+		'simpar' and 'simmin', from which to build the Oracle where 
+		the run happens
     kwargs : dict
     
     Returns
@@ -261,6 +475,15 @@ def isp_run(boovsolver, budget, orc, **kwargs):
     mydat : dict
 		Output of a 'chnbase.MOSOSolver.solve' call
     """
+    if isinstance(orc, tuple):
+        recipe = orc
+        ranorc, orcprn, crn = recipe[0:3]
+        orc = ranorc(orcprn)
+        orc.set_crnflag(crn)
+        if len(recipe) > 3:
+            orc.simpar = recipe[3]
+        if len(recipe) > 4:
+            orc.simmin = recipe[4]
     exists_solvprn = kwargs.get('solvprn', False)
     if exists_solvprn:
         solvprn = kwargs.get('solvprn', None)
@@ -271,36 +494,921 @@ def isp_run(boovsolver, budget, orc, **kwargs):
     return mydat
 
 
-def par_runs(joblst, num_proc=1):
+def _init_isp_worker(ranorc, tester, metname):
     """
-    Solve many problems in parallel.
+    Prepare a par_runs worker process: load the shared data of the 
+    Oracle class, and create the metric cache if there is a tester. 
     
     Parameters
     ----------
-    joblist : list of tuple
+    ranorc : chnbase.Oracle class or None
+    tester
+        Instantiated object such that 'tester.metric' is callable, 
+        or None
+    metname : str
+    """
+    if ranorc is not None and hasattr(ranorc, 'get_data'):
+        ranorc.get_data()
+    if tester is not None:
+        _init_metric_cache(tester, metname)
+
+
+def _isp_work(job):
+    """
+    Solve one numbered job of par_runs and, if the process has a 
+    metric cache, compute the metrics of the run. 
+    
+    Parameters
+    ----------
+    job : tuple
+        The job number and a tuple from the job list of par_runs
+    
+    Returns
+    -------
+    i : int
+        The job number
+    mydat : dict
+        Output of isp_run, with the key 'metrics' set to the output of 
+        gen_metric, or 'metric_error' set to the exception it raised
+    stats : dict or None
+        Cache counts incurred by the metrics of this run
+    """
+    i, (mainparms, paramargs) = job
+    mydat = do_work(isp_run, mainparms, paramargs)
+    stats = None
+    if _metric_cache is not None:
+        try:
+            mydat['metrics'], stats = _cached_gen_metric(mydat)
+        except Exception as e:
+            mydat['metric_error'] = e
+    return i, mydat, stats
+
+
+def par_runs(joblst, num_proc=1, sink=None, chunksize=1, tester=None, metname='tester', cache_stats=None, ranorc=None, simpar=1):
+    """
+    Solve many problems in parallel. Each process takes the next 
+    chunk of jobs when it finishes its last, and each result is 
+    returned as soon as its run finishes. If 'tester' is given, the 
+    process which solves a run also computes its metrics right away, 
+    keeping a MetricCache across its runs as in par_diff. If the 
+    runs simulate in parallel, a Scheduler shares the processes 
+    between the runs and their replications. 
+    
+    Parameters
+    ----------
+    joblist : iterable of tuple
 		Each tuple is length 2. 'tuple[0]' is tuple of positional 
-		arguments, 'tuple[1]' is dict of keyword arguments. 
+		arguments, 'tuple[1]' is dict of keyword arguments, of isp_run.
+		Jobs which give the Oracle as a tuple (see isp_run) send only
+		its class and stream to the processes. Jobs which are None are
+		skipped, and the others keep their numbers. 
 	num_proc : int
 		Number of processes to use in parallel. Default is 1.
+	sink : callable, optional
+		Called as 'sink(i, rundat)' with the job number and output of 
+		every run in the order the runs finish. The output is not 
+		kept. 
+	chunksize : int, optional
+		Number of jobs a process takes at a time. Default is 1.
+	tester : optional
+		Instantiated object such that 'tester.metric' is callable. If 
+		given, the output of each run has the key 'metrics' with the 
+		output of gen_metric, or 'metric_error' with the exception it 
+		raised
+	metname : str, optional
+		One of METRIC_NAMES, default is 'tester', i.e. 'tester.metric'
+	cache_stats : dict, optional
+		If given, updated with the total cache counts of all processes
+	ranorc : chnbase.Oracle class, optional
+		If given, each process loads its shared data ('get_data') when
+		it starts
+	simpar : int, optional
+		The 'simpar' of the Oracles of the jobs. Default is 1. 
 		
 	Returns
 	-------
 	runtots : dict
-		Contains the results of every chnbase.MOSOSOlver.solve call
+		Contains the results of every chnbase.MOSOSOlver.solve call 
+		keyed by job number, empty if 'sink' is given
     """
     NUM_PROCESSES = num_proc
-    rundict = []
-    #print(joblst)
-    with mp.Pool(NUM_PROCESSES) as p:
-        worklist = [(isp_run, (e[0]), (e[1])) for e in joblst]
-        app_rd = [p.apply_async(do_work, job) for job in worklist]
-        for r in app_rd:
-            myitem = r.get()
-            rundict.append(myitem)
-    runtots = combine_runs(rundict)
+    rundict = dict()
+    if tester is not None and metname not in METRIC_NAMES:
+        raise ValueError('Unknown metric ' + str(metname) + ', choose one of ' + ', '.join(METRIC_NAMES) + '.')
+    initargs = (ranorc, tester, metname)
+    if simpar > 1:
+        pool = Scheduler(NUM_PROCESSES, _init_isp_worker, initargs)
+    else:
+        pool = mp.Pool(NUM_PROCESSES, _init_isp_worker, initargs)
+    jobs = ((i, job) for i, job in enumerate(joblst) if job is not None)
+    chunksize = max(int(chunksize), 1)
+    with pool as p:
+        if simpar > 1:
+            results = p.imap_unordered(_isp_work, jobs, chunksize)
+        else:
+            results = _pool_imap(p, _isp_work, jobs, NUM_PROCESSES, chunksize)
+        for i, myitem, stats in results:
+            if stats and cache_stats is not None:
+                add_cache_stats(cache_stats, stats)
+            if sink:
+                sink(i, myitem)
+            else:
+                rundict[i] = myitem
+    runtots = {i: rundict[i] for i in sorted(rundict)}
     return runtots
 
 
+def _pool_imap(pool, func, iterable, num_proc, chunksize=1):
+    """
+    Compute 'func' of every job on a multiprocessing.Pool, as its 
+    'imap_unordered' does, but take jobs from 'iterable' only as the 
+    results come in. 'Pool.imap_unordered' reads the whole iterable 
+    up front, see Scheduler.imap_unordered. 
+    
+    Parameters
+    ----------
+    pool : multiprocessing.Pool
+    func : callable
+    iterable : iterable
+    num_proc : int
+        Number of processes of 'pool'
+    chunksize : int, optional
+        Number of jobs a process takes at a time
+    
+    Yields
+    ------
+    The output of 'func' for each job, as soon as its chunk finishes
+    """
+    jobs = iter(iterable)
+    ## the pool calls back from its result thread
+    resq = queue.Queue()
+    maxjobs = (num_proc + 1)*chunksize
+    numjobs = 0
+    while True:
+        while numjobs < maxjobs:
+            batch = list(islice(jobs, chunksize))
+            if not batch:
+                break
+            pool.map_async(func, batch, len(batch), resq.put, resq.put)
+            numjobs += len(batch)
+        if not numjobs:
+            return
+        res = resq.get()
+        if isinstance(res, BaseException):
+            raise res
+        for out in res:
+            numjobs -= 1
+            yield out
+
+
+class Scheduler(object):
+    """
+    Share a fixed number of worker processes between the runs of 
+    par_runs and the parallel replications of their simulations, 
+    instead of starting a pool of 'simpar' processes inside every run.
+    A run which simulates in parallel hands its replication chunks to 
+    a queue that every worker takes from before it starts another run,
+    including the worker whose run waits on them. Thus workers whose 
+    runs have finished help the runs still going, and there are never
+    more than 'num_proc' busy processes. 
+    
+    Attributes
+    ----------
+    num_proc : int
+    initializer : callable
+        Called with 'initargs' when each worker starts
+    initargs : tuple
+    runq : multiprocessing.Queue
+        Batches of runs waiting for a worker
+    chunkq : multiprocessing.Queue
+        Replication chunks waiting for a worker
+    resq : multiprocessing.Queue
+        Outputs of finished runs
+    chunkres : list of multiprocessing.Queue
+        Outputs of finished chunks, one queue per worker
+    numchunks : multiprocessing.Value
+        Number of chunks in 'chunkq' that no worker has taken
+    done : multiprocessing.Event
+        Set when every run has finished
+    procs : list of multiprocessing.Process
+    w : int
+        In a worker, its number
+    current : tuple
+        In a worker, the number and Oracle (or Oracle tuple, see 
+        isp_run) of its run
+    oracles : dict
+        In a worker, the Oracles built for the chunks of each run
+    
+    Parameters
+    ----------
+    num_proc : int
+    initializer : callable, optional
+    initargs : tuple, optional
+    
+    See also
+    --------
+    par_runs
+    """
+
+    def __init__(self, num_proc, initializer=None, initargs=()):
+        self.num_proc = num_proc
+        self.initializer = initializer
+        self.initargs = initargs
+        self.runq = mp.Queue()
+        self.chunkq = mp.Queue()
+        self.resq = mp.Queue()
+        self.chunkres = [mp.Queue() for w in range(num_proc)]
+        self.numchunks = mp.Value('i', 0)
+        self.done = mp.Event()
+        self.procs = []
+        self.w = None
+        self.current = None
+        self.oracles = dict()
+
+    def __getstate__(self):
+        # processes cannot be pickled
+        state = self.__dict__.copy()
+        state['procs'] = []
+        return state
+
+    def __enter__(self):
+        for w in range(self.num_proc):
+            proc = mp.Process(target=_scheduler_work, args=(self, w), daemon=True)
+            proc.start()
+            self.procs.append(proc)
+        return self
+
+    def __exit__(self, *exc):
+        self.done.set()
+        for proc in self.procs:
+            proc.join(1)
+            if proc.is_alive():
+                proc.terminate()
+        self.procs = []
+
+    def imap_unordered(self, func, iterable, chunksize=1):
+        """
+        Compute 'func' of every job on the workers, as 
+        'multiprocessing.Pool.imap_unordered' does. Jobs are taken from
+        'iterable' as the runs finish, keeping about 'num_proc' 
+        batches queued or running, so a lazy job list is not built up
+        front. 
+        
+        Parameters
+        ----------
+        func : callable
+            Takes a tuple of the job number and a job of par_runs
+        iterable : iterable of tuple
+        chunksize : int, optional
+            Number of jobs a worker takes at a time
+        
+        Yields
+        ------
+        The output of 'func' for each job, as soon as it finishes
+        """
+        jobs = iter(iterable)
+        maxjobs = (self.num_proc + 1)*chunksize
+        numjobs = 0
+        while True:
+            while numjobs < maxjobs:
+                batch = list(islice(jobs, chunksize))
+                if not batch:
+                    break
+                self.runq.put((func, batch))
+                numjobs += len(batch)
+            if not numjobs:
+                return
+            yield self.get_result()
+            numjobs -= 1
+
+    def get_result(self):
+        """
+        Wait for the output of the next run to finish.
+        
+        Returns
+        -------
+        The output of the run
+        
+        Raises
+        ------
+        RuntimeError
+            If a worker stops before every run finishes
+        """
+        while True:
+            try:
+                isok, res = self.resq.get(timeout=0.1)
+            except queue.Empty:
+                if not all(proc.is_alive() for proc in self.procs):
+                    raise RuntimeError('A scheduler worker stopped before its runs finished.')
+                continue
+            if not isok:
+                raise res
+            return res
+
+    def run_job(self, func, job):
+        """
+        In a worker, compute a run and send its output to 'resq'.
+        
+        Parameters
+        ----------
+        func : callable
+        job : tuple
+            The job number and a job of par_runs
+        """
+        i, (mainparms, paramargs) = job
+        # keep the Oracle as it was before the run for building copies
+        self.current = (i, deepcopy(mainparms[2]))
+        try:
+            out = (True, func(job))
+        except Exception as e:
+            out = (False, e)
+        self.current = None
+        self.resq.put(out)
+
+    def chunk_oracle(self, key, orc):
+        """
+        In a worker, return an Oracle of a run to simulate its chunks, 
+        building it once. 
+        
+        Parameters
+        ----------
+        key : int
+            The job number of the run
+        orc : chnbase.Oracle object or tuple
+            As in isp_run
+        
+        Returns
+        -------
+        chnbase.Oracle object
+        """
+        if key not in self.oracles:
+            if len(self.oracles) >= 2*self.num_proc:
+                self.oracles.pop(next(iter(self.oracles)))
+            if isinstance(orc, tuple):
+                chunkorc = orc[0](deepcopy(orc[1]))
+            else:
+                chunkorc = copy(orc)
+            chunkorc.simpar = 1
+            self.oracles[key] = chunkorc
+        return self.oracles[key]
+
+    def run_chunk(self, timeout=None):
+        """
+        In a worker, simulate the next replication chunk, if any, and 
+        send its output to the worker of its run. 
+        
+        Parameters
+        ----------
+        timeout : float, optional
+            Seconds to wait for a chunk. Default is not to wait
+        
+        Returns
+        -------
+        bool
+            True if a chunk was simulated
+        """
+        from .chnbase import _mp_hitat
+        try:
+            if timeout:
+                task = self.chunkq.get(timeout=timeout)
+            else:
+                task = self.chunkq.get_nowait()
+        except queue.Empty:
+            return False
+        with self.numchunks.get_lock():
+            self.numchunks.value -= 1
+        owner, key, orc, idx, args, name = task
+        try:
+            out = (True, _mp_hitat(*args, orc=self.chunk_oracle(key, orc), name=name))
+        except Exception as e:
+            out = (False, e)
+        self.chunkres[owner].put((idx, out))
+        return True
+
+    def map_hits(self, argslst, name='hit'):
+        """
+        In a worker, simulate the replication chunks of the Oracle of 
+        its run on all workers, and simulate chunks while waiting. 
+        
+        Parameters
+        ----------
+        argslst : list of tuple
+            The positional arguments of 'chnbase._mp_hitat' of each 
+            chunk
+        name : str, optional
+            The Oracle method which simulates a chunk, 'hit' or 'bump'
+        
+        Returns
+        -------
+        list of tuple
+            The output of the Oracle method for each chunk
+        """
+        key, orc = self.current
+        with self.numchunks.get_lock():
+            self.numchunks.value += len(argslst)
+        for idx, args in enumerate(argslst):
+            self.chunkq.put((self.w, key, orc, idx, args, name))
+        reslst = [None for args in argslst]
+        numleft = len(argslst)
+        while numleft:
+            try:
+                idx, out = self.chunkres[self.w].get_nowait()
+            except queue.Empty:
+                ## chunks just put may still be on their way to the queue
+                if self.numchunks.value > 0 and self.run_chunk(0.01):
+                    continue
+                ## no chunk to simulate, so wait for the other workers
+                try:
+                    idx, out = self.chunkres[self.w].get(timeout=0.01)
+                except queue.Empty:
+                    continue
+            isok, res = out
+            if not isok:
+                raise res
+            reslst[idx] = res
+            numleft -= 1
+        return reslst
+
+
+def _scheduler_work(sched, w):
+    """
+    The loop of a Scheduler worker: simulate waiting chunks first, 
+    otherwise compute the next batch of runs, until all runs finish. 
+    
+    Parameters
+    ----------
+    sched : Scheduler
+    w : int
+        The number of the worker
+    """
+    from . import chnbase
+    sched.w = w
+    chnbase._rep_scheduler = sched
+    if sched.initializer:
+        sched.initializer(*sched.initargs)
+    while not sched.done.is_set():
+        if sched.run_chunk():
+            continue
+        try:
+            func, batch = sched.runq.get_nowait()
+        except queue.Empty:
+            sched.run_chunk(0.01)
+            continue
+        for job in batch:
+            sched.run_job(func, job)
+
+
+def _mp_echo(*args):
+    """
+    Return the arguments, to time the round trip of a task to a worker.
+    """
+    return args
+
+
+def calibrate(orc, x, proc=1, simpar='auto', isp=None, budget=None, reps=5):
+    """
+    Choose the numbers of processes of a solve or testsolve from the 
+    measured cost of the Oracle. Time a few calls of 'orc.g' at 'x', 
+    and the start of a pool and the round trip of a task to one of its
+    processes. Replications are then parallel only if processes would 
+    otherwise be idle, and only in hits of at least 'simmin' 
+    replications, where the time saved exceeds the overhead. Since 
+    parallel replications give the same results as serial ones, the 
+    choice changes only the run time. 
+    
+    Parameters
+    ----------
+    orc : chnbase.Oracle object
+        Its streams are not advanced
+    x : tuple of int
+        A feasible point
+    proc : int or 'auto', optional
+        Processes of the testsolve runs, ignored if 'isp' is None. 
+        Default is 1
+    simpar : int or 'auto', optional
+        Default is 'auto'
+    isp : int, optional
+        Number of testsolve runs. If None, calibrate a solve run, 
+        whose hits each start a pool
+    budget : int, optional
+        Simulation budget of each run
+    reps : int, optional
+        Most calls of 'orc.g' to time, default is 5
+    
+    Returns
+    -------
+    tuning : dict
+        The number of CPUs 'cpus' this process may use, the seconds 
+        of a 'g' call 'g_time', of starting and stopping a pool 'start_time', and of 
+        a task round trip 'dispatch_time', and the chosen 'proc', 
+        'simpar', and 'simmin' of the Oracles
+    """
+    from .chnbase import _init_worker_oracle
+    ## count the CPUs this process may run on, which may be fewer than
+    ## those of the machine, e.g. under taskset or in a container
+    if hasattr(os, 'sched_getaffinity'):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = mp.cpu_count()
+    rng = deepcopy(orc.rng)
+    gtimes = []
+    for r in range(reps):
+        t0 = time.perf_counter()
+        orc.g(x, rng)
+        gtimes.append(time.perf_counter() - t0)
+        if sum(gtimes) > 1:
+            break
+    gtime = median(gtimes)
+    tuning = {'cpus': cpus, 'g_time': gtime, 'start_time': None, 'dispatch_time': None}
+    simmin = 2
+    autoproc = proc == 'auto'
+    if isp is None:
+        proc = 1
+        workers = cpus
+    else:
+        if autoproc:
+            proc = cpus
+        ## replications only have idle processes to use with few runs
+        workers = proc if isp < proc else 1
+    if simpar == 'auto':
+        simpar = 1
+        if workers > 1 and gtime > 0:
+            args = (orc.rng.getstate(), orc.crn_obsold, x, 1)
+            t0 = time.perf_counter()
+            with mp.Pool(workers, _init_worker_oracle, (orc, )) as p:
+                p.apply(_mp_echo, args)
+                t1 = time.perf_counter()
+                for r in range(reps):
+                    p.apply(_mp_echo, args)
+                t2 = time.perf_counter()
+            start = (t1 - t0) + (time.perf_counter() - t2)
+            dispatch = (t2 - t1)/reps
+            tuning['start_time'] = start
+            tuning['dispatch_time'] = dispatch
+            ## a parallel hit sends simblocks tasks per process and, in 
+            ## a solve run, starts a pool. it saves all but 1/workers of
+            ## the time of each replication
+            overhead = workers*orc.simblocks*dispatch
+            if isp is None:
+                overhead += start
+            simmin = max(2, floor(overhead/(gtime*(1 - 1/workers))) + 1)
+            if budget is None or simmin <= budget:
+                simpar = workers
+            else:
+                simmin = 2
+    if autoproc and isp is not None and simpar == 1:
+        proc = min(proc, isp)
+    tuning['proc'] = proc
+    tuning['simpar'] = simpar
+    tuning['simmin'] = simmin
+    return tuning
+
+
+class Schedule(object):
+    """
+    Base class for the schedules of iteration sample sizes 'm' and 
+    search limits 'b' of RASolvers. The base schedule is geometric, 
+    see GeometricSchedule. 
+    
+    Attributes
+    ----------
+    kinds : tuple of str
+        The quantities, 'm' and/or 'b', which the schedule can set
+    rates : tuple of float
+        The default rates of 'm' and 'b'
+    kind : str
+        Either 'm' or 'b'
+    rate : float
+        The growth parameter of the schedule
+    
+    Parameters
+    ----------
+    kind : str
+    rate : float, optional
+        Default is the rate in 'rates' of 'kind'
+    
+    Notes
+    -----
+    Sub-classes override __call__(solver, nu, init, prev), which 
+    returns the value of iteration 'nu' given the initial value 'init'
+    (e.g. 'mconst') and the value 'prev' of the previous iteration. The
+    state of 'solver' is that at the end of the previous iteration. 
+    """
+    kinds = ('m', 'b')
+    rates = (1.1, 1.2)
+
+    def __init__(self, kind, rate=None):
+        self.kind = kind
+        if rate is None:
+            rate = self.rates[self.kinds.index(kind)]
+        self.rate = rate
+
+    def __call__(self, solver, nu, init, prev):
+        return ceil(init*pow(self.rate, nu))
+
+
+class GeometricSchedule(Schedule):
+    """
+    Grow by the factor 'rate' each iteration: ceil(init*rate^nu). 
+    """
+    rates = (1.1, 1.2)
+
+
+class PolynomialSchedule(Schedule):
+    """
+    Grow as the power 'rate' of the iteration: ceil(init*nu^rate). 
+    """
+    rates = (1.5, 1.5)
+
+    def __call__(self, solver, nu, init, prev):
+        return ceil(init*pow(nu, self.rate))
+
+
+class VarianceSchedule(Schedule):
+    """
+    Choose the sample size from the observed variance so that the 
+    standard error of the estimates shrinks by the factor 'rate' each 
+    iteration. The target is set by the standard error of the first 
+    iteration, and the variance is the median, over the points of the 
+    previous iteration, of their largest variance. The sample size 
+    never decreases, so that noisier regions get more replications and
+    quieter ones no fewer than before. 
+    
+    Attributes
+    ----------
+    se1 : float
+        The standard error of the first iteration, or None
+    """
+    kinds = ('m', )
+    rates = (0.95, )
+
+    def __init__(self, kind, rate=None):
+        super().__init__(kind, rate)
+        self.se1 = None
+
+    def __call__(self, solver, nu, init, prev):
+        sehat = solver.sehat
+        if nu < 2 or not sehat:
+            return max(prev, ceil(init*pow(GeometricSchedule.rates[0], nu)))
+        # the variance of a single replication is m times that of the mean
+        var = median(prev*max(se)**2 for se in sehat.values())
+        if self.se1 is None and var > 0:
+            self.se1 = sqrt(var/prev)
+        if not self.se1:
+            return max(prev, ceil(init*pow(GeometricSchedule.rates[0], nu)))
+        target = self.se1*pow(self.rate, nu - 1)
+        return max(prev, ceil(var/target**2))
+
+
+class BudgetSchedule(Schedule):
+    """
+    Spend the fraction 'rate' of the remaining budget in each iteration.
+    The sample size spreads the fraction over as many points as the 
+    previous iteration estimated, and the search limit is the fraction
+    itself. Neither decreases. The first iteration is geometric. 
+    """
+    rates = (0.1, 0.1)
+
+    def __call__(self, solver, nu, init, prev):
+        k = self.kinds.index(self.kind)
+        geo = ceil(init*pow(GeometricSchedule.rates[k], nu))
+        if nu < 2 or solver.budget == float('inf'):
+            return max(prev, geo)
+        spend = self.rate*max(solver.budget - solver.num_calls, 0)
+        if self.kind == 'm':
+            spend = spend/max(len(solver.gbar), 1)
+        return max(prev, 1, ceil(spend))
+
+
+# the schedules selectable by the 'mschedule' and 'bschedule' parameters
+SCHEDULES = {'geometric': GeometricSchedule, 'polynomial': PolynomialSchedule, 'variance': VarianceSchedule, 'budget': BudgetSchedule}
+
+
+def get_schedule(name, kind, rate=None):
+    """
+    Create a schedule by name, or return a given Schedule. Register a 
+    custom Schedule sub-class to select it by name, e.g. 
+    SCHEDULES['mine'] = MySchedule. 
+    
+    Parameters
+    ----------
+    name : str or Schedule
+        A key of SCHEDULES, or a Schedule object which is returned 
+        unchanged
+    kind : str
+        Either 'm', the sample size, or 'b', the search limit
+    rate : float, optional
+    
+    Returns
+    -------
+    Schedule
+    
+    Raises
+    ------
+    ValueError
+        If the schedule does not exist or cannot set 'kind'
+    """
+    if isinstance(name, Schedule):
+        if not name.kind == kind:
+            raise ValueError('the schedule sets ' + str(name.kind) + ', not ' + kind)
+        return name
+    if not name in SCHEDULES:
+        raise ValueError('unknown schedule ' + str(name) + ', choose one of ' + ', '.join(SCHEDULES))
+    sched = SCHEDULES[name]
+    if not kind in sched.kinds:
+        raise ValueError('the ' + name + ' schedule cannot set ' + kind)
+    return sched(kind, rate)
+
+
+# metrics computed from a tester's true_g and true frontiers
+METRIC_NAMES = ('tester', 'dh', 'hv', 'igd', 'igdplus')
+
+
+class MetricError(Exception):
+    """
+    Raised by testsolve before solving when the tester cannot compute 
+    the chosen metric. 
+    """
+    pass
+
+
+def get_frontiers(tester):
+    """
+    Get the true frontiers of a tester as a list of point sets. 
+    
+    Parameters
+    ----------
+    tester
+        Instantiated object with 'soln_index', 'soln', or 'answer'
+        holding one true frontier or a list of local frontiers
+    
+    Returns
+    -------
+    list of set of tuple of numbers or KDTree
+    """
+    fronts = getattr(tester, 'soln_index', None)
+    if fronts is None:
+        fronts = getattr(tester, 'soln', None)
+    if fronts is None:
+        fronts = getattr(tester, 'answer')
+    if isinstance(fronts, list):
+        return fronts
+    # a single solution point of a single objective tester
+    if isinstance(fronts, tuple) and not isinstance(fronts[0], tuple):
+        return [{fronts}]
+    return [fronts]
+
+
+def get_hvref(tester, fronts):
+    """
+    Get the hypervolume reference point of a tester, its 'hvref' if 
+    defined, otherwise the nadir of its frontiers moved back by a tenth
+    of their range. 
+    
+    Parameters
+    ----------
+    tester
+    fronts : list of set of tuple of numbers or KDTree
+    
+    Returns
+    -------
+    tuple of float
+    """
+    ref = getattr(tester, 'hvref', None)
+    if ref is not None:
+        return ref
+    pts = [z for front in fronts for z in front]
+    q = len(pts[0])
+    ideal = [min(z[k] for z in pts) for k in range(q)]
+    nadir = [max(z[k] for z in pts) for k in range(q)]
+    return tuple(nadir[k] + 0.1*(nadir[k] - ideal[k]) if nadir[k] > ideal[k] else nadir[k] + 1.0 for k in range(q))
+
+
+class MetricCache(object):
+    """
+    Memoize metric computations of a tester. The tester's 'true_g' is 
+    replaced by a version which stores its values per point, and
+    metric values are stored per solution set, so that repeated 
+    solutions across iterations and sample paths are computed once.
+    
+    Attributes
+    ----------
+    tester
+        Instantiated object such that 'tester.metric' is callable
+    metname : str
+        One of METRIC_NAMES. 'tester' uses 'tester.metric' and the 
+        others compare the true values of a solution, from 
+        'tester.true_g', to the true frontiers of the tester
+    gvals : dict
+        Maps points to their 'true_g' values
+    metvals : dict
+        Maps frozensets of points to their metric values
+    stats : dict
+        Number of 'true_g' and metric calls and cache hits
+    
+    Parameters
+    ----------
+    tester
+        Instantiated object such that 'tester.metric' is callable
+    metname : str, optional
+        Default is 'tester'
+    """
+
+    def __init__(self, tester, metname='tester'):
+        if metname not in METRIC_NAMES:
+            raise ValueError('Unknown metric ' + str(metname) + ', choose one of ' + ', '.join(METRIC_NAMES) + '.')
+        self.tester = tester
+        self.metname = metname
+        self.gvals = dict()
+        self.metvals = dict()
+        self.stats = {'g_calls': 0, 'g_hits': 0, 'met_calls': 0, 'met_hits': 0}
+        self._true_g = getattr(tester, 'true_g', None)
+        if self._true_g:
+            tester.true_g = self.true_g
+        if not metname == 'tester':
+            self.fronts = get_frontiers(tester)
+            if metname == 'hv':
+                self.hvref = get_hvref(tester, self.fronts)
+
+    def true_g(self, x):
+        """
+        Compute the tester's true objective values of a point, once.
+        
+        Parameters
+        ----------
+        x : tuple of int
+        
+        Returns
+        -------
+        tuple of float
+        """
+        self.stats['g_calls'] += 1
+        if x in self.gvals:
+            self.stats['g_hits'] += 1
+        else:
+            self.gvals[x] = self._true_g(x)
+        return self.gvals[x]
+
+    def metric(self, les):
+        """
+        Compute the metric of a solution, once. 
+        
+        Parameters
+        ----------
+        les : set of tuple of int
+        
+        Returns
+        -------
+        float
+        """
+        self.stats['met_calls'] += 1
+        key = frozenset(les)
+        if key in self.metvals:
+            self.stats['met_hits'] += 1
+        elif self.metname == 'tester':
+            self.metvals[key] = self.tester.metric(les)
+        else:
+            self.metvals[key] = self.frontier_metric(les)
+        return self.metvals[key]
+
+    def frontier_metric(self, les):
+        """
+        Compute a named metric of the true values of a solution against
+        the true frontiers, taking the closest frontier for 'dh', 'igd',
+        and 'igdplus'.
+        
+        Parameters
+        ----------
+        les : set of tuple of int
+        
+        Returns
+        -------
+        float
+        """
+        efrontier = [self.true_g(x) for x in les]
+        if self.metname == 'hv':
+            return hv(efrontier, self.hvref)
+        if self.metname == 'dh':
+            return min(dh(efrontier, front) for front in self.fronts)
+        if self.metname == 'igd':
+            return min(igd(efrontier, front) for front in self.fronts)
+        return min(igdplus(efrontier, front) for front in self.fronts)
+
+
+def add_cache_stats(tot, stats):
+    """
+    Add the counts of one cache to a running total.
+    
+    Parameters
+    ----------
+    tot : dict
+    stats : dict
+        The 'stats' of a MetricCache
+    """
+    for k in stats:
+        tot[k] = tot.get(k, 0) + stats[k]
+
+
 def gen_metric(rundat, tester):
     """
     Generate metrics for a sample path run.
@@ -310,7 +1418,8 @@ def gen_metric(rundat, tester):
     rundat : dict
 		Ouput of a chnbase.MOSOSolver.solve call
 	tester
-		Instantiated object such that 'tester.metric' is callable
+		Instantiated object such that 'tester.metric' is callable, 
+		e.g. a MetricCache
 		
 	Returns
 	-------
@@ -327,9 +1436,51 @@ def gen_metric(rundat, tester):
     return met_data
 
 
-def par_diff(rundata, tester, num_proc):
+# the metric cache of a par_diff worker process, shared by its tasks
+_metric_cache = None
+
+
+def _init_metric_cache(tester, metname='tester'):
     """
-    Compute metrics in parallel.
+    Create the metric cache of a par_diff worker process.
+    
+    Parameters
+    ----------
+    tester
+        Instantiated object such that 'tester.metric' is callable
+    metname : str, optional
+        One of METRIC_NAMES, default is 'tester'
+    """
+    global _metric_cache
+    _metric_cache = MetricCache(tester, metname)
+
+
+def _cached_gen_metric(rundat):
+    """
+    Generate metrics for a sample path run using the worker cache.
+    
+    Parameters
+    ----------
+    rundat : dict
+        Ouput of a chnbase.MOSOSolver.solve call
+    
+    Returns
+    -------
+    met_data : dict
+        Output of gen_metric
+    stats : dict
+        Cache counts incurred by this run
+    """
+    old_stats = dict(_metric_cache.stats)
+    met_data = gen_metric(rundat, _metric_cache)
+    stats = {k: _metric_cache.stats[k] - old_stats[k] for k in old_stats}
+    return met_data, stats
+
+
+def par_diff(rundata, tester, num_proc, cache_stats=None, metname='tester'):
+    """
+    Compute metrics in parallel. Each process keeps a MetricCache of 
+    'tester' across the sample paths it computes. 
     
     Parameters
     ----------
@@ -339,24 +1490,28 @@ def par_diff(rundata, tester, num_proc):
 		Instantiated object such that 'tester.metric' is callable
 	num_proc : int
 		Number of processes to use
+	cache_stats : dict, optional
+		If given, updated with the total cache counts of all processes
+	metname : str, optional
+		One of METRIC_NAMES, default is 'tester', i.e. 'tester.metric'
 	
 	Returns
 	-------
 	hddict : dict
 		keys are the isp number and values are the metric data
     """
+    if metname not in METRIC_NAMES:
+        raise ValueError('Unknown metric ' + str(metname) + ', choose one of ' + ', '.join(METRIC_NAMES) + '.')
     NUM_PROCESSES = num_proc
     num_isp = len(rundata)
-    joblist = []
-    for i in range(num_isp):
-        joblist.append((rundata[i], tester))
     hddict = dict()
-    with mp.Pool(NUM_PROCESSES) as p:
-        worklist = [(gen_metric, (e)) for e in joblist]
-        app_rd = [p.apply_async(do_work, job) for job in worklist]
+    with mp.Pool(NUM_PROCESSES, _init_metric_cache, (tester, metname)) as p:
+        app_rd = [p.apply_async(_cached_gen_metric, (rundata[i], )) for i in range(num_isp)]
         for i, r in enumerate(app_rd):
-            myitem = r.get()
+            myitem, stats = r.get()
             hddict[i] = myitem
+            if cache_stats is not None:
+                add_cache_stats(cache_stats, stats)
     return hddict
 
 
@@ -625,6 +1780,455 @@ def get_nondom(edict):
     return set(Mpts)
 
 
+def _leq(g1, g2):
+    """Return true if every component of 'g1' is at most that of 'g2'."""
+    for i in range(len(g1)):
+        if g1[i] > g2[i]:
+            return False
+    return True
+
+
+def _dom(g1, g2):
+    """Return true if 'g1' dominates 'g2' without relaxation."""
+    return _leq(g1, g2) and not g1 == g2
+
+
+class BiParetoArchive(object):
+    """
+    Maintain the non-dominated points of a bi-objective set as points
+    are inserted and removed.
+    
+    Attributes
+    ----------
+    vals : list of tuple of float
+        Objective values of the archived points, sorted increasing in
+        the first objective and so decreasing in the second
+    pts : list of tuple of int
+        Archived points in the same order as 'vals'
+    gdict : dict
+        Maps archived points to their objective values
+        
+    Notes
+    -----
+    Dominance is as in 'get_nondom': points with equal objective values
+    do not dominate each other and are all kept. 
+    """
+
+    def __init__(self):
+        self.vals = []
+        self.pts = []
+        self.gdict = dict()
+
+    def __len__(self):
+        return len(self.pts)
+
+    def __iter__(self):
+        return iter(self.pts)
+
+    def __contains__(self, x):
+        return x in self.gdict
+
+    def points(self):
+        """
+        Return the archived points.
+        
+        Returns
+        -------
+        set of tuple of int
+        """
+        return set(self.pts)
+
+    def dominated_by(self, gx):
+        """
+        Return true if an archived point dominates 'gx'.
+        
+        Parameters
+        ----------
+        gx : tuple of float
+        
+        Returns
+        -------
+        bool
+        """
+        i = bisect_right(self.vals, gx)
+        # the left neighbor has the smallest second objective of every
+        # point which is no larger in the first
+        return i > 0 and _dom(self.vals[i - 1], gx)
+
+    def insert(self, x, gx):
+        """
+        Add a point to the archive if it is not dominated and remove
+        the archived points it dominates.
+        
+        Parameters
+        ----------
+        x : tuple of int
+        gx : tuple of float
+            Objective values of 'x'
+            
+        Returns
+        -------
+        bool
+            True if 'x' is in the archive after the insertion
+        """
+        if x in self.gdict:
+            return True
+        if self.dominated_by(gx):
+            return False
+        i = bisect_right(self.vals, gx)
+        # points to the right are dominated while they are no better in
+        # the second objective
+        j = i
+        while j < len(self.vals) and self.vals[j][1] >= gx[1]:
+            del self.gdict[self.pts[j]]
+            j += 1
+        self.vals[i:j] = [gx]
+        self.pts[i:j] = [x]
+        self.gdict[x] = gx
+        return True
+
+    def remove(self, x):
+        """
+        Remove a point from the archive.
+        
+        Parameters
+        ----------
+        x : tuple of int
+        """
+        gx = self.gdict.pop(x)
+        i = bisect_left(self.vals, gx)
+        while not self.pts[i] == x:
+            i += 1
+        del self.vals[i]
+        del self.pts[i]
+
+
+class _NDNode(object):
+    """
+    A node of an ND-tree. Leaves store points and internal nodes store
+    children. Both store the ideal and nadir of the points beneath. 
+    """
+
+    def __init__(self):
+        self.pts = dict()
+        self.children = []
+        self.ideal = None
+        self.nadir = None
+
+    def is_leaf(self):
+        return not self.children
+
+    def is_empty(self):
+        return not self.pts and not self.children
+
+    def add_bounds(self, gx):
+        if self.ideal is None:
+            self.ideal = tuple(gx)
+            self.nadir = tuple(gx)
+        else:
+            self.ideal = tuple(min(a, b) for a, b in zip(self.ideal, gx))
+            self.nadir = tuple(max(a, b) for a, b in zip(self.nadir, gx))
+
+    def midpoint(self):
+        return tuple((a + b)/2 for a, b in zip(self.ideal, self.nadir))
+
+
+class NDTreeArchive(object):
+    """
+    Maintain the non-dominated points of a set with any number of 
+    objectives as points are inserted and removed, using an ND-tree.
+    
+    Attributes
+    ----------
+    root : _NDNode
+    gdict : dict
+        Maps archived points to their objective values
+    max_leaf : int
+        Number of points a leaf holds before it is split
+    num_child : int
+        Number of children created when a leaf is split
+        
+    Parameters
+    ----------
+    num_obj : int
+    max_leaf : int, optional
+        Default is 20
+        
+    Notes
+    -----
+    Dominance is as in 'get_nondom'. The node bounds are not tightened
+    when points are removed, which keeps them valid for pruning.
+    
+    See also
+    --------
+    Jaszkiewicz, A. and Lust, T. 2018. ND-Tree-Based Update: A Fast 
+    Algorithm for the Dynamic Nondominance Problem. IEEE Transactions
+    on Evolutionary Computation, 22(5), 778--791.
+    """
+
+    def __init__(self, num_obj, max_leaf=20):
+        self.root = _NDNode()
+        self.gdict = dict()
+        self.max_leaf = max_leaf
+        self.num_child = num_obj + 1
+
+    def __len__(self):
+        return len(self.gdict)
+
+    def __iter__(self):
+        return iter(self.gdict)
+
+    def __contains__(self, x):
+        return x in self.gdict
+
+    def points(self):
+        """
+        Return the archived points.
+        
+        Returns
+        -------
+        set of tuple of int
+        """
+        return set(self.gdict)
+
+    def dominated_by(self, gx):
+        """
+        Return true if an archived point dominates 'gx'.
+        
+        Parameters
+        ----------
+        gx : tuple of float
+        
+        Returns
+        -------
+        bool
+        """
+        if not self.gdict:
+            return False
+        return self._is_dominated(self.root, gx)
+
+    def _is_dominated(self, node, gx):
+        if _dom(node.nadir, gx):
+            return True
+        if not _leq(node.ideal, gx):
+            return False
+        if node.is_leaf():
+            return any(_dom(gp, gx) for gp in node.pts.values())
+        return any(self._is_dominated(ch, gx) for ch in node.children)
+
+    def insert(self, x, gx):
+        """
+        Add a point to the archive if it is not dominated and remove
+        the archived points it dominates.
+        
+        Parameters
+        ----------
+        x : tuple of int
+        gx : tuple of float
+            Objective values of 'x'
+            
+        Returns
+        -------
+        bool
+            True if 'x' is in the archive after the insertion
+        """
+        if x in self.gdict:
+            return True
+        if self.gdict:
+            if self._update(self.root, gx):
+                return False
+            if self.root.is_empty():
+                self.root = _NDNode()
+        self._insert(self.root, x, gx)
+        self.gdict[x] = gx
+        return True
+
+    def _update(self, node, gx):
+        """
+        Remove points beneath 'node' dominated by 'gx' and return true
+        if instead 'gx' is dominated.
+        """
+        if _dom(node.nadir, gx):
+            return True
+        if _dom(gx, node.ideal):
+            self._drop(node)
+            return False
+        if not _leq(node.ideal, gx) and not _leq(gx, node.nadir):
+            return False
+        if node.is_leaf():
+            for p, gp in list(node.pts.items()):
+                if _dom(gp, gx):
+                    return True
+                if _dom(gx, gp):
+                    del node.pts[p]
+                    del self.gdict[p]
+        else:
+            for ch in list(node.children):
+                if self._update(ch, gx):
+                    return True
+                if ch.is_empty():
+                    node.children.remove(ch)
+        return False
+
+    def _drop(self, node):
+        """Remove every point beneath 'node'."""
+        if node.is_leaf():
+            for p in node.pts:
+                del self.gdict[p]
+            node.pts = dict()
+        else:
+            for ch in node.children:
+                self._drop(ch)
+            node.children = []
+
+    def _insert(self, node, x, gx):
+        node.add_bounds(gx)
+        if node.is_leaf():
+            node.pts[x] = gx
+            if len(node.pts) > self.max_leaf:
+                self._split(node)
+        else:
+            ch = min(node.children, key=lambda c: edist(c.midpoint(), gx))
+            self._insert(ch, x, gx)
+
+    def _split(self, node):
+        """Divide the points of a full leaf among new children."""
+        pts = list(node.pts.items())
+        avgd = [sum(edist(gp, gq) for _, gq in pts) for _, gp in pts]
+        seeds = [max(range(len(pts)), key=avgd.__getitem__)]
+        while len(seeds) < min(self.num_child, len(pts)):
+            rest = [i for i in range(len(pts)) if i not in seeds]
+            seeds.append(max(rest, key=lambda i: sum(edist(pts[i][1], pts[j][1]) for j in seeds)))
+        children = []
+        for i in seeds:
+            ch = _NDNode()
+            ch.pts[pts[i][0]] = pts[i][1]
+            ch.add_bounds(pts[i][1])
+            children.append(ch)
+        for i in range(len(pts)):
+            if i in seeds:
+                continue
+            p, gp = pts[i]
+            ch = min(children, key=lambda c: edist(c.midpoint(), gp))
+            ch.pts[p] = gp
+            ch.add_bounds(gp)
+        node.pts = dict()
+        node.children = children
+
+    def remove(self, x):
+        """
+        Remove a point from the archive.
+        
+        Parameters
+        ----------
+        x : tuple of int
+        """
+        gx = self.gdict.pop(x)
+        self._remove(self.root, x, gx)
+        if self.root.is_empty():
+            self.root = _NDNode()
+
+    def _remove(self, node, x, gx):
+        if not _leq(node.ideal, gx) or not _leq(gx, node.nadir):
+            return False
+        if node.is_leaf():
+            if x in node.pts:
+                del node.pts[x]
+                return True
+            return False
+        for ch in node.children:
+            if self._remove(ch, x, gx):
+                if ch.is_empty():
+                    node.children.remove(ch)
+                return True
+        return False
+
+
+def get_archive(num_obj):
+    """
+    Create an empty non-dominated archive suited to the number of 
+    objectives.
+    
+    Parameters
+    ----------
+    num_obj : int
+    
+    Returns
+    -------
+    BiParetoArchive or NDTreeArchive
+    """
+    if num_obj == 2:
+        return BiParetoArchive()
+    return NDTreeArchive(num_obj)
+
+
+class IntervalSweep(object):
+    """
+    Answer the interval queries of the R-Pe epsilon selection in 
+    logarithmic time by keeping the intervals sorted by each bound.
+    
+    Attributes
+    ----------
+    lows : list of float
+        Lower bounds of the intervals, sorted
+    lowmax : list of float
+        'lowmax[i]' is the largest upper bound among the intervals 
+        with the 'i + 1' smallest lower bounds
+    his : list of float
+        Upper bounds of the intervals, sorted
+    
+    Parameters
+    ----------
+    intervals : list of tuple of float
+        Each tuple is (low, hi)
+    """
+
+    def __init__(self, intervals):
+        bylow = sorted(intervals)
+        self.lows = [iv[0] for iv in bylow]
+        self.lowmax = []
+        himax = float('-inf')
+        for iv in bylow:
+            himax = max(himax, iv[1])
+            self.lowmax.append(himax)
+        self.his = sorted(iv[1] for iv in intervals)
+
+    def covers(self, q):
+        """
+        Return true if 'q' is in the half open interval (low, hi] of 
+        any interval.
+        
+        Parameters
+        ----------
+        q : float
+        
+        Returns
+        -------
+        bool
+        """
+        i = bisect_left(self.lows, q)
+        # of the intervals with low < q, one covers q if any reaches it
+        return i > 0 and q <= self.lowmax[i - 1]
+
+    def max_hi_below(self, q):
+        """
+        Return the largest upper bound less than 'q'.
+        
+        Parameters
+        ----------
+        q : float
+        
+        Returns
+        -------
+        float
+            The bound, or float('-inf') if no upper bound is below 'q'
+        """
+        i = bisect_left(self.his, q)
+        if i == 0:
+            return float('-inf')
+        return self.his[i - 1]
+
+
 def get_nbors(x, r=1):
     """
     Find all neighbors of a point.
@@ -749,6 +2353,22 @@ def edist(x1,x2):
     return sqrt(sum([pow(x1[i] - x2[i], 2) for i in range(q)]))
 
 
+def sqdist(x1, x2):
+    """
+    Compute the squared Euclidean distance between two vectors.
+    
+    Parameters
+    ----------
+    x1 : tuple of numbers
+    x2 : tuple of numbers
+    
+    Returns
+    -------
+    float
+    """
+    return sum((a - b)**2 for a, b in zip(x1, x2))
+
+
 def dxB(x, B):
     """
     Compute distance from a point to a set.
@@ -756,18 +2376,20 @@ def dxB(x, B):
     Parameters
     ----------
     x : tuple of numbers
-	B : set of tuple of numbers
-	
-	Returns
-	-------
-	dmin : float
+    B : set of tuple of numbers or KDTree
+    
+    Returns
+    -------
+    dmin : float
     """
+    if isinstance(B, KDTree):
+        return B.nearest(x)[0]
     dmin = float('inf')
     for b in B:
-        dxb = edist(x, b)
+        dxb = sqdist(x, b)
         if dxb < dmin:
             dmin = dxb
-    return dmin
+    return sqrt(dmin)
 
 
 def dAB(A, B):
@@ -776,19 +2398,50 @@ def dAB(A, B):
     
     Parameters
     ----------
-    A : set of tuple of numbers
-	B : set of tuple of numbers
-	
-	Returns
-	-------
-	dmax : float
+    A : set of tuple of numbers or KDTree
+    B : set of tuple of numbers or KDTree
+    
+    Returns
+    -------
+    dmax : float
+    
+    Notes
+    -----
+    The search of 'B' for a point of 'A' stops as soon as it finds a 
+    point closer than the current maximum, since that point of 'A' can
+    no longer change the result. Both sets are sorted and each search 
+    starts where the nearest point of the previous search was found, 
+    so that on frontiers the early stop happens after a few points.
+    When 'B' is a KDTree, each point of 'A' is a nearest-neighbor query.
     """
+    if isinstance(B, KDTree):
+        dmax = float('-inf')
+        for a in A:
+            daB = B.nearest(a)[0]
+            if daB > dmax:
+                dmax = daB
+        return dmax
+    A = sorted(A)
+    B = sorted(B)
+    nb = len(B)
     dmax = float('-inf')
+    jstart = 0
     for a in A:
-        daB = dxB(a, B)
-        if daB > dmax:
-            dmax = daB
-    return dmax
+        dmin = float('inf')
+        jmin = jstart
+        for j in chain(range(jstart, nb), range(jstart)):
+            daj = sqdist(a, B[j])
+            if daj < dmin:
+                dmin = daj
+                jmin = j
+                if dmin <= dmax:
+                    break
+        jstart = jmin
+        if dmin > dmax:
+            dmax = dmin
+    if dmax == float('-inf'):
+        return dmax
+    return sqrt(dmax)
 
 
 def dh(A, B):
@@ -797,8 +2450,8 @@ def dh(A, B):
     
     Parameters
     ----------
-    A : set of tuple of numbers
-    B : set of tuple of numbers
+    A : set of tuple of numbers or KDTree
+    B : set of tuple of numbers or KDTree
     
     Returns
     -------
@@ -806,3 +2459,255 @@ def dh(A, B):
 		The Hausdorf distance
     """
     return max(dAB(A, B), dAB(B, A))
+
+
+class KDTree(object):
+    """
+    A static k-d tree over a set of points for nearest-neighbor queries.
+    Build one over a set that is queried many times, e.g. the true 
+    frontier of a tester, and pass it in place of the set to 'dxB', 
+    'dAB', or 'dh'. 
+    
+    Attributes
+    ----------
+    pts : list of tuple of numbers
+    leaf_size : int
+        Most points stored in a leaf
+    root : tuple
+        Internal nodes are (axis, split, left, right, None) and leaves
+        are (None, None, None, None, points)
+    
+    Parameters
+    ----------
+    pts : iterable of tuple of numbers
+    leaf_size : int, optional
+        Default is 8
+    """
+
+    def __init__(self, pts, leaf_size=8):
+        self.pts = list(pts)
+        self.leaf_size = leaf_size
+        self.root = self._build(list(range(len(self.pts))))
+
+    def __len__(self):
+        return len(self.pts)
+
+    def __iter__(self):
+        return iter(self.pts)
+
+    def _build(self, idx):
+        pts = self.pts
+        if len(idx) <= self.leaf_size:
+            return (None, None, None, None, [pts[i] for i in idx])
+        # split the widest coordinate at its median
+        q = len(pts[idx[0]])
+        spread = [max(pts[i][j] for i in idx) - min(pts[i][j] for i in idx) for j in range(q)]
+        axis = max(range(q), key=spread.__getitem__)
+        idx.sort(key=lambda i: pts[i][axis])
+        half = len(idx)//2
+        split = pts[idx[half]][axis]
+        return (axis, split, self._build(idx[:half]), self._build(idx[half:]), None)
+
+    def nearest(self, x, plus=False):
+        """
+        Find the point nearest to 'x'. 
+        
+        Parameters
+        ----------
+        x : tuple of numbers
+        plus : bool, optional
+            If True, use the distance of IGD+, which counts only the 
+            components in which a point is larger than 'x'. Default is
+            False, the Euclidean distance. 
+        
+        Returns
+        -------
+        dmin : float
+            Distance from 'x' to the nearest point, float('inf') if 
+            the tree is empty
+        xmin : tuple of numbers
+            The nearest point
+        """
+        dmin = float('inf')
+        xmin = None
+        stack = [(0.0, self.root)]
+        while stack:
+            bound, node = stack.pop()
+            if bound >= dmin:
+                continue
+            axis, split, left, right, leaf = node
+            if leaf is not None:
+                for p in leaf:
+                    if plus:
+                        dxp = sum(max(a - b, 0)**2 for a, b in zip(p, x))
+                    else:
+                        dxp = sqdist(x, p)
+                    if dxp < dmin:
+                        dmin = dxp
+                        xmin = p
+                continue
+            diff = x[axis] - split
+            # every point across the split is at least diff away, 
+            # except that in IGD+ smaller points may be at distance 0
+            if diff <= 0:
+                near, far = left, right
+                fbound = diff*diff
+            else:
+                near, far = right, left
+                fbound = 0.0 if plus else diff*diff
+            stack.append((fbound, far))
+            stack.append((bound, near))
+        return sqrt(dmin), xmin
+
+
+def _nondom_vals(vals):
+    """
+    Remove the weakly dominated and repeated vectors of a list.
+    
+    Parameters
+    ----------
+    vals : list of tuple of float
+    
+    Returns
+    -------
+    nd : list of tuple of float
+    """
+    nd = []
+    # a vector is preceded by every vector weakly dominating it
+    for v in sorted(vals):
+        if not any(_leq(u, v) for u in nd):
+            nd.append(v)
+    return nd
+
+
+def _hv2d(vals, ref):
+    """
+    Compute the hypervolume of bi-objective vectors by a sweep. 
+    
+    Parameters
+    ----------
+    vals : list of tuple of float
+    ref : tuple of float
+    
+    Returns
+    -------
+    vol : float
+    """
+    vol = 0.0
+    g2min = ref[1]
+    for v in sorted(vals):
+        if v[1] < g2min:
+            vol += (ref[0] - v[0])*(g2min - v[1])
+            g2min = v[1]
+    return vol
+
+
+def _wfg(vals, ref):
+    """
+    Compute the hypervolume of mutually non-dominated vectors, which 
+    all dominate 'ref', using the WFG algorithm. 
+    
+    Parameters
+    ----------
+    vals : list of tuple of float
+    ref : tuple of float
+    
+    Returns
+    -------
+    vol : float
+    
+    See also
+    --------
+    While, L., Bradstreet, L., and Barone, L. 2012. A Fast Way of 
+    Calculating Exact Hypervolumes. IEEE Transactions on Evolutionary
+    Computation, 16(1), 86--95.
+    """
+    q = len(ref)
+    if not vals:
+        return 0.0
+    if q == 1:
+        return ref[0] - min(v[0] for v in vals)
+    if q == 2:
+        return _hv2d(vals, ref)
+    # worse vectors first keeps the limited sets small
+    vals = sorted(vals, key=lambda v: v[q - 1], reverse=True)
+    vol = 0.0
+    for i, v in enumerate(vals):
+        incvol = 1.0
+        for k in range(q):
+            incvol *= ref[k] - v[k]
+        limset = [tuple(max(v[k], u[k]) for k in range(q)) for u in vals[i + 1:]]
+        vol += incvol - _wfg(_nondom_vals(limset), ref)
+    return vol
+
+
+def hv(A, ref):
+    """
+    Compute the hypervolume dominated by a set and bounded by a 
+    reference point, in O(n log n) for two objectives and with the WFG
+    algorithm otherwise. 
+    
+    Parameters
+    ----------
+    A : set of tuple of numbers
+        Objective values
+    ref : tuple of numbers
+        Reference point, which only values smaller in every objective 
+        contribute to
+    
+    Returns
+    -------
+    float
+    """
+    q = len(ref)
+    vals = [tuple(a) for a in A if all(a[k] < ref[k] for k in range(q))]
+    if q > 2:
+        vals = _nondom_vals(vals)
+    return _wfg(vals, ref)
+
+
+def igd(A, Z):
+    """
+    Compute the inverted generational distance of a set to a reference
+    set, the mean distance from reference points to the set.
+    
+    Parameters
+    ----------
+    A : set of tuple of numbers
+    Z : set of tuple of numbers or KDTree
+        Reference points, e.g. the true frontier
+    
+    Returns
+    -------
+    float
+    """
+    tree = KDTree(A)
+    dists = [tree.nearest(z)[0] for z in Z]
+    return sum(dists)/len(dists)
+
+
+def igdplus(A, Z):
+    """
+    Compute the IGD+ of a set to a reference set, which is IGD where 
+    only the objectives in which a point of 'A' is worse than a 
+    reference point count towards their distance.
+    
+    Parameters
+    ----------
+    A : set of tuple of numbers
+    Z : set of tuple of numbers or KDTree
+        Reference points, e.g. the true frontier
+    
+    Returns
+    -------
+    float
+    
+    See also
+    --------
+    Ishibuchi, H., Masuda, H., Tanigaki, Y., and Nojima, Y. 2015. 
+    Modified Distance Calculation in Generational Distance and Inverted
+    Generational Distance. EMO 2015, LNCS 9019, 110--125.
+    """
+    tree = KDTree(A)
+    dists = [tree.nearest(z, plus=True)[0] for z in Z]
+    return sum(dists)/len(dists)
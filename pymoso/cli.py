@@ -3,23 +3,37 @@ pymoso
 
 Usage:
   pymoso listitems
-  pymoso solve [--budget=B] [--odir=D] [--crn] [--simpar=P]
+  pymoso solve [--budget=B] [--time-budget=S] [--odir=D] [--db=F] [--crn] [--simpar=P]
     [(--seed <s> <s> <s> <s> <s> <s>)] [(--param <param> <val>)]...
     <problem> <solver> <x>...
-  pymoso testsolve [--budget=B] [--odir=D] [--crn] [--isp=T] [--proc=Q]
-    [--metric] [(--seed <s> <s> <s> <s> <s> <s>)] [(--param <param> <val>)]...
+  pymoso testsolve [--budget=B] [--time-budget=S] [--odir=D] [--db=F] [--crn] [--isp=T] [--proc=Q]
+    [--simpar=P] [--chunk=C] [--metric=M] [--format=F] [--resume] [(--seed <s> <s> <s> <s> <s> <s>)]
+    [(--param <param> <val>)]...
     <tester> <solver> [<x>...]
   pymoso -h | --help
   pymoso -v | --version
 
 Options:
   --budget=B                Set the simulation budget [default: 200]
+  --time-budget=S           Set a wall-clock limit of S seconds for each solver run.
   --odir=D                  Set the output file directory name. [default: testrun]
+  --db=F                    Also save the results to the sqlite database file F.
   --crn                     Set if common random numbers are desired.
-  --simpar=P                Set number of parallel processes for simulation replications. [default: 1]
+  --simpar=P                Set number of parallel processes (or, for testsolve,
+                            chunks) for simulation replications, or auto to
+                            choose from the measured simulation cost. [default: 1]
   --isp=T                   Set number of algorithm instances to solve. [default: 1]
-  --proc=Q                  Set number of parallel processes for the algorithm instances. [default: 1]
-  --metric                  Set if metric computation is desired.
+  --proc=Q                  Set number of parallel processes for the algorithm
+                            instances, or auto to use every CPU. [default: 1]
+  --chunk=C                 Set number of algorithm instances a process takes at a time. [default: 1]
+  --metric=M                Compute metric M: tester (the tester's own metric,
+                            also chosen by a bare --metric), dh, hv, igd, or
+                            igdplus.
+  --format=F                Set the testsolve output format: txt, text files for
+                            each algorithm instance, or bin, one binary file
+                            for all of them. [default: txt]
+  --resume                  Run only the algorithm instances not yet saved in
+                            the output directory, e.g. after an interruption.
   --seed                    Set the random number seed with 6 spaced integers.
   --param                   Specify a solver-specific parameter <param> <val>.
   -h --help                 Show this screen.
@@ -32,8 +46,14 @@ Examples:
   pymoso solve --seed 12345 32123 5322 2 9543 666666666 ProbTPC RPERLE 31 21 11
   pymoso solve --simpar=4 --param betaeps 0.4 ProbTPA RPERLE 30 30
   pymoso solve --param radius 3 ProbTPA RPERLE 45 45
+  pymoso solve --budget=1000000 --time-budget=60 ProbTPA RPERLE 45 45
   pymoso testsolve --isp=16 --proc=4 TPATester RPERLE
+  pymoso testsolve --isp=4 --proc=auto --simpar=auto TPATester RPERLE
   pymoso testsolve --isp=20 --proc=10 --metric --crn TPBTester RMINRLE 9 9
+  pymoso testsolve --isp=20 --metric=igdplus TPATester RPERLE
+  pymoso testsolve --isp=10000 --proc=8 --format=bin TPATester RPERLE
+  pymoso testsolve --isp=20 --metric --db=results.db TPATester RPERLE
+  pymoso testsolve --isp=5000 --proc=8 --resume TPATester RPERLE
 
 Help:
   Use the listitems command to view a list of available solvers, problems, and
@@ -41,9 +61,33 @@ Help:
 """
 
 
+import sys
 from inspect import getmembers, isclass
 from docopt import docopt
 from . import __version__ as VERSION
+from .chnutils import METRIC_NAMES
+
+
+def metric_argv(argv):
+    """
+    Rewrite a bare --metric, i.e. one not followed by a metric name, as
+    --metric=tester, which selects the tester's own metric. 
+    
+    Parameters
+    ----------
+    argv : list of str
+    
+    Returns
+    -------
+    list of str
+    """
+    newargv = []
+    for i, a in enumerate(argv):
+        nexta = argv[i + 1] if i + 1 < len(argv) else None
+        if a == '--metric' and (nexta is None or nexta.startswith('-') or nexta not in METRIC_NAMES):
+            a = '--metric=tester'
+        newargv.append(a)
+    return newargv
 
 
 def main():
@@ -51,7 +95,8 @@ def main():
     Main CLI entrypoint.
     """
     from . import commands
-    options = docopt(__doc__, version=VERSION)
+    argv = metric_argv(sys.argv[1:])
+    options = docopt(__doc__, argv=argv, version=VERSION)
     for (k, v) in options.items():
         if hasattr(commands, k) and v:
             commod = getattr(commands, k)
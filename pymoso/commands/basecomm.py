@@ -12,8 +12,13 @@ from .. import solvers
 from .. import problems
 from .. import testers
 from random import Random
-from json import dump
+from json import dump, dumps, load, loads
 import traceback
+import struct
+import sys
+from array import array
+from math import isnan
+from ast import literal_eval
 
 
 def check_expname(name):
@@ -27,7 +32,8 @@ def check_expname(name):
 	
 	Returns
 	-------
-	datstr: str
+	datstr: dict
+		The experiment metadata, or False if there is none
 	"""
     if not os.path.isdir(name):
         return False
@@ -36,10 +42,68 @@ def check_expname(name):
     if not fpath.is_file():
         return False
     with open(fn, 'r') as f1:
-        datstr = json.load(f1)
+        datstr = load(f1)
     return datstr
 
 
+def runopts_path(name):
+	"""
+	Return the path of the file of the options of a testsolve 
+	experiment.
+	
+	Parameters
+	----------
+	name : str
+	
+	Returns
+	-------
+	str
+	"""
+    return os.path.join(name, 'runopts_' + name + '.txt')
+
+
+def save_runopts(name, opts):
+	"""
+	Save the options which determine the results of a testsolve 
+	experiment before it starts, so that resuming it can check them.
+	
+	Parameters
+	----------
+	name : str
+	opts : dict
+		Option names and values which JSON can hold
+	"""
+    pathlib.Path(name).mkdir(exist_ok=True)
+    with open(runopts_path(name), 'w') as f1:
+        dump(opts, f1, indent=4, sort_keys=True)
+
+
+def check_runopts(name, opts):
+	"""
+	Compare the options of a testsolve experiment with those saved 
+	when it started. 
+	
+	Parameters
+	----------
+	name : str
+	opts : dict
+	
+	Returns
+	-------
+	list of str
+		Names of the options which differ. If no options were saved, 
+		the list holds only 'all'. 
+	"""
+    pth = runopts_path(name)
+    if not os.path.isfile(pth):
+        return ['all']
+    with open(pth, 'r') as f1:
+        saved = load(f1)
+    ## compare as JSON holds them, e.g. tuples as lists
+    opts = loads(dumps(opts))
+    return sorted(k for k in set(saved) | set(opts) if not saved.get(k) == opts.get(k))
+
+
 def save_errortb(name, errmsg):
 	"""
 	Save a message to a file.
@@ -74,7 +138,7 @@ def save_metadata(name, humantxt):
         dump(humantxt, f1, indent=4, separators=(',', ': '))
 
 
-def gen_humanfile(name, probn, solvn, budget, runtime, param, vals, startseed, endseed):
+def gen_humanfile(name, probn, solvn, budget, runtime, param, vals, startseed, endseed, tuning=None):
 	"""
 	Generate a human-readable experiment metadata string
 	
@@ -88,6 +152,9 @@ def gen_humanfile(name, probn, solvn, budget, runtime, param, vals, startseed, e
 	vals : list
 	startseed : tuple of int
 	endseed : tuple of int
+	tuning : dict, optional
+		The outcome of an automatic choice of processes, see 
+		chnutils.calibrate
 	
 	Returns
 	-------
@@ -100,6 +167,8 @@ def gen_humanfile(name, probn, solvn, budget, runtime, param, vals, startseed, e
     dnames = ('Name', 'Problem', 'Algorithm', 'Budget', 'Run time', 'Day', 'Time', 'Params', 'Param Values', 'start seed', 'end seed')
     ddate = (name, probn, solvn, budget, runtime, tstr, timestr, param, vals, startseed, endseed)
     ddict = collections.OrderedDict(zip(dnames, ddate))
+    if tuning:
+        ddict['Tuning'] = tuning
     return ddict
 
 
@@ -126,7 +195,8 @@ def save_metrics(name, exp, metdata):
 
 def save_isp(name, exp, ispdat):
 	"""
-	Save testsolve output to the experiment file. 
+	Save testsolve output to the experiment file. The file appears 
+	only once it is complete, so it marks the run as finished. 
 	
 	Parameters
 	----------
@@ -141,8 +211,106 @@ def save_isp(name, exp, ispdat):
     for i in ispdat:
         isplst.append(str(ispdat[i]))
     ispstr = '\n'.join(isplst)
-    with open(ispdatpth, 'w') as f1:
+    with open(ispdatpth + '.part', 'w') as f1:
         f1.write(ispstr)
+    os.replace(ispdatpth + '.part', ispdatpth)
+
+
+def save_simtimes(name, exp, rundat):
+	"""
+	Save the iteration, simulation calls, and elapsed seconds at the 
+	end of each iteration of a testsolve run to the experiment file.
+	
+	Parameters
+	----------
+	name : str
+	exp : int
+	rundat : dict
+		Output of a 'chnbase.MOSOSolver.solve' call with a 'simtimes'
+		key
+	"""
+    pref = 'simtimes_' + str(exp) + '_'
+    timesn = pref + name + '.txt'
+    timespth = os.path.join(name, timesn)
+    timelst = []
+    for nu in rundat['simtimes']:
+        timelst.append(str((nu, rundat['simcalls'][nu], rundat['simtimes'][nu])))
+    timestr = '\n'.join(timelst)
+    with open(timespth, 'w') as f1:
+        f1.write(timestr)
+
+
+def load_runtxt(name, exp):
+	"""
+	Read a testsolve run from the text files of 'save_isp', 
+	'save_simtimes', and 'save_metrics'. 
+	
+	Parameters
+	----------
+	name : str
+	exp : int
+	
+	Returns
+	-------
+	rundat : dict
+		Has the key 'itersoln', and 'simcalls', 'simtimes', and 
+		'metrics' if their files exist
+	"""
+    def read_lines(pref):
+        pth = os.path.join(name, pref + str(exp) + '_' + name + '.txt')
+        if not os.path.isfile(pth):
+            return None
+        with open(pth, 'r') as f1:
+            return [literal_eval(line) for line in f1.read().split('\n') if line]
+    ## empty solutions are saved as 'set()'
+    with open(os.path.join(name, 'ispdata_' + str(exp) + '_' + name + '.txt'), 'r') as f1:
+        isplst = [set() if line == 'set()' else literal_eval(line) for line in f1.read().split('\n')]
+    rundat = {'itersoln': dict(enumerate(isplst))}
+    timelst = read_lines('simtimes_')
+    if timelst is not None:
+        rundat['simcalls'] = {tup[0]: tup[1] for tup in timelst}
+        rundat['simtimes'] = {tup[0]: tup[2] for tup in timelst}
+    metlst = read_lines('metrics_')
+    if metlst is not None:
+        rundat['metrics'] = {tup[0]: tup for tup in metlst}
+        rundat.setdefault('simcalls', {tup[0]: tup[1] for tup in metlst})
+    return rundat
+
+
+def find_completed(name, fmt='txt'):
+	"""
+	Find the testsolve runs an experiment has saved, such as before it
+	was interrupted. For the binary format, also cut off a record which
+	was left unfinished, so that more runs can be appended. 
+	
+	Parameters
+	----------
+	name : str
+	fmt : str, optional
+		'txt' or 'bin', default is 'txt'
+	
+	Returns
+	-------
+	set of int
+		The isp numbers of the saved runs
+	"""
+    if fmt == 'bin':
+        pth = runbin_path(name)
+        if not os.path.isfile(pth) or os.path.getsize(pth) < len(FILE_MAGIC):
+            return set()
+        runs = RunFile(pth)
+        os.truncate(pth, runs.end)
+        return set(runs.isps())
+    if not os.path.isdir(name):
+        return set()
+    pref = 'ispdata_'
+    suff = '_' + name + '.txt'
+    done = set()
+    for fn in os.listdir(name):
+        num = fn[len(pref):-len(suff)]
+        if fn.startswith(pref) and fn.endswith(suff) and num.isdigit():
+            done.add(int(num))
+    return done
 
 
 def save_les(name, lesstr):
@@ -161,6 +329,445 @@ def save_les(name, lesstr):
         f2.write(lesstr)
 
 
+## the binary results file starts with FILE_MAGIC, then holds one record
+## per isp in the order the runs finish: the header REC_HEAD of record 
+## magic, isp, point dimension, numbers of iterations, points, and 
+## metrics, and the typecode of the coordinates, then the columns 
+## iteration numbers (uint32), points per iteration (uint32), simulation
+## calls (int64), seconds (float64, nan if unknown), point coordinates 
+## (the smallest signed integer type which holds them all), and metric 
+## iterations (uint32), calls (int64), and values (float64)
+FILE_MAGIC = b'PMRF0001'
+REC_MAGIC = b'PMRR'
+REC_HEAD = struct.Struct('<4sIIIIIc')
+COORD_SIZES = ((b'b', 1), (b'h', 2), (b'i', 4), (b'q', 8))
+
+
+def _tobytes(typecode, vals):
+	"""
+	Pack a column as little-endian bytes.
+	
+	Parameters
+	----------
+	typecode : str
+		An array typecode
+	vals : iterable of int or float
+	
+	Returns
+	-------
+	bytes
+	"""
+    col = array(typecode, vals)
+    if sys.byteorder == 'big':
+        col.byteswap()
+    return col.tobytes()
+
+
+def _frombytes(typecode, buf):
+	"""
+	Unpack a column written by '_tobytes'.
+	
+	Parameters
+	----------
+	typecode : str
+	buf : bytes
+	
+	Returns
+	-------
+	array.array
+	"""
+    col = array(typecode)
+    col.frombytes(buf)
+    if sys.byteorder == 'big':
+        col.byteswap()
+    return col
+
+
+def runbin_path(name):
+	"""
+	Return the path of the binary results file of an experiment.
+	
+	Parameters
+	----------
+	name : str
+	
+	Returns
+	-------
+	str
+	"""
+    return os.path.join(name, 'results_' + name + '.bin')
+
+
+def save_runbin(name, exp, rundat):
+	"""
+	Append the solutions, simulation calls, and seconds of every 
+	iteration, and the metrics if any, of a testsolve run to the binary
+	results file of the experiment. Unlike 'save_isp', 'save_metrics', 
+	and 'save_simtimes', all runs share one file. Read it with RunFile.
+	
+	Parameters
+	----------
+	name : str
+	exp : int
+	rundat : dict
+		Output of a 'chnbase.MOSOSolver.solve' call, with the key 
+		'metrics' if they were computed
+	"""
+    itersoln = rundat['itersoln']
+    simtimes = rundat.get('simtimes', dict())
+    metrics = rundat.get('metrics', dict())
+    nus = list(itersoln)
+    pts = [x for nu in nus for x in itersoln[nu]]
+    dim = len(pts[0]) if pts else 0
+    coords = [c for x in pts for c in x]
+    big = max([abs(c) + 1 for c in coords], default=0)
+    ctype = [tc for tc, sz in COORD_SIZES if big <= 2**(8*sz - 1)][0]
+    head = REC_HEAD.pack(REC_MAGIC, exp, dim, len(nus), len(pts), len(metrics), ctype)
+    cols = [
+        _tobytes('I', nus),
+        _tobytes('I', [len(itersoln[nu]) for nu in nus]),
+        _tobytes('q', [rundat['simcalls'][nu] for nu in nus]),
+        _tobytes('d', [simtimes.get(nu, float('nan')) for nu in nus]),
+        _tobytes(ctype.decode(), coords),
+        _tobytes('I', [metrics[nu][0] for nu in metrics]),
+        _tobytes('q', [metrics[nu][1] for nu in metrics]),
+        _tobytes('d', [metrics[nu][2] for nu in metrics]),
+        ]
+    pathlib.Path(name).mkdir(exist_ok=True)
+    with open(runbin_path(name), 'ab') as f1:
+        if f1.tell() == 0:
+            f1.write(FILE_MAGIC)
+        f1.write(head + b''.join(cols))
+
+
+class RunFile(object):
+    """
+    Read the runs of a binary results file written by 'save_runbin'. 
+    Opening the file reads only the record headers, and each run is 
+    read when it is asked for. A record cut short, such as by a killed
+    experiment, is ignored. 
+    
+    Attributes
+    ----------
+    path : str
+	index : dict
+		Keys are isp numbers, values are tuples of the file offset of
+		the columns, the record header fields, and the coordinate size
+	end : int
+		The file offset after the last complete record
+	
+	Parameters
+	----------
+	path : str
+		The file, or the name of the experiment directory
+	
+	Examples
+	--------
+	>>> runs = RunFile('testrun')
+	>>> runs.isps()
+	[0, 1, 2]
+	>>> runs.load(1)['itersoln'][4]
+    """
+
+    def __init__(self, path):
+        if os.path.isdir(path):
+            base = os.path.basename(os.path.normpath(path))
+            path = os.path.join(path, 'results_' + base + '.bin')
+        self.path = path
+        self.index = dict()
+        size = os.path.getsize(path)
+        self.end = len(FILE_MAGIC)
+        with open(path, 'rb') as f1:
+            if not f1.read(len(FILE_MAGIC)) == FILE_MAGIC:
+                raise ValueError(path + ' is not a PyMOSO results file.')
+            pos = f1.tell()
+            while pos + REC_HEAD.size <= size:
+                magic, exp, dim, niter, npts, nmet, ctype = REC_HEAD.unpack(f1.read(REC_HEAD.size))
+                if not magic == REC_MAGIC:
+                    break
+                csize = dict(COORD_SIZES)[ctype]
+                start = pos + REC_HEAD.size
+                pos = start + 24*niter + csize*npts*dim + 20*nmet
+                if pos > size:
+                    break
+                self.index[exp] = (start, dim, niter, npts, nmet, ctype, csize)
+                self.end = pos
+                f1.seek(pos)
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, exp):
+        return exp in self.index
+
+    def isps(self):
+		"""
+		Return the isp numbers of the runs in the file.
+		
+		Returns
+		-------
+		list of int
+		"""
+        return sorted(self.index)
+
+    def load(self, exp):
+		"""
+		Read one run. 
+		
+		Parameters
+		----------
+		exp : int
+			The isp number
+		
+		Returns
+		-------
+		rundat : dict
+			Has keys 'itersoln', 'simcalls', and 'simtimes' as the 
+			output of 'chnbase.MOSOSolver.solve', and 'metrics' as the
+			output of 'chnutils.gen_metric' if the run has metrics
+		
+		Raises
+		------
+		KeyError
+			If the file has no run 'exp'
+		"""
+        start, dim, niter, npts, nmet, ctype, csize = self.index[exp]
+        with open(self.path, 'rb') as f1:
+            f1.seek(start)
+            nus = _frombytes('I', f1.read(4*niter))
+            lens = _frombytes('I', f1.read(4*niter))
+            calls = _frombytes('q', f1.read(8*niter))
+            secs = _frombytes('d', f1.read(8*niter))
+            coords = _frombytes(ctype.decode(), f1.read(csize*npts*dim))
+            metnus = _frombytes('I', f1.read(4*nmet))
+            metcalls = _frombytes('q', f1.read(8*nmet))
+            metvals = _frombytes('d', f1.read(8*nmet))
+        itersoln = dict()
+        k = 0
+        for nu, n in zip(nus, lens):
+            itersoln[nu] = {tuple(coords[dim*j:dim*(j + 1)]) for j in range(k, k + n)}
+            k += n
+        rundat = {'itersoln': itersoln, 'simcalls': dict(zip(nus, calls))}
+        rundat['simtimes'] = {nu: t for nu, t in zip(nus, secs) if not isnan(t)}
+        if nmet:
+            rundat['metrics'] = {nu: (nu, c, v) for nu, c, v in zip(metnus, metcalls, metvals)}
+        return rundat
+
+
+class ResultDB(object):
+    """
+    Store the results of experiments in a sqlite database, so that 
+    many experiments can be compared with SQL. Runs are written in 
+    batches, each in one transaction. The tables are
+    
+    - experiments(id, name, command, problem, solver, budget, metric, 
+      metadata), 'problem' being the tester of testsolve, and 
+      'metadata' the JSON of the experiment metadata file
+    - runs(experiment, solver, tester, isp, simcalls, endseed), indexed 
+      on (experiment, solver, tester, isp)
+    - iterations(experiment, isp, nu, simcalls, simtime, metric)
+    - points(experiment, isp, nu, point), 'point' being a JSON list. 
+      The solution of a solve has a null 'nu'. 
+    
+    Attributes
+    ----------
+    path : str
+	conn : sqlite3.Connection
+	batch : int
+		Number of runs written in each transaction
+	pending : int
+		Number of runs waiting to be written
+	rows : dict
+		The rows waiting to be written, by table
+	
+	Parameters
+	----------
+	path : str
+	batch : int, optional
+		Default is 100
+	
+	Examples
+	--------
+	>>> db = ResultDB('results.db')
+	>>> db.conn.execute('SELECT isp, MAX(simcalls) FROM iterations WHERE experiment = 1 GROUP BY isp').fetchall()
+    """
+
+    SCHEMA = (
+        'CREATE TABLE IF NOT EXISTS experiments (id INTEGER PRIMARY KEY, name TEXT, command TEXT, problem TEXT, solver TEXT, budget INTEGER, metric TEXT, metadata TEXT)',
+        'CREATE TABLE IF NOT EXISTS runs (experiment INTEGER, solver TEXT, tester TEXT, isp INTEGER, simcalls INTEGER, endseed TEXT, PRIMARY KEY (experiment, isp))',
+        'CREATE TABLE IF NOT EXISTS iterations (experiment INTEGER, isp INTEGER, nu INTEGER, simcalls INTEGER, simtime REAL, metric REAL, PRIMARY KEY (experiment, isp, nu))',
+        'CREATE TABLE IF NOT EXISTS points (experiment INTEGER, isp INTEGER, nu INTEGER, point TEXT)',
+        'CREATE INDEX IF NOT EXISTS runs_idx ON runs (experiment, solver, tester, isp)',
+        'CREATE INDEX IF NOT EXISTS points_idx ON points (experiment, isp, nu)',
+        'CREATE INDEX IF NOT EXISTS experiments_idx ON experiments (name)',
+        )
+
+    def __init__(self, path, batch=100):
+        import sqlite3
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.batch = batch
+        self.pending = 0
+        self.rows = {'runs': [], 'iterations': [], 'points': []}
+        with self.conn:
+            for stmt in self.SCHEMA:
+                self.conn.execute(stmt)
+
+    def add_experiment(self, name, command, problem, solver, budget, metric=None):
+		"""
+		Record a new experiment.
+		
+		Parameters
+		----------
+		name : str
+		command : str
+			'solve' or 'testsolve'
+		problem : str
+			The problem, or tester of testsolve
+		solver : str
+		budget : int
+		metric : str, optional
+		
+		Returns
+		-------
+		int
+			The id of the experiment
+		"""
+        with self.conn:
+            cur = self.conn.execute('INSERT INTO experiments (name, command, problem, solver, budget, metric) VALUES (?, ?, ?, ?, ?, ?)', (name, command, problem, solver, budget, metric))
+        return cur.lastrowid
+
+    def find_experiment(self, name, command):
+		"""
+		Return the id of the latest experiment of a name and command, 
+		such as one to resume. 
+		
+		Parameters
+		----------
+		name : str
+		command : str
+		
+		Returns
+		-------
+		int or None
+			None if there is no such experiment
+		"""
+        row = self.conn.execute('SELECT MAX(id) FROM experiments WHERE name = ? AND command = ?', (name, command)).fetchone()
+        return row[0]
+
+    def isps(self, exp_id):
+		"""
+		Return the isp numbers of the runs of an experiment written so 
+		far. 
+		
+		Parameters
+		----------
+		exp_id : int
+		
+		Returns
+		-------
+		set of int
+		"""
+        return {row[0] for row in self.conn.execute('SELECT isp FROM runs WHERE experiment = ?', (exp_id, ))}
+
+    def set_metric(self, exp_id, metric):
+		"""
+		Change the metric of an experiment, e.g. to None when it cannot
+		be computed. 
+		
+		Parameters
+		----------
+		exp_id : int
+		metric : str or None
+		"""
+        with self.conn:
+            self.conn.execute('UPDATE experiments SET metric = ? WHERE id = ?', (metric, exp_id))
+
+    def set_metadata(self, exp_id, metadata):
+		"""
+		Save the metadata of an experiment when it finishes.
+		
+		Parameters
+		----------
+		exp_id : int
+		metadata : dict
+			Output of 'gen_humanfile'
+		"""
+        with self.conn:
+            self.conn.execute('UPDATE experiments SET metadata = ? WHERE id = ?', (dumps(metadata), exp_id))
+
+    def add_run(self, exp_id, isp, rundat, solver=None, tester=None):
+		"""
+		Add a testsolve run, writing it with the next batch.
+		
+		Parameters
+		----------
+		exp_id : int
+		isp : int
+		rundat : dict
+			Output of a 'chnbase.MOSOSolver.solve' call, with the key 
+			'metrics' if they were computed
+		solver : str, optional
+		tester : str, optional
+		"""
+        itersoln = rundat['itersoln']
+        simcalls = rundat['simcalls']
+        simtimes = rundat.get('simtimes', dict())
+        metrics = rundat.get('metrics', dict())
+        endseed = rundat.get('endseed')
+        if endseed is not None:
+            endseed = dumps([int(s) for s in endseed])
+        lastcalls = max(simcalls.values(), default=None)
+        self.rows['runs'].append((exp_id, solver, tester, isp, lastcalls, endseed))
+        for nu in itersoln:
+            metric = metrics[nu][2] if nu in metrics else None
+            self.rows['iterations'].append((exp_id, isp, nu, simcalls.get(nu), simtimes.get(nu), metric))
+            self.rows['points'].extend((exp_id, isp, nu, dumps(list(x))) for x in itersoln[nu])
+        self.pending += 1
+        if self.pending >= self.batch:
+            self.flush()
+
+    def add_soln(self, exp_id, soln, solver=None, problem=None, endseed=None):
+		"""
+		Add the solution of a solve run, writing it with the next batch.
+		
+		Parameters
+		----------
+		exp_id : int
+		soln : set of tuple of int
+		solver : str, optional
+		problem : str, optional
+		endseed : tuple of int, optional
+		"""
+        if endseed is not None:
+            endseed = dumps([int(s) for s in endseed])
+        self.rows['runs'].append((exp_id, solver, problem, 0, None, endseed))
+        self.rows['points'].extend((exp_id, 0, None, dumps(list(x))) for x in soln)
+        self.pending += 1
+        if self.pending >= self.batch:
+            self.flush()
+
+    def flush(self):
+		"""
+		Write the waiting runs in one transaction.
+		"""
+        with self.conn:
+            ## replace the points of runs written before
+            self.conn.executemany('DELETE FROM points WHERE experiment = ? AND isp = ?', [row[0:1] + row[3:4] for row in self.rows['runs']])
+            self.conn.executemany('INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?)', self.rows['runs'])
+            self.conn.executemany('INSERT OR REPLACE INTO iterations VALUES (?, ?, ?, ?, ?, ?)', self.rows['iterations'])
+            self.conn.executemany('INSERT INTO points VALUES (?, ?, ?, ?)', self.rows['points'])
+        self.rows = {'runs': [], 'iterations': [], 'points': []}
+        self.pending = 0
+
+    def close(self):
+		"""
+		Write the waiting runs and close the database.
+		"""
+        self.flush()
+        self.conn.close()
+
+
 class BaseComm(object):
     """
     A base CLI command.
@@ -7,7 +7,7 @@ import os
 from random import Random
 import traceback
 import importlib.util
-from ..chnutils import solve
+from ..chnutils import solve, param_value
 
 
 class Solve(BaseComm):
@@ -26,9 +26,15 @@ class Solve(BaseComm):
 		"""
         ## get the options with default values
         budget = int(self.options['--budget'])
+        tbudget = self.options['--time-budget']
+        if tbudget:
+            tbudget = float(tbudget)
         name = self.options['--odir']
+        dbpath = self.options['--db']
         hasseed = self.options['--seed']
-        simpar = int(self.options['--simpar'])
+        simpar = self.options['--simpar']
+        if not simpar == 'auto':
+            simpar = int(simpar)
         crn = self.options['--crn']
         if hasseed:
             seed = tuple(int(i) for i in self.options['<s>'])
@@ -107,8 +113,14 @@ class Solve(BaseComm):
         solve_kwargs['seed'] = seed
         solve_kwargs['simpar'] = simpar
         solve_kwargs['crn'] = crn
+        tuning = dict()
+        solve_kwargs['tuning'] = tuning
         for i, p in enumerate(params):
-            solve_kwargs[p] = float(vals[i])
+            solve_kwargs[p] = param_value(vals[i])
+        if tbudget:
+            solve_kwargs['time_budget'] = tbudget
+            params = params + ['time_budget']
+            vals = vals + [str(tbudget)]
         start_opt_time = time.time()
         print('** Solving ', probarg, ' using ', solvarg, ' **')
         stsstr = '-- using starting seed:'
@@ -116,7 +128,9 @@ class Solve(BaseComm):
         res, end_seed = solve(probclass, solvclass, x0, **solve_kwargs)
         end_opt_time = time.time()
         opt_durr = end_opt_time - start_opt_time
-        humtxt = gen_humanfile(name, probarg, solvarg, budget, opt_durr, params, vals, seed, end_seed)
+        if tuning:
+            print('-- Chose simpar', tuning['simpar'], 'for hits of at least', tuning['simmin'], 'replications')
+        humtxt = gen_humanfile(name, probarg, solvarg, budget, opt_durr, params, vals, seed, end_seed, tuning)
         seed = tuple([int(i) for i in end_seed])
         print('-- Run time: {0:.2f} seconds'.format(opt_durr))
         endstr = '-- next seed:'
@@ -126,4 +140,18 @@ class Solve(BaseComm):
         resstr = '\n'.join(strlst)
         save_metadata(name, humtxt)
         save_les(name, resstr)
+        if dbpath:
+            try:
+                db = ResultDB(dbpath)
+                exp_id = db.add_experiment(name, 'solve', probarg, solvarg, budget)
+                db.add_soln(exp_id, res, solvarg, probarg, end_seed)
+                db.set_metadata(exp_id, humtxt)
+                db.close()
+                print('-- Saved results in database ', dbpath)
+            except Exception:
+                print('--* Error: ', sys.exc_info()[1])
+                print('--* Saving error traceback.')
+                tstr = ''.join(traceback.format_exc())
+                save_errortb(name, tstr)
+                print('--* Skipping database. ')
         print('-- Done!')
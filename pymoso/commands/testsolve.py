@@ -8,7 +8,7 @@ from random import Random
 import traceback
 import importlib.util
 import importlib
-from ..chnutils import testsolve, par_diff, par_runs
+from ..chnutils import testsolve, par_runs, param_value, MetricError, METRIC_NAMES
 
 
 class TestSolve(BaseComm):
@@ -23,7 +23,11 @@ class TestSolve(BaseComm):
     def run(self):
         ## get the options with default values
         budget = int(self.options['--budget'])
+        tbudget = self.options['--time-budget']
+        if tbudget:
+            tbudget = float(tbudget)
         name = self.options['--odir']
+        dbpath = self.options['--db']
         hasseed = self.options['--seed']
         metric = self.options['--metric']
         if hasseed:
@@ -31,8 +35,20 @@ class TestSolve(BaseComm):
         else:
             seed = (12345, 12345, 12345, 12345, 12345, 12345)
         isp = int(self.options['--isp'])
-        proc = int(self.options['--proc'])
+        proc = self.options['--proc']
+        if not proc == 'auto':
+            proc = int(proc)
+        simpar = self.options['--simpar']
+        if not simpar == 'auto':
+            simpar = int(simpar)
+        chunk = int(self.options['--chunk'])
         crn = self.options['--crn']
+        fmt = self.options['--format']
+        resume = self.options['--resume']
+        if fmt not in ('txt', 'bin'):
+            print('--* Error: unknown format ', fmt, '. Choose txt or bin. ')
+            print('--* Aborting.')
+            sys.exit()
         ## determine the solver and problem
         solvarg = self.options['<solver>']
         base_mod_name = solvarg
@@ -128,41 +144,154 @@ class TestSolve(BaseComm):
         solve_kwargs['seed'] = seed
         solve_kwargs['isp'] = isp
         solve_kwargs['proc'] = proc
+        solve_kwargs['simpar'] = simpar
         solve_kwargs['ranx0'] = ranx0
         solve_kwargs['crn'] = crn
+        solve_kwargs['chunksize'] = chunk
+        tuning = dict()
+        solve_kwargs['tuning'] = tuning
         for i, p in enumerate(params):
-            solve_kwargs[p] = float(vals[i])
+            solve_kwargs[p] = param_value(vals[i])
+        if tbudget:
+            solve_kwargs['time_budget'] = tbudget
+            params = params + ['time_budget']
+            vals = vals + [str(tbudget)]
+        do_metrics = True
+        mytester = testclass()
+        if metric and metric not in METRIC_NAMES:
+            do_metrics = False
+            print('--* Error: unknown metric ', metric, '. Choose one of ', ', '.join(METRIC_NAMES), '. Skipping metric computation. ')
+        elif metric == 'tester':
+            try:
+                mymet = mytester.metric
+            except AttributeError:
+                do_metrics = False
+                print('--* Error: tester metric is not implemented! Skipping metric computation. ')
+        pathlib.Path(name).mkdir(exist_ok=True)
+        cache_stats = dict()
+        if metric and do_metrics:
+            ## compute the metrics of each run on the same processes
+            solve_kwargs['metric'] = metric
+            solve_kwargs['cache_stats'] = cache_stats
+        ## the options which determine the streams and results of the runs
+        runopts = {'tester': testarg, 'solver': solvarg, 'seed': seed, 'isp': isp, 'budget': budget, 'crn': crn, 'x0': self.options['<x>'], 'params': dict(zip(params, vals)), 'metric': metric if do_metrics else None, 'format': fmt}
+        done = set()
+        if resume:
+            ## the runs saved before, which keep their streams
+            done = find_completed(name, fmt) & set(range(isp))
+            diffs = check_runopts(name, runopts)
+            if done and diffs:
+                if diffs == ['all']:
+                    print('--* Error: ', name, ' has no saved options to check against. ')
+                else:
+                    print('--* Error: cannot resume, the options ', ', '.join(diffs), ' differ from those of the saved sample paths in ', name, '. ')
+                print('--* Aborting.')
+                sys.exit()
+            solve_kwargs['skip'] = done
+            print('-- Resuming: ', len(done), ' of ', isp, ' sample paths are saved in ', name)
+        elif fmt == 'bin' and os.path.isfile(runbin_path(name)):
+            os.remove(runbin_path(name))
+        save_runopts(name, runopts)
+        db = None
+        if dbpath:
+            try:
+                db = ResultDB(dbpath)
+                exp_id = None
+                if resume:
+                    exp_id = db.find_experiment(name, 'testsolve')
+                if exp_id is None:
+                    exp_id = db.add_experiment(name, 'testsolve', testarg, solvarg, budget, metric if do_metrics else None)
+                ## add the saved runs which did not reach the database
+                if done:
+                    runs = RunFile(runbin_path(name)) if fmt == 'bin' else None
+                    for i in sorted(done - db.isps(exp_id)):
+                        rundat = runs.load(i) if runs else load_runtxt(name, i)
+                        db.add_run(exp_id, i, rundat, solvarg, testarg)
+            except Exception:
+                db = None
+                print('--* Error: ', sys.exc_info()[1])
+                print('--* Saving error traceback.')
+                tstr = ''.join(traceback.format_exc())
+                save_errortb(name, tstr)
+                print('--* Skipping database. ')
+        def drop_db():
+            ## keep saving the files if the database fails mid-run
+            nonlocal db
+            db = None
+            print('--* Error: ', sys.exc_info()[1])
+            print('--* Saving error traceback.')
+            tstr = ''.join(traceback.format_exc())
+            save_errortb(name, tstr)
+            print('--* Skipping database. ')
+        ## save each run and its metrics as soon as it finishes
+        met_errors = []
+        def save_run(i, rundat):
+            if db is not None:
+                try:
+                    db.add_run(exp_id, i, rundat, solvarg, testarg)
+                except Exception:
+                    drop_db()
+            if fmt == 'bin':
+                save_runbin(name, i, rundat)
+            else:
+                if 'simtimes' in rundat:
+                    save_simtimes(name, i, rundat)
+                if 'metrics' in rundat:
+                    save_metrics(name, i, rundat['metrics'])
+                ## the solutions last, since they mark the run as saved
+                save_isp(name, i, rundat['itersoln'])
+            if 'metric_error' in rundat:
+                met_errors.append(rundat['metric_error'])
+            print('-- Saved sample path', i)
+        solve_kwargs['sink'] = save_run
         start_opt_time = time.time()
         print('** Testing ', solvarg, ' using ', testarg, ' **')
         stsstr = '-- using starting seed:'
         print(f'{stsstr:26} {seed[0]:12} {seed[1]:12} {seed[2]:12} {seed[3]:12} {seed[4]:12} {seed[5]:12}')
-        res, end_seed = testsolve(testclass, solvclass, x0, **solve_kwargs)
+        try:
+            _, end_seed = testsolve(testclass, solvclass, x0, **solve_kwargs)
+        except MetricError:
+            ## testsolve checks the metric before it solves any run
+            do_metrics = False
+            print('--* Error: ', sys.exc_info()[1])
+            print('--* Saving error traceback.')
+            tstr = ''.join(traceback.format_exc())
+            save_errortb(name, tstr)
+            print('--* Skipping metric computation. ')
+            del solve_kwargs['metric']
+            del solve_kwargs['cache_stats']
+            runopts['metric'] = None
+            save_runopts(name, runopts)
+            if db is not None:
+                try:
+                    db.set_metric(exp_id, None)
+                except Exception:
+                    drop_db()
+            _, end_seed = testsolve(testclass, solvclass, x0, **solve_kwargs)
         end_opt_time = time.time()
         opt_durr = end_opt_time - start_opt_time
-        humtxt = gen_humanfile(name, testarg, solvarg, budget, opt_durr, params, vals, seed, end_seed)
+        if tuning:
+            print('-- Chose proc', tuning['proc'], 'and simpar', tuning['simpar'], 'for hits of at least', tuning['simmin'], 'replications')
+        humtxt = gen_humanfile(name, testarg, solvarg, budget, opt_durr, params, vals, seed, end_seed, tuning)
         seed = tuple([int(i) for i in end_seed])
         print('-- Optimization run time: {0:.2f} seconds'.format(opt_durr))
         endstr = '-- ending seed:'
         print(f'{endstr:26} {seed[0]:12} {seed[1]:12} {seed[2]:12} {seed[3]:12} {seed[4]:12} {seed[5]:12}')
         save_metadata(name, humtxt)
-        do_metrics = True
-        mytester = testclass()
-        if metric:
+        if db is not None:
             try:
-                mymet = mytester.metric
-            except AttributeError:
-                do_metrics = False
-                print('--* Error: tester metric is not implemented! Skipping metric computation. ')
+                db.set_metadata(exp_id, humtxt)
+                db.close()
+                print('-- Saved results in database ', dbpath)
+            except Exception:
+                drop_db()
         try:
             if metric and do_metrics:
-                print('-- Computing metric data')
-                haus_start_time = time.time()
-                hdd = par_diff(res, mytester, proc)
-                haus_end_time = time.time()
-                haus_durr = haus_end_time - haus_start_time
-                print('-- Metric run time: {0:.2f} seconds'.format(haus_durr))
-                for i in range(isp):
-                    save_metrics(name, i, hdd[i])
+                if met_errors:
+                    raise met_errors[0]
+                met_rate = cache_stats.get('met_hits', 0)/max(cache_stats.get('met_calls', 0), 1)
+                g_rate = cache_stats.get('g_hits', 0)/max(cache_stats.get('g_calls', 0), 1)
+                print('-- Metric cache hit rate: {0:.1%} of metrics, {1:.1%} of true_g calls'.format(met_rate, g_rate))
         except TypeError as te:
             print('--* Error: ', sys.exc_info()[1])
             print('--* Check the implementation of', testclass.__name__, '.metric for bugs.')
@@ -197,6 +326,4 @@ class TestSolve(BaseComm):
             print('--* Saving error traceback.')
             tstr = ''.join(traceback.format_exc())
             save_errortb(name, tstr)
-        for i in range(isp):
-            save_isp(name, i, res[i]['itersoln'])
         print('-- Done!')
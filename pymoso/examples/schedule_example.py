@@ -0,0 +1,30 @@
+# compare the sample size schedules of RPERLE on a test problem by the
+# simulation calls each needs to reach a target metric value
+from statistics import mean
+from pymoso.chnutils import testsolve, par_diff
+from pymoso.solvers import RPERLE
+from pymoso.testers import TPATester
+
+
+def main():
+    target = 6.0
+    isp = 8
+    budget = 10000
+    x0 = (40, 40)
+    for sched in ('geometric', 'polynomial', 'variance', 'budget'):
+        run_data, _ = testsolve(TPATester, RPERLE, x0, isp=isp, proc=4, ranx0=False, budget=budget, mschedule=sched)
+        # the metric data has a tuple (iteration, calls, metric) per iteration
+        met_data = par_diff(run_data, TPATester(), 4, metname='dh')
+        calls = []
+        for i in met_data:
+            hit = [tup[1] for tup in met_data[i].values() if tup[2] <= target]
+            if hit:
+                calls.append(min(hit))
+        if calls:
+            print(sched, ': ', len(calls), ' of ', isp, ' runs reach ', target, ' in ', mean(calls), ' calls on average')
+        else:
+            print(sched, ': no run reaches ', target)
+
+
+if __name__ == '__main__':
+    main()
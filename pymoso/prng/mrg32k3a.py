@@ -10,6 +10,7 @@ Listing
 MRG323k3a
 get_next_prnstream
 jump_substream
+jump_substreams
 """
 
 import random
@@ -363,3 +364,75 @@ def jump_substream(prn):
     # random.Random objects need a hashable seed e.g. a tuple
     sseed = tuple(ns1 + ns2)
     prn.seed(sseed)
+
+
+def mat333modmult(a, b, m):
+    """
+    Multiply two 3x3 matrices of integers modulo 'm' exactly.
+    
+    Parameters
+    ----------
+    a : tuple of tuple of int
+		3x3 matrix
+    b : tuple of tuple of int
+		3x3 matrix
+    m : int
+		modulus
+		
+    Returns
+    -------
+    tuple of tuple of int
+		3x3 matrix
+    """
+    r3 = range(3)
+    return tuple(tuple(sum(a[i][k]*b[k][j] for k in r3) % m for j in r3) for i in r3)
+
+
+@functools.lru_cache(maxsize=None)
+def get_substream_jumps(n):
+    """
+    Compute the matrices which advance each component of a seed by 
+    'n' substreams, i.e. n*2^76 steps, by repeated squaring.
+    
+    Parameters
+    ----------
+    n : int
+    
+    Returns
+    -------
+    a1pn : tuple of tuple of int
+    a2pn : tuple of tuple of int
+    """
+    m1 = int(mrgm1)
+    m2 = int(mrgm2)
+    a1pn = ((1, 0, 0), (0, 1, 0), (0, 0, 1))
+    a2pn = a1pn
+    a1sq = tuple(tuple(int(v) for v in row) for row in a1p76)
+    a2sq = tuple(tuple(int(v) for v in row) for row in a2p76)
+    while n > 0:
+        if n % 2:
+            a1pn = mat333modmult(a1sq, a1pn, m1)
+            a2pn = mat333modmult(a2sq, a2pn, m2)
+        a1sq = mat333modmult(a1sq, a1sq, m1)
+        a2sq = mat333modmult(a2sq, a2sq, m2)
+        n //= 2
+    return a1pn, a2pn
+
+
+def jump_substreams(prn, n):
+    """
+    Advance the rng 'n' substreams, i.e. n*2^76 steps, at the cost of
+    a single jump. 
+    
+    Parameters
+    ----------
+    prn : MRG32k3a object
+    n : int
+    """
+    a1pn, a2pn = get_substream_jumps(n)
+    seed = prn.get_seed()
+    r3 = range(3)
+    ns1 = [sum(a1pn[i][j]*seed[j] for j in r3) % int(mrgm1) for i in r3]
+    ns2 = [sum(a2pn[i][j]*seed[3 + j] for j in r3) % int(mrgm2) for i in r3]
+    sseed = tuple(ns1 + ns2)
+    prn.seed(sseed)
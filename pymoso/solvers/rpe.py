@@ -6,7 +6,7 @@ Provide an implementation of R-Pe for users needing a
 bi-objective simulation optimization solver. 
 """
 from ..chnbase import RASolver
-from ..chnutils import get_biparetos
+from ..chnutils import get_biparetos, IntervalSweep
 import sys
 
 
@@ -97,17 +97,9 @@ class RPE(RASolver):
                 low_b = self.gbar[sphat[i]][kcon] - self.fse(self.sehat[sphat[i]][kcon])
                 hi_b = self.gbar[sphat[i]][kcon] + self.fse(self.sehat[sphat[i]][kcon])
                 mcJ.append((low_b, hi_b))
-            overlap = []
-            for i1 in range(c0 - 1):
-                is_inJ = False
-                eps_c = mcJ[i1][LO]
-                for j in mcJ:
-                    low = j[LO]
-                    hi = j[HI]
-                    # check if eps_c in half open interval (low, hi]
-                    if eps_c > low and eps_c <= hi:
-                        is_inJ = True
-                overlap.append(is_inJ)
+            # check if each low bound is in any half open interval (low, hi]
+            sweep = IntervalSweep(mcJ)
+            overlap = [sweep.covers(mcJ[i1][LO]) for i1 in range(c0 - 1)]
             epslst[k] = [mcJ[i][LO] for i in range(c0 - 1) if mcJ[i][LO] > Lk[k] and not overlap[i]]
             ck[k] = len(epslst[k])
         k_opt = min(ck, key=lambda k: ck[k])
@@ -117,38 +109,63 @@ class RPE(RASolver):
         c = len(eps)
         mcAeps = set()
         if c > 0:
+            chains = []
             for ep in eps:
-                lmax = float('-inf')
-                hi_blist = [mcJ[i][HI] for i in range(c0 - 1) if mcJ[i][HI] < ep]
-                if hi_blist:
-                    lmax = max(hi_blist)
-                #print('minlst: ', hi_blist)
+                lmax = sweep.max_hi_below(ep)
                 epL = max(lmax, L)
-                epnew = ep
-                mcA = set()
-                mcT = set()
-                while epL < epnew:
-                    # print('epL: ', epL)
-                    # print('epnew: ', epnew)
-                    #print('a1new: ', {x: self.gbar[x][k_con] for x in a1new})
-                    stpts = {x: self.gbar[x] for x in a1new | mcT if self.gbar[x][k_con] <= epnew}
-                    #print('starts: ', stpts)
-                    tbx0 = min(stpts, key=lambda t: self.gbar[t][k_opt])
-                    fxtb0 = self.gbar[tbx0]
-                    #print('found: ', tbx0, fxtb0[k_con])
-                    setbx0 = self.sehat[tbx0]
-                    mcTp, xst, fxst, sexst = self.spline(tbx0, epnew, k_opt, k_con)
-                    mcA |= {xst}
-                    mcT |= mcTp
-                    back_dist = self.fse(sexst[k_con])
-                    if back_dist == 0.0:
-                        back_dist = 0.000001
-                    epnew = fxst[k_con] - back_dist
+                chains.append((a1new, ep, epL, k_opt, k_con))
+            # the chains only share estimates, so they may run at once
+            for mcA in self.search_many('pe_chain', chains):
                 mcAeps |= mcA
         tmp = {x: self.gbar[x] for x in mcAeps | a1new}
         phatp = get_biparetos(tmp)
         return phatp
 
+    def pe_chain(self, a1new, ep, epL, k_opt, k_con):
+        """
+        Solve the chain of constrained SPLINE problems of one epsilon,
+        moving the constraint back from 'ep' until it reaches 'epL'.
+        
+        Parameters
+        ----------
+        a1new : set of tuple of int
+			Candidate starting points
+		ep : float
+			The first constraint on objective 'k_con'
+		epL : float
+			The constraint at which to stop
+		k_opt : int
+			Index of the objective to minimize
+		k_con : int
+			Index of the objective to constrain
+		
+		Returns
+		-------
+		mcA : set of tuple of int
+			The minimizers found along the chain
+        """
+        epnew = ep
+        mcA = set()
+        mcT = set()
+        while epL < epnew:
+            # print('epL: ', epL)
+            # print('epnew: ', epnew)
+            #print('a1new: ', {x: self.gbar[x][k_con] for x in a1new})
+            stpts = {x: self.gbar[x] for x in a1new | mcT if self.gbar[x][k_con] <= epnew}
+            #print('starts: ', stpts)
+            tbx0 = min(stpts, key=lambda t: self.gbar[t][k_opt])
+            fxtb0 = self.gbar[tbx0]
+            #print('found: ', tbx0, fxtb0[k_con])
+            setbx0 = self.sehat[tbx0]
+            mcTp, xst, fxst, sexst = self.spline(tbx0, epnew, k_opt, k_con)
+            mcA |= {xst}
+            mcT |= mcTp
+            back_dist = self.fse(sexst[k_con])
+            if back_dist == 0.0:
+                back_dist = 0.000001
+            epnew = fxst[k_con] - back_dist
+        return mcA
+
     def fse(self, se):
         """
         Compute diminishing standard error function for an iteration.
@@ -54,3 +54,24 @@ class RSPLINE(RASolver):
         _, xmin, _, _ = self.spline(ws)
         # return a singleton set
         return {xmin}
+
+    def budget_soln(self, aold):
+        """
+        Choose the solution of an iteration which ran out of budget: 
+        the point estimated in the iteration with the smallest first
+        objective. 
+        
+        Parameters
+        ----------
+        aold : set of tuple of int
+            The solution of the previous iteration, kept if no point 
+            was estimated
+        
+        Returns
+        -------
+        set of tuple of int
+			A singleton set
+        """
+        if not self.gbar:
+            return aold
+        return {min(self.gbar, key=lambda t: self.gbar[t][0])}
@@ -6,7 +6,7 @@ Provide the tester for Test Problem C
 """
 from ..problems import probtpc
 from math import sin, exp, sqrt
-from ..chnutils import dh
+from ..chnutils import dh, KDTree
 
 
 df = 2
@@ -66,12 +66,15 @@ class TPCTester(object):
 	true_g : function
 	soln : list of set of tuple of int
 		The set of LES's which solve TPC locally
+	soln_index : list of chnutils.KDTree
+		Indexes of the LES's in 'soln' for computing the metric
 	get_ranx0 : function
 	"""
     def __init__(self):
         self.ranorc = probtpc.ProbTPC
         self.true_g = true_g
         self.soln = soln
+        self.soln_index = soln_index
         self.get_ranx0 = get_ranx0
 
     def metric(self, eles):
@@ -93,10 +96,13 @@ class TPCTester(object):
             objs = self.true_g(point)
             efrontier.append(objs)
         distlist = []
-        for les in self.soln:
+        for les in self.soln_index:
             dist = dh(efrontier, les)
             distlist.append(dist)
         return min(distlist)
 
 
 soln = [{(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-12.124191460850021, -4.005560371321873), (-17.40818220681718, -3.5793569796239844)}, {(-11.280688021901707, -4.918860901673243), (-14.816364413634357, -3.5793569796239844), (-16.374615061559638, -1.9791161829547779), (-20.0, 0.0)}, {(-14.065696597405992, -1.3395039220492593), (-11.473878804223169, -4.918860901673243), (-12.253004128185811, -3.318620105004037), (-20.0, 0.0)}, {(-7.262810213332967, -2.496584292720245), (-7.444135831774321, -1.7657073137471477), (-20.0, 0.0), (-12.896298567757443, -1.1570803706709856), (-13.473488803943512, -0.42620339169788846), (-8.131393194811983, -1.3395039220492593)}, {(-20.0, 0.0), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.28574743337305, -3.1361965536257634), (-12.164716709720746, -3.318620105004037), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-14.065696597405992, -1.3395039220492593), (-11.280688021901707, -4.918860901673243), (-12.164716709720746, -3.318620105004037), (-20.0, 0.0)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.28574743337305, -3.1361965536257634), (-12.253004128185811, -3.318620105004037), (-7.745011630169058, -6.258364823722503), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-17.40818220681718, -3.5793569796239844)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-13.372517286713464, -0.8050787779834598), (-20.0, 0.0), (-12.896298567757443, -1.1570803706709856), (-11.655400395303172, -4.73643735029497), (-12.849239255767326, -1.535955756956557), (-12.80902546431919, -2.4053195746526663), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-13.473488803943512, -0.42620339169788846)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-15.723690695217467, -3.9582323659095557), (-17.40818220681718, -3.5793569796239844), (-13.950693125342534, -7.158713959247969), (-15.160198872823193, -5.558473162578762)}, {(-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-12.849239255767326, -1.535955756956557), (-12.80902546431919, -2.4053195746526663), (-12.164716709720746, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-16.374615061559638, -1.9791161829547779), (-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-7.262810213332967, -2.496584292720245), (-7.444135831774321, -1.7657073137471477), (-20.0, 0.0), (-12.896298567757443, -1.1570803706709856), (-13.473488803943512, -0.42620339169788846), (-8.131393194811983, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-10.415016733609885, -8.498217881297228), (-11.513792343378576, -5.297736287958815), (-20.0, 0.0), (-10.950300520984303, -6.897977084628021), (-17.40818220681718, -3.5793569796239844)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-14.065696597405992, -1.3395039220492593), (-7.444135831774321, -1.7657073137471477), (-7.262810213332967, -2.496584292720245), (-20.0, 0.0)}, {(-17.40818220681718, -3.5793569796239844), (-18.18730753077982, -1.9791161829547779), (-7.93820241249052, -4.918860901673243), (-20.0, 0.0)}, {(-18.18730753077982, -1.9791161829547779), (-10.415016733609885, -8.498217881297228), (-11.513792343378576, -5.297736287958815), (-20.0, 0.0), (-10.950300520984303, -6.897977084628021), (-17.40818220681718, -3.5793569796239844)}, {(-7.262810213332967, -2.496584292720245), (-7.444135831774321, -1.7657073137471477), (-20.0, 0.0), (-12.896298567757443, -1.1570803706709856), (-13.473488803943512, -0.42620339169788846), (-8.131393194811983, -1.3395039220492593)}, {(-13.473488803943512, -0.42620339169788846), (-20.0, 0.0), (-12.896298567757443, -1.1570803706709856), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-13.372517286713464, -0.8050787779834598)}, {(-16.374615061559638, -1.9791161829547779), (-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-14.065696597405992, -1.3395039220492593), (-6.866182354632733, -2.6790078440985186), (-20.0, 0.0)}, {(-10.415016733609885, -8.498217881297228), (-20.0, 0.0), (-11.513792343378576, -5.297736287958815), (-11.655400395303172, -4.73643735029497), (-10.950300520984303, -6.897977084628021), (-12.849239255767326, -1.535955756956557), (-12.80902546431919, -2.4053195746526663), (-12.253004128185811, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.253004128185811, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-11.473878804223169, -4.918860901673243), (-17.40818220681718, -3.5793569796239844), (-18.18730753077982, -1.9791161829547779), (-20.0, 0.0)}, {(-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-12.849239255767326, -1.535955756956557), (-12.80902546431919, -2.4053195746526663), (-12.164716709720746, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844)}, {(-20.0, 0.0), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-17.40818220681718, -3.5793569796239844)}, {(-18.18730753077982, -1.9791161829547779), (-10.415016733609885, -8.498217881297228), (-20.0, 0.0), (-15.723690695217467, -3.9582323659095557), (-17.40818220681718, -3.5793569796239844), (-13.950693125342534, -7.158713959247969), (-15.160198872823193, -5.558473162578762)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-11.473878804223169, -4.918860901673243), (-17.40818220681718, -3.5793569796239844), (-18.18730753077982, -1.9791161829547779), (-20.0, 0.0)}, {(-20.0, 0.0), (-12.849239255767326, -1.535955756956557), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.253004128185811, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-17.40818220681718, -3.5793569796239844)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844)}, {(-11.280688021901707, -4.918860901673243), (-17.40818220681718, -3.5793569796239844), (-18.18730753077982, -1.9791161829547779), (-20.0, 0.0)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-7.745011630169058, -6.258364823722503), (-14.816364413634357, -3.5793569796239844)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.655400395303172, -4.73643735029497), (-12.124191460850021, -4.005560371321873), (-17.40818220681718, -3.5793569796239844), (-7.93820241249052, -4.918860901673243)}, {(-13.473488803943512, -0.42620339169788846), (-12.896298567757443, -1.1570803706709856), (-20.0, 0.0)}, {(-18.18730753077982, -1.9791161829547779), (-10.415016733609885, -8.498217881297228), (-20.0, 0.0), (-11.513792343378576, -5.297736287958815), (-11.655400395303172, -4.73643735029497), (-10.950300520984303, -6.897977084628021), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-12.253004128185811, -3.318620105004037), (-14.065696597405992, -1.3395039220492593)}, {(-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-12.849239255767326, -1.535955756956557), (-12.80902546431919, -2.4053195746526663), (-12.164716709720746, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-7.745011630169058, -6.258364823722503), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-17.40818220681718, -3.5793569796239844), (-18.18730753077982, -1.9791161829547779), (-7.93820241249052, -4.918860901673243), (-20.0, 0.0)}, {(-12.989862749141844, -0.42620339169788846), (-12.521071683594995, -1.1570803706709856), (-8.131393194811983, -1.3395039220492593), (-20.0, 0.0)}, {(-20.0, 0.0), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-14.065696597405992, -1.3395039220492593), (-7.444135831774321, -1.7657073137471477), (-7.262810213332967, -2.496584292720245), (-20.0, 0.0)}, {(-7.262810213332967, -2.496584292720245), (-7.444135831774321, -1.7657073137471477), (-20.0, 0.0), (-6.866182354632733, -2.6790078440985186), (-14.065696597405992, -1.3395039220492593)}, {(-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.28574743337305, -3.1361965536257634), (-12.253004128185811, -3.318620105004037), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-12.253004128185811, -3.318620105004037), (-7.745011630169058, -6.258364823722503), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-10.415016733609885, -8.498217881297228), (-20.0, 0.0), (-11.513792343378576, -5.297736287958815), (-11.655400395303172, -4.73643735029497), (-10.950300520984303, -6.897977084628021), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.655400395303172, -4.73643735029497), (-12.124191460850021, -4.005560371321873), (-17.40818220681718, -3.5793569796239844)}, {(-14.816364413634357, -3.5793569796239844), (-16.374615061559638, -1.9791161829547779), (-20.0, 0.0)}, {(-10.415016733609885, -8.498217881297228), (-16.374615061559638, -1.9791161829547779), (-11.513792343378576, -5.297736287958815), (-20.0, 0.0), (-10.950300520984303, -6.897977084628021), (-14.816364413634357, -3.5793569796239844)}, {(-7.262810213332967, -2.496584292720245), (-7.444135831774321, -1.7657073137471477), (-20.0, 0.0), (-12.896298567757443, -1.1570803706709856), (-13.473488803943512, -0.42620339169788846)}, {(-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-12.849239255767326, -1.535955756956557), (-12.80902546431919, -2.4053195746526663), (-12.164716709720746, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-10.415016733609885, -8.498217881297228), (-20.0, 0.0), (-11.513792343378576, -5.297736287958815), (-11.655400395303172, -4.73643735029497), (-12.849239255767326, -1.535955756956557), (-10.950300520984303, -6.897977084628021), (-12.80902546431919, -2.4053195746526663), (-12.28574743337305, -3.1361965536257634), (-12.253004128185811, -3.318620105004037), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-7.745011630169058, -6.258364823722503), (-14.816364413634357, -3.5793569796239844)}, {(-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.253004128185811, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-11.473878804223169, -4.918860901673243), (-14.816364413634357, -3.5793569796239844), (-16.374615061559638, -1.9791161829547779), (-20.0, 0.0)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-11.655400395303172, -4.73643735029497), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.164716709720746, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-7.745011630169058, -6.258364823722503), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-14.065696597405992, -1.3395039220492593), (-11.473878804223169, -4.918860901673243), (-12.253004128185811, -3.318620105004037), (-20.0, 0.0)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-17.40818220681718, -3.5793569796239844)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.655400395303172, -4.73643735029497), (-12.124191460850021, -4.005560371321873), (-17.40818220681718, -3.5793569796239844)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.655400395303172, -4.73643735029497), (-12.124191460850021, -4.005560371321873), (-17.40818220681718, -3.5793569796239844)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.655400395303172, -4.73643735029497), (-12.124191460850021, -4.005560371321873), (-17.40818220681718, -3.5793569796239844)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.655400395303172, -4.73643735029497), (-12.124191460850021, -4.005560371321873), (-17.40818220681718, -3.5793569796239844)}, {(-10.415016733609885, -8.498217881297228), (-20.0, 0.0), (-11.513792343378576, -5.297736287958815), (-12.849239255767326, -1.535955756956557), (-10.950300520984303, -6.897977084628021), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.253004128185811, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-16.374615061559638, -1.9791161829547779), (-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-10.415016733609885, -8.498217881297228), (-20.0, 0.0), (-15.723690695217467, -3.9582323659095557), (-13.950693125342534, -7.158713959247969), (-17.40818220681718, -3.5793569796239844), (-15.160198872823193, -5.558473162578762)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-12.849239255767326, -1.535955756956557), (-12.80902546431919, -2.4053195746526663), (-12.253004128185811, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-12.849239255767326, -1.535955756956557), (-12.80902546431919, -2.4053195746526663), (-12.164716709720746, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.253004128185811, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-20.0, 0.0), (-12.849239255767326, -1.535955756956557), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.253004128185811, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-7.745011630169058, -6.258364823722503), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-10.415016733609885, -8.498217881297228), (-16.374615061559638, -1.9791161829547779), (-11.513792343378576, -5.297736287958815), (-20.0, 0.0), (-11.655400395303172, -4.73643735029497), (-10.950300520984303, -6.897977084628021), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-13.473488803943512, -0.42620339169788846), (-20.0, 0.0), (-12.896298567757443, -1.1570803706709856), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-13.372517286713464, -0.8050787779834598)}, {(-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.253004128185811, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.253004128185811, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.164716709720746, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-20.0, 0.0), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-20.0, 0.0), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-14.065696597405992, -1.3395039220492593), (-7.444135831774321, -1.7657073137471477), (-7.262810213332967, -2.496584292720245), (-20.0, 0.0)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.655400395303172, -4.73643735029497), (-12.124191460850021, -4.005560371321873), (-17.40818220681718, -3.5793569796239844), (-7.93820241249052, -4.918860901673243)}, {(-13.473488803943512, -0.42620339169788846), (-12.896298567757443, -1.1570803706709856), (-20.0, 0.0)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-10.415016733609885, -8.498217881297228), (-20.0, 0.0), (-11.513792343378576, -5.297736287958815), (-11.655400395303172, -4.73643735029497), (-12.849239255767326, -1.535955756956557), (-10.950300520984303, -6.897977084628021), (-12.80902546431919, -2.4053195746526663), (-12.253004128185811, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-10.415016733609885, -8.498217881297228), (-20.0, 0.0), (-11.513792343378576, -5.297736287958815), (-12.849239255767326, -1.535955756956557), (-10.950300520984303, -6.897977084628021), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.253004128185811, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-10.415016733609885, -8.498217881297228), (-20.0, 0.0), (-15.723690695217467, -3.9582323659095557), (-17.40818220681718, -3.5793569796239844), (-13.950693125342534, -7.158713959247969), (-15.160198872823193, -5.558473162578762)}, {(-11.473878804223169, -4.918860901673243), (-17.40818220681718, -3.5793569796239844), (-18.18730753077982, -1.9791161829547779), (-20.0, 0.0)}, {(-16.374615061559638, -1.9791161829547779), (-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-10.415016733609885, -8.498217881297228), (-20.0, 0.0), (-15.723690695217467, -3.9582323659095557), (-13.950693125342534, -7.158713959247969), (-17.40818220681718, -3.5793569796239844), (-15.160198872823193, -5.558473162578762)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.655400395303172, -4.73643735029497), (-12.124191460850021, -4.005560371321873), (-17.40818220681718, -3.5793569796239844), (-7.93820241249052, -4.918860901673243)}, {(-13.473488803943512, -0.42620339169788846), (-12.896298567757443, -1.1570803706709856), (-8.131393194811983, -1.3395039220492593), (-20.0, 0.0)}, {(-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.28574743337305, -3.1361965536257634), (-12.164716709720746, -3.318620105004037), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-14.065696597405992, -1.3395039220492593), (-6.866182354632733, -2.6790078440985186), (-20.0, 0.0)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.655400395303172, -4.73643735029497), (-12.124191460850021, -4.005560371321873), (-17.40818220681718, -3.5793569796239844), (-7.93820241249052, -4.918860901673243)}, {(-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.164716709720746, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-7.745011630169058, -6.258364823722503), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.655400395303172, -4.73643735029497), (-12.124191460850021, -4.005560371321873), (-17.40818220681718, -3.5793569796239844), (-7.93820241249052, -4.918860901673243)}, {(-11.473878804223169, -4.918860901673243), (-17.40818220681718, -3.5793569796239844), (-18.18730753077982, -1.9791161829547779), (-20.0, 0.0)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-17.40818220681718, -3.5793569796239844)}, {(-7.262810213332967, -2.496584292720245), (-7.444135831774321, -1.7657073137471477), (-20.0, 0.0), (-6.866182354632733, -2.6790078440985186), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844)}, {(-14.065696597405992, -1.3395039220492593), (-8.131393194811983, -2.6790078440985186), (-5.600971514453484, -4.018511766147778), (-20.0, 0.0)}, {(-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.28574743337305, -3.1361965536257634), (-12.253004128185811, -3.318620105004037), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-12.849239255767326, -1.535955756956557), (-12.80902546431919, -2.4053195746526663), (-12.253004128185811, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-10.415016733609885, -8.498217881297228), (-14.816364413634357, -7.158713959247969), (-20.0, 0.0), (-16.374615061559638, -3.9582323659095557), (-17.40818220681718, -3.5793569796239844), (-15.595489737596997, -5.558473162578762)}, {(-18.18730753077982, -1.9791161829547779), (-10.415016733609885, -8.498217881297228), (-20.0, 0.0), (-11.513792343378576, -5.297736287958815), (-11.655400395303172, -4.73643735029497), (-10.950300520984303, -6.897977084628021), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-14.816364413634357, -3.5793569796239844), (-5.600971514453484, -4.018511766147778), (-16.374615061559638, -1.9791161829547779), (-20.0, 0.0)}, {(-18.18730753077982, -1.9791161829547779), (-10.415016733609885, -8.498217881297228), (-20.0, 0.0), (-11.513792343378576, -5.297736287958815), (-11.655400395303172, -4.73643735029497), (-10.950300520984303, -6.897977084628021), (-12.124191460850021, -4.005560371321873), (-17.40818220681718, -3.5793569796239844)}, {(-18.18730753077982, -1.9791161829547779), (-10.415016733609885, -8.498217881297228), (-20.0, 0.0), (-11.513792343378576, -5.297736287958815), (-11.655400395303172, -4.73643735029497), (-10.950300520984303, -6.897977084628021), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-10.415016733609885, -8.498217881297228), (-20.0, 0.0), (-11.513792343378576, -5.297736287958815), (-12.849239255767326, -1.535955756956557), (-10.950300520984303, -6.897977084628021), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.253004128185811, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.655400395303172, -4.73643735029497), (-12.124191460850021, -4.005560371321873), (-17.40818220681718, -3.5793569796239844)}, {(-7.262810213332967, -2.496584292720245), (-7.444135831774321, -1.7657073137471477), (-20.0, 0.0), (-12.896298567757443, -1.1570803706709856), (-13.473488803943512, -0.42620339169788846), (-8.131393194811983, -1.3395039220492593)}, {(-20.0, 0.0), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.164716709720746, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-11.280688021901707, -4.918860901673243), (-17.40818220681718, -3.5793569796239844), (-18.18730753077982, -1.9791161829547779), (-20.0, 0.0)}, {(-14.065696597405992, -1.3395039220492593), (-11.473878804223169, -4.918860901673243), (-12.253004128185811, -3.318620105004037), (-20.0, 0.0)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.655400395303172, -4.73643735029497), (-12.124191460850021, -4.005560371321873), (-17.40818220681718, -3.5793569796239844)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-11.280688021901707, -4.918860901673243), (-14.816364413634357, -3.5793569796239844), (-16.374615061559638, -1.9791161829547779), (-20.0, 0.0)}, {(-18.18730753077982, -1.9791161829547779), (-14.816364413634357, -7.158713959247969), (-20.0, 0.0), (-16.374615061559638, -3.9582323659095557), (-17.40818220681718, -3.5793569796239844), (-15.595489737596997, -5.558473162578762)}, {(-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-12.849239255767326, -1.535955756956557), (-12.80902546431919, -2.4053195746526663), (-12.253004128185811, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.655400395303172, -4.73643735029497), (-12.124191460850021, -4.005560371321873), (-17.40818220681718, -3.5793569796239844), (-7.93820241249052, -4.918860901673243)}, {(-14.065696597405992, -1.3395039220492593), (-11.280688021901707, -4.918860901673243), (-12.164716709720746, -3.318620105004037), (-20.0, 0.0)}, {(-16.374615061559638, -1.9791161829547779), (-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-14.816364413634357, -3.5793569796239844)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-17.40818220681718, -3.5793569796239844), (-18.18730753077982, -1.9791161829547779), (-7.93820241249052, -4.918860901673243), (-20.0, 0.0)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-17.40818220681718, -3.5793569796239844)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-17.40818220681718, -3.5793569796239844)}, {(-7.262810213332967, -2.496584292720245), (-7.444135831774321, -1.7657073137471477), (-20.0, 0.0), (-12.896298567757443, -1.1570803706709856), (-13.473488803943512, -0.42620339169788846)}, {(-13.473488803943512, -0.42620339169788846), (-12.896298567757443, -1.1570803706709856), (-8.131393194811983, -1.3395039220492593), (-20.0, 0.0)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-10.415016733609885, -8.498217881297228), (-20.0, 0.0), (-11.513792343378576, -5.297736287958815), (-11.655400395303172, -4.73643735029497), (-12.849239255767326, -1.535955756956557), (-10.950300520984303, -6.897977084628021), (-12.80902546431919, -2.4053195746526663), (-12.253004128185811, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-15.723690695217467, -3.9582323659095557), (-13.950693125342534, -7.158713959247969), (-17.40818220681718, -3.5793569796239844), (-15.160198872823193, -5.558473162578762)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-10.415016733609885, -8.498217881297228), (-14.816364413634357, -7.158713959247969), (-20.0, 0.0), (-16.374615061559638, -3.9582323659095557), (-17.40818220681718, -3.5793569796239844), (-15.595489737596997, -5.558473162578762)}, {(-11.473878804223169, -4.918860901673243), (-17.40818220681718, -3.5793569796239844), (-18.18730753077982, -1.9791161829547779), (-20.0, 0.0)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-15.723690695217467, -3.9582323659095557), (-17.40818220681718, -3.5793569796239844), (-13.950693125342534, -7.158713959247969), (-15.160198872823193, -5.558473162578762)}, {(-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.28574743337305, -3.1361965536257634), (-12.164716709720746, -3.318620105004037), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-13.372517286713464, -0.8050787779834598), (-20.0, 0.0), (-12.896298567757443, -1.1570803706709856), (-11.655400395303172, -4.73643735029497), (-12.849239255767326, -1.535955756956557), (-12.80902546431919, -2.4053195746526663), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-13.473488803943512, -0.42620339169788846)}, {(-12.989862749141844, -0.42620339169788846), (-12.521071683594995, -1.1570803706709856), (-20.0, 0.0)}, {(-18.18730753077982, -1.9791161829547779), (-10.415016733609885, -8.498217881297228), (-20.0, 0.0), (-15.723690695217467, -3.9582323659095557), (-13.950693125342534, -7.158713959247969), (-17.40818220681718, -3.5793569796239844), (-15.160198872823193, -5.558473162578762)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-11.655400395303172, -4.73643735029497), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-12.849239255767326, -1.535955756956557), (-12.80902546431919, -2.4053195746526663), (-12.253004128185811, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.655400395303172, -4.73643735029497), (-12.124191460850021, -4.005560371321873), (-17.40818220681718, -3.5793569796239844), (-7.93820241249052, -4.918860901673243)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-12.124191460850021, -4.005560371321873), (-17.40818220681718, -3.5793569796239844)}, {(-18.18730753077982, -1.9791161829547779), (-10.415016733609885, -8.498217881297228), (-20.0, 0.0), (-11.513792343378576, -5.297736287958815), (-11.655400395303172, -4.73643735029497), (-10.950300520984303, -6.897977084628021), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-10.415016733609885, -8.498217881297228), (-11.513792343378576, -5.297736287958815), (-20.0, 0.0), (-11.655400395303172, -4.73643735029497), (-10.950300520984303, -6.897977084628021), (-12.124191460850021, -4.005560371321873), (-17.40818220681718, -3.5793569796239844)}, {(-7.262810213332967, -2.496584292720245), (-7.444135831774321, -1.7657073137471477), (-20.0, 0.0), (-6.866182354632733, -2.6790078440985186), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-10.415016733609885, -8.498217881297228), (-20.0, 0.0), (-11.513792343378576, -5.297736287958815), (-11.655400395303172, -4.73643735029497), (-10.950300520984303, -6.897977084628021), (-12.124191460850021, -4.005560371321873), (-17.40818220681718, -3.5793569796239844)}, {(-18.18730753077982, -1.9791161829547779), (-10.415016733609885, -8.498217881297228), (-20.0, 0.0), (-11.513792343378576, -5.297736287958815), (-11.655400395303172, -4.73643735029497), (-10.950300520984303, -6.897977084628021), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-10.415016733609885, -8.498217881297228), (-20.0, 0.0), (-11.513792343378576, -5.297736287958815), (-11.655400395303172, -4.73643735029497), (-10.950300520984303, -6.897977084628021), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-13.473488803943512, -0.42620339169788846), (-12.896298567757443, -1.1570803706709856), (-8.131393194811983, -1.3395039220492593), (-20.0, 0.0)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.655400395303172, -4.73643735029497), (-12.124191460850021, -4.005560371321873), (-17.40818220681718, -3.5793569796239844), (-7.93820241249052, -4.918860901673243)}, {(-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.28574743337305, -3.1361965536257634), (-12.253004128185811, -3.318620105004037), (-7.745011630169058, -6.258364823722503), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-13.372517286713464, -0.8050787779834598), (-20.0, 0.0), (-12.896298567757443, -1.1570803706709856), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-13.473488803943512, -0.42620339169788846)}, {(-18.18730753077982, -1.9791161829547779), (-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-20.0, 0.0), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-10.415016733609885, -8.498217881297228), (-20.0, 0.0), (-15.723690695217467, -3.9582323659095557), (-13.950693125342534, -7.158713959247969), (-17.40818220681718, -3.5793569796239844), (-15.160198872823193, -5.558473162578762)}, {(-7.262810213332967, -2.496584292720245), (-7.444135831774321, -1.7657073137471477), (-20.0, 0.0), (-6.866182354632733, -2.6790078440985186), (-14.065696597405992, -1.3395039220492593)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-16.374615061559638, -1.9791161829547779), (-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-11.280688021901707, -4.918860901673243), (-17.40818220681718, -3.5793569796239844), (-18.18730753077982, -1.9791161829547779), (-20.0, 0.0)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-10.415016733609885, -8.498217881297228), (-16.374615061559638, -1.9791161829547779), (-11.513792343378576, -5.297736287958815), (-20.0, 0.0), (-11.655400395303172, -4.73643735029497), (-10.950300520984303, -6.897977084628021), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-10.415016733609885, -8.498217881297228), (-20.0, 0.0), (-15.723690695217467, -3.9582323659095557), (-13.950693125342534, -7.158713959247969), (-17.40818220681718, -3.5793569796239844), (-15.160198872823193, -5.558473162578762)}, {(-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-12.253004128185811, -3.318620105004037), (-14.065696597405992, -1.3395039220492593)}, {(-11.280688021901707, -4.918860901673243), (-17.40818220681718, -3.5793569796239844), (-18.18730753077982, -1.9791161829547779), (-20.0, 0.0)}, {(-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.28574743337305, -3.1361965536257634), (-12.253004128185811, -3.318620105004037), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844)}, {(-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-12.164716709720746, -3.318620105004037), (-7.745011630169058, -6.258364823722503), (-14.065696597405992, -1.3395039220492593)}, {(-11.473878804223169, -4.918860901673243), (-17.40818220681718, -3.5793569796239844), (-18.18730753077982, -1.9791161829547779), (-20.0, 0.0)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-14.065696597405992, -1.3395039220492593), (-8.131393194811983, -2.6790078440985186), (-20.0, 0.0)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.655400395303172, -4.73643735029497), (-12.124191460850021, -4.005560371321873), (-17.40818220681718, -3.5793569796239844)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.655400395303172, -4.73643735029497), (-12.124191460850021, -4.005560371321873), (-17.40818220681718, -3.5793569796239844), (-7.93820241249052, -4.918860901673243)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-17.40818220681718, -3.5793569796239844)}, {(-10.415016733609885, -8.498217881297228), (-11.513792343378576, -5.297736287958815), (-20.0, 0.0), (-12.849239255767326, -1.535955756956557), (-10.950300520984303, -6.897977084628021), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.28574743337305, -3.1361965536257634), (-12.253004128185811, -3.318620105004037), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.253004128185811, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-7.745011630169058, -6.258364823722503), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-10.415016733609885, -8.498217881297228), (-20.0, 0.0), (-15.723690695217467, -3.9582323659095557), (-17.40818220681718, -3.5793569796239844), (-13.950693125342534, -7.158713959247969), (-15.160198872823193, -5.558473162578762)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-12.253004128185811, -3.318620105004037), (-14.065696597405992, -1.3395039220492593)}, {(-10.415016733609885, -8.498217881297228), (-16.374615061559638, -1.9791161829547779), (-11.513792343378576, -5.297736287958815), (-20.0, 0.0), (-11.655400395303172, -4.73643735029497), (-10.950300520984303, -6.897977084628021), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.28574743337305, -3.1361965536257634), (-12.253004128185811, -3.318620105004037), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.28574743337305, -3.1361965536257634), (-12.253004128185811, -3.318620105004037), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-10.415016733609885, -8.498217881297228), (-20.0, 0.0), (-15.723690695217467, -3.9582323659095557), (-17.40818220681718, -3.5793569796239844), (-13.950693125342534, -7.158713959247969), (-15.160198872823193, -5.558473162578762)}, {(-18.18730753077982, -1.9791161829547779), (-10.415016733609885, -8.498217881297228), (-20.0, 0.0), (-11.513792343378576, -5.297736287958815), (-11.655400395303172, -4.73643735029497), (-10.950300520984303, -6.897977084628021), (-12.124191460850021, -4.005560371321873), (-17.40818220681718, -3.5793569796239844)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-17.40818220681718, -3.5793569796239844)}, {(-13.473488803943512, -0.42620339169788846), (-12.896298567757443, -1.1570803706709856), (-20.0, 0.0)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-12.253004128185811, -3.318620105004037), (-7.745011630169058, -6.258364823722503), (-14.065696597405992, -1.3395039220492593)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-11.473878804223169, -4.918860901673243), (-14.816364413634357, -3.5793569796239844), (-16.374615061559638, -1.9791161829547779), (-20.0, 0.0)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-10.415016733609885, -8.498217881297228), (-11.513792343378576, -5.297736287958815), (-20.0, 0.0), (-11.655400395303172, -4.73643735029497), (-10.950300520984303, -6.897977084628021), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-10.415016733609885, -8.498217881297228), (-11.513792343378576, -5.297736287958815), (-20.0, 0.0), (-11.655400395303172, -4.73643735029497), (-10.950300520984303, -6.897977084628021), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-7.262810213332967, -2.496584292720245), (-7.444135831774321, -1.7657073137471477), (-20.0, 0.0), (-12.896298567757443, -1.1570803706709856), (-13.473488803943512, -0.42620339169788846)}, {(-7.262810213332967, -2.496584292720245), (-7.444135831774321, -1.7657073137471477), (-20.0, 0.0), (-12.896298567757443, -1.1570803706709856), (-13.473488803943512, -0.42620339169788846), (-8.131393194811983, -1.3395039220492593)}, {(-10.415016733609885, -8.498217881297228), (-20.0, 0.0), (-11.513792343378576, -5.297736287958815), (-11.655400395303172, -4.73643735029497), (-12.849239255767326, -1.535955756956557), (-10.950300520984303, -6.897977084628021), (-12.80902546431919, -2.4053195746526663), (-12.28574743337305, -3.1361965536257634), (-12.253004128185811, -3.318620105004037), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-12.849239255767326, -1.535955756956557), (-12.80902546431919, -2.4053195746526663), (-12.253004128185811, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-7.745011630169058, -6.258364823722503), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-14.065696597405992, -1.3395039220492593), (-6.866182354632733, -2.6790078440985186), (-20.0, 0.0)}, {(-5.600971514453484, -4.018511766147778), (-17.40818220681718, -3.5793569796239844), (-18.18730753077982, -1.9791161829547779), (-20.0, 0.0)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.28574743337305, -3.1361965536257634), (-12.253004128185811, -3.318620105004037), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.253004128185811, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-20.0, 0.0)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-14.065696597405992, -1.3395039220492593), (-7.444135831774321, -1.7657073137471477), (-7.262810213332967, -2.496584292720245), (-20.0, 0.0)}, {(-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-12.849239255767326, -1.535955756956557), (-12.80902546431919, -2.4053195746526663), (-12.253004128185811, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-12.253004128185811, -3.318620105004037), (-14.065696597405992, -1.3395039220492593), (-11.473878804223169, -4.918860901673243), (-20.0, 0.0)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.655400395303172, -4.73643735029497), (-12.124191460850021, -4.005560371321873), (-17.40818220681718, -3.5793569796239844), (-7.93820241249052, -4.918860901673243)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-14.065696597405992, -1.3395039220492593), (-8.131393194811983, -2.6790078440985186), (-5.600971514453484, -4.018511766147778), (-20.0, 0.0)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844)}, {(-14.065696597405992, -1.3395039220492593), (-11.280688021901707, -4.918860901673243), (-12.164716709720746, -3.318620105004037), (-20.0, 0.0)}, {(-8.131393194811983, -1.3395039220492593), (-20.0, 0.0)}, {(-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.164716709720746, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-17.40818220681718, -3.5793569796239844), (-18.18730753077982, -1.9791161829547779), (-20.0, 0.0)}, {(-12.989862749141844, -0.42620339169788846), (-12.521071683594995, -1.1570803706709856), (-20.0, 0.0)}, {(-10.415016733609885, -8.498217881297228), (-20.0, 0.0), (-11.513792343378576, -5.297736287958815), (-11.655400395303172, -4.73643735029497), (-10.950300520984303, -6.897977084628021), (-12.849239255767326, -1.535955756956557), (-12.80902546431919, -2.4053195746526663), (-12.253004128185811, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.28574743337305, -3.1361965536257634), (-12.253004128185811, -3.318620105004037), (-7.745011630169058, -6.258364823722503), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-11.473878804223169, -4.918860901673243), (-17.40818220681718, -3.5793569796239844), (-18.18730753077982, -1.9791161829547779), (-20.0, 0.0)}, {(-14.065696597405992, -1.3395039220492593), (-11.280688021901707, -4.918860901673243), (-12.164716709720746, -3.318620105004037), (-20.0, 0.0)}, {(-18.18730753077982, -1.9791161829547779), (-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-16.374615061559638, -1.9791161829547779), (-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-11.655400395303172, -4.73643735029497), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.655400395303172, -4.73643735029497), (-12.124191460850021, -4.005560371321873), (-17.40818220681718, -3.5793569796239844), (-7.93820241249052, -4.918860901673243)}, {(-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-12.849239255767326, -1.535955756956557), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.253004128185811, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-7.262810213332967, -2.496584292720245), (-7.444135831774321, -1.7657073137471477), (-20.0, 0.0), (-6.866182354632733, -2.6790078440985186), (-14.065696597405992, -1.3395039220492593)}, {(-10.415016733609885, -8.498217881297228), (-11.513792343378576, -5.297736287958815), (-20.0, 0.0), (-10.950300520984303, -6.897977084628021), (-12.253004128185811, -3.318620105004037), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.655400395303172, -4.73643735029497), (-12.124191460850021, -4.005560371321873), (-17.40818220681718, -3.5793569796239844), (-7.93820241249052, -4.918860901673243)}, {(-7.262810213332967, -2.496584292720245), (-7.444135831774321, -1.7657073137471477), (-20.0, 0.0), (-6.866182354632733, -2.6790078440985186), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-14.816364413634357, -7.158713959247969), (-20.0, 0.0), (-7.745011630169058, -8.498217881297228), (-16.374615061559638, -3.9582323659095557), (-17.40818220681718, -3.5793569796239844), (-15.595489737596997, -5.558473162578762)}, {(-16.374615061559638, -1.9791161829547779), (-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-15.723690695217467, -3.9582323659095557), (-17.40818220681718, -3.5793569796239844), (-13.950693125342534, -7.158713959247969), (-15.160198872823193, -5.558473162578762)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-14.816364413634357, -3.5793569796239844)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-10.415016733609885, -8.498217881297228), (-20.0, 0.0), (-15.723690695217467, -3.9582323659095557), (-13.950693125342534, -7.158713959247969), (-17.40818220681718, -3.5793569796239844), (-15.160198872823193, -5.558473162578762)}, {(-16.374615061559638, -1.9791161829547779), (-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.655400395303172, -4.73643735029497), (-12.124191460850021, -4.005560371321873), (-17.40818220681718, -3.5793569796239844), (-7.93820241249052, -4.918860901673243)}, {(-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-12.849239255767326, -1.535955756956557), (-12.80902546431919, -2.4053195746526663), (-12.164716709720746, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-14.065696597405992, -1.3395039220492593), (-11.280688021901707, -4.918860901673243), (-12.164716709720746, -3.318620105004037), (-20.0, 0.0)}, {(-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-12.253004128185811, -3.318620105004037), (-14.065696597405992, -1.3395039220492593)}, {(-10.415016733609885, -8.498217881297228), (-11.513792343378576, -5.297736287958815), (-20.0, 0.0), (-10.950300520984303, -6.897977084628021), (-12.253004128185811, -3.318620105004037), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-17.40818220681718, -3.5793569796239844)}, {(-18.18730753077982, -1.9791161829547779), (-10.415016733609885, -8.498217881297228), (-20.0, 0.0), (-15.723690695217467, -3.9582323659095557), (-13.950693125342534, -7.158713959247969), (-17.40818220681718, -3.5793569796239844), (-15.160198872823193, -5.558473162578762)}, {(-18.18730753077982, -1.9791161829547779), (-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-17.40818220681718, -3.5793569796239844)}, {(-20.0, 0.0), (-12.849239255767326, -1.535955756956557), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.253004128185811, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-14.065696597405992, -1.3395039220492593), (-8.131393194811983, -2.6790078440985186), (-5.600971514453484, -4.018511766147778), (-20.0, 0.0)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-11.473878804223169, -4.918860901673243), (-14.816364413634357, -3.5793569796239844), (-16.374615061559638, -1.9791161829547779), (-20.0, 0.0)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.655400395303172, -4.73643735029497), (-12.124191460850021, -4.005560371321873), (-17.40818220681718, -3.5793569796239844), (-7.93820241249052, -4.918860901673243)}, {(-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.253004128185811, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-17.40818220681718, -3.5793569796239844)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844)}, {(-17.40818220681718, -3.5793569796239844), (-18.18730753077982, -1.9791161829547779), (-7.93820241249052, -4.918860901673243), (-20.0, 0.0)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-5.600971514453484, -4.018511766147778), (-17.40818220681718, -3.5793569796239844), (-18.18730753077982, -1.9791161829547779), (-20.0, 0.0)}, {(-18.18730753077982, -1.9791161829547779), (-10.415016733609885, -8.498217881297228), (-20.0, 0.0), (-15.723690695217467, -3.9582323659095557), (-13.950693125342534, -7.158713959247969), (-17.40818220681718, -3.5793569796239844), (-15.160198872823193, -5.558473162578762)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-10.415016733609885, -8.498217881297228), (-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-11.513792343378576, -5.297736287958815), (-11.655400395303172, -4.73643735029497), (-10.950300520984303, -6.897977084628021), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-10.415016733609885, -8.498217881297228), (-20.0, 0.0), (-15.723690695217467, -3.9582323659095557), (-17.40818220681718, -3.5793569796239844), (-13.950693125342534, -7.158713959247969), (-15.160198872823193, -5.558473162578762)}, {(-11.280688021901707, -4.918860901673243), (-17.40818220681718, -3.5793569796239844), (-18.18730753077982, -1.9791161829547779), (-20.0, 0.0)}, {(-11.280688021901707, -4.918860901673243), (-17.40818220681718, -3.5793569796239844), (-18.18730753077982, -1.9791161829547779), (-20.0, 0.0)}, {(-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-12.253004128185811, -3.318620105004037), (-14.065696597405992, -1.3395039220492593)}, {(-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.253004128185811, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-11.280688021901707, -4.918860901673243), (-17.40818220681718, -3.5793569796239844), (-18.18730753077982, -1.9791161829547779), (-20.0, 0.0)}, {(-14.065696597405992, -1.3395039220492593), (-7.444135831774321, -1.7657073137471477), (-7.262810213332967, -2.496584292720245), (-20.0, 0.0)}, {(-14.065696597405992, -1.3395039220492593), (-6.866182354632733, -2.6790078440985186), (-20.0, 0.0)}, {(-18.18730753077982, -1.9791161829547779), (-15.595489737596997, -5.558473162578762), (-14.509274506481022, -7.53758934553354), (-14.816364413634357, -7.158713959247969), (-20.0, 0.0), (-16.374615061559638, -3.9582323659095557), (-17.40818220681718, -3.5793569796239844), (-13.08502183705071, -10.738070938871953), (-13.945782684086748, -9.137830142202747), (-15.072766328875296, -5.937348548864334)}, {(-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.253004128185811, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844)}, {(-18.18730753077982, -1.9791161829547779), (-10.415016733609885, -8.498217881297228), (-11.513792343378576, -5.297736287958815), (-20.0, 0.0), (-11.655400395303172, -4.73643735029497), (-10.950300520984303, -6.897977084628021), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-7.262810213332967, -2.496584292720245), (-7.444135831774321, -1.7657073137471477), (-20.0, 0.0), (-6.866182354632733, -2.6790078440985186), (-14.065696597405992, -1.3395039220492593)}, {(-10.415016733609885, -8.498217881297228), (-20.0, 0.0), (-11.513792343378576, -5.297736287958815), (-12.849239255767326, -1.535955756956557), (-10.950300520984303, -6.897977084628021), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.253004128185811, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-10.415016733609885, -8.498217881297228), (-11.513792343378576, -5.297736287958815), (-20.0, 0.0), (-12.849239255767326, -1.535955756956557), (-10.950300520984303, -6.897977084628021), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.28574743337305, -3.1361965536257634), (-12.253004128185811, -3.318620105004037), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-10.415016733609885, -8.498217881297228), (-11.513792343378576, -5.297736287958815), (-20.0, 0.0), (-10.950300520984303, -6.897977084628021), (-17.40818220681718, -3.5793569796239844)}, {(-18.18730753077982, -1.9791161829547779), (-10.415016733609885, -8.498217881297228), (-14.816364413634357, -7.158713959247969), (-20.0, 0.0), (-16.374615061559638, -3.9582323659095557), (-17.40818220681718, -3.5793569796239844), (-15.595489737596997, -5.558473162578762)}, {(-10.415016733609885, -8.498217881297228), (-20.0, 0.0), (-11.513792343378576, -5.297736287958815), (-11.655400395303172, -4.73643735029497), (-10.950300520984303, -6.897977084628021), (-12.849239255767326, -1.535955756956557), (-12.80902546431919, -2.4053195746526663), (-12.253004128185811, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-5.600971514453484, -4.018511766147778), (-17.40818220681718, -3.5793569796239844), (-18.18730753077982, -1.9791161829547779), (-20.0, 0.0)}, {(-10.415016733609885, -8.498217881297228), (-20.0, 0.0), (-11.513792343378576, -5.297736287958815), (-11.655400395303172, -4.73643735029497), (-12.849239255767326, -1.535955756956557), (-10.950300520984303, -6.897977084628021), (-12.80902546431919, -2.4053195746526663), (-12.253004128185811, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-12.989862749141844, -0.42620339169788846), (-12.521071683594995, -1.1570803706709856), (-20.0, 0.0)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-17.40818220681718, -3.5793569796239844)}, {(-11.280688021901707, -4.918860901673243), (-17.40818220681718, -3.5793569796239844), (-18.18730753077982, -1.9791161829547779), (-20.0, 0.0)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-17.40818220681718, -3.5793569796239844)}, {(-7.262810213332967, -2.496584292720245), (-7.444135831774321, -1.7657073137471477), (-20.0, 0.0), (-6.866182354632733, -2.6790078440985186), (-14.065696597405992, -1.3395039220492593)}, {(-12.989862749141844, -0.42620339169788846), (-12.521071683594995, -1.1570803706709856), (-8.131393194811983, -1.3395039220492593), (-20.0, 0.0)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-14.816364413634357, -3.5793569796239844)}, {(-18.18730753077982, -1.9791161829547779), (-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-14.065696597405992, -1.3395039220492593), (-7.444135831774321, -1.7657073137471477), (-7.262810213332967, -2.496584292720245), (-20.0, 0.0)}, {(-18.18730753077982, -1.9791161829547779), (-10.415016733609885, -8.498217881297228), (-11.513792343378576, -5.297736287958815), (-20.0, 0.0), (-11.655400395303172, -4.73643735029497), (-10.950300520984303, -6.897977084628021), (-12.124191460850021, -4.005560371321873), (-17.40818220681718, -3.5793569796239844)}, {(-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.253004128185811, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-7.262810213332967, -2.496584292720245), (-7.444135831774321, -1.7657073137471477), (-20.0, 0.0), (-6.866182354632733, -2.6790078440985186), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.28574743337305, -3.1361965536257634), (-12.253004128185811, -3.318620105004037), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-12.124191460850021, -4.005560371321873), (-17.40818220681718, -3.5793569796239844)}, {(-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-12.849239255767326, -1.535955756956557), (-12.80902546431919, -2.4053195746526663), (-12.253004128185811, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-7.745011630169058, -6.258364823722503), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.28574743337305, -3.1361965536257634), (-12.253004128185811, -3.318620105004037), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-14.065696597405992, -1.3395039220492593), (-20.0, 0.0)}, {(-7.262810213332967, -2.496584292720245), (-7.444135831774321, -1.7657073137471477), (-20.0, 0.0), (-6.866182354632733, -2.6790078440985186), (-14.065696597405992, -1.3395039220492593)}, {(-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.164716709720746, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-15.723690695217467, -3.9582323659095557), (-17.40818220681718, -3.5793569796239844), (-13.950693125342534, -7.158713959247969), (-15.160198872823193, -5.558473162578762)}, {(-18.18730753077982, -1.9791161829547779), (-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-12.849239255767326, -1.535955756956557), (-12.80902546431919, -2.4053195746526663), (-12.253004128185811, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.253004128185811, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-7.745011630169058, -6.258364823722503), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-20.0, 0.0), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-14.065696597405992, -1.3395039220492593), (-7.444135831774321, -1.7657073137471477), (-7.262810213332967, -2.496584292720245), (-20.0, 0.0)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-12.253004128185811, -3.318620105004037), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-14.816364413634357, -3.5793569796239844)}, {(-17.40818220681718, -3.5793569796239844), (-18.18730753077982, -1.9791161829547779), (-7.93820241249052, -4.918860901673243), (-20.0, 0.0)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-10.415016733609885, -8.498217881297228), (-11.513792343378576, -5.297736287958815), (-20.0, 0.0), (-11.655400395303172, -4.73643735029497), (-10.950300520984303, -6.897977084628021), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.253004128185811, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-11.473878804223169, -4.918860901673243), (-17.40818220681718, -3.5793569796239844), (-18.18730753077982, -1.9791161829547779), (-20.0, 0.0)}, {(-18.18730753077982, -1.9791161829547779), (-10.415016733609885, -8.498217881297228), (-11.513792343378576, -5.297736287958815), (-20.0, 0.0), (-11.655400395303172, -4.73643735029497), (-10.950300520984303, -6.897977084628021), (-12.124191460850021, -4.005560371321873), (-17.40818220681718, -3.5793569796239844)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-12.124191460850021, -4.005560371321873), (-17.40818220681718, -3.5793569796239844)}, {(-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-12.849239255767326, -1.535955756956557), (-12.80902546431919, -2.4053195746526663), (-12.253004128185811, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.655400395303172, -4.73643735029497), (-12.124191460850021, -4.005560371321873), (-17.40818220681718, -3.5793569796239844), (-7.93820241249052, -4.918860901673243)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-7.745011630169058, -6.258364823722503), (-14.816364413634357, -3.5793569796239844)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.28574743337305, -3.1361965536257634), (-12.253004128185811, -3.318620105004037), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-14.065696597405992, -1.3395039220492593), (-7.444135831774321, -1.7657073137471477), (-7.262810213332967, -2.496584292720245), (-20.0, 0.0)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-14.065696597405992, -1.3395039220492593), (-20.0, 0.0)}, {(-18.18730753077982, -1.9791161829547779), (-10.415016733609885, -8.498217881297228), (-20.0, 0.0), (-15.723690695217467, -3.9582323659095557), (-13.950693125342534, -7.158713959247969), (-17.40818220681718, -3.5793569796239844), (-15.160198872823193, -5.558473162578762)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-12.124191460850021, -4.005560371321873), (-17.40818220681718, -3.5793569796239844)}, {(-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.164716709720746, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-12.253004128185811, -3.318620105004037), (-7.745011630169058, -6.258364823722503), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844)}, {(-7.262810213332967, -2.496584292720245), (-7.444135831774321, -1.7657073137471477), (-20.0, 0.0), (-6.866182354632733, -2.6790078440985186), (-14.065696597405992, -1.3395039220492593)}, {(-7.262810213332967, -2.496584292720245), (-7.444135831774321, -1.7657073137471477), (-20.0, 0.0), (-6.866182354632733, -2.6790078440985186), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-12.124191460850021, -4.005560371321873), (-17.40818220681718, -3.5793569796239844)}, {(-18.18730753077982, -1.9791161829547779), (-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.253004128185811, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-7.745011630169058, -6.258364823722503), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-11.280688021901707, -4.918860901673243), (-17.40818220681718, -3.5793569796239844), (-18.18730753077982, -1.9791161829547779), (-20.0, 0.0)}, {(-11.280688021901707, -4.918860901673243), (-14.816364413634357, -3.5793569796239844), (-16.374615061559638, -1.9791161829547779), (-20.0, 0.0)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-17.40818220681718, -3.5793569796239844)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-10.415016733609885, -8.498217881297228), (-11.513792343378576, -5.297736287958815), (-20.0, 0.0), (-10.950300520984303, -6.897977084628021), (-12.253004128185811, -3.318620105004037), (-14.065696597405992, -1.3395039220492593)}, {(-14.065696597405992, -1.3395039220492593), (-7.444135831774321, -1.7657073137471477), (-7.262810213332967, -2.496584292720245), (-20.0, 0.0)}, {(-18.18730753077982, -1.9791161829547779), (-10.415016733609885, -8.498217881297228), (-20.0, 0.0), (-15.723690695217467, -3.9582323659095557), (-13.950693125342534, -7.158713959247969), (-17.40818220681718, -3.5793569796239844), (-15.160198872823193, -5.558473162578762)}, {(-12.989862749141844, -0.42620339169788846), (-12.521071683594995, -1.1570803706709856), (-8.131393194811983, -1.3395039220492593), (-20.0, 0.0)}, {(-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-12.849239255767326, -1.535955756956557), (-12.80902546431919, -2.4053195746526663), (-12.253004128185811, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-10.415016733609885, -8.498217881297228), (-20.0, 0.0), (-11.513792343378576, -5.297736287958815), (-11.655400395303172, -4.73643735029497), (-12.849239255767326, -1.535955756956557), (-10.950300520984303, -6.897977084628021), (-12.80902546431919, -2.4053195746526663), (-12.253004128185811, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-7.262810213332967, -2.496584292720245), (-7.444135831774321, -1.7657073137471477), (-20.0, 0.0), (-6.866182354632733, -2.6790078440985186), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.28574743337305, -3.1361965536257634), (-12.164716709720746, -3.318620105004037), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-10.415016733609885, -8.498217881297228), (-16.374615061559638, -1.9791161829547779), (-11.513792343378576, -5.297736287958815), (-20.0, 0.0), (-11.655400395303172, -4.73643735029497), (-10.950300520984303, -6.897977084628021), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-10.415016733609885, -8.498217881297228), (-20.0, 0.0), (-11.513792343378576, -5.297736287958815), (-11.655400395303172, -4.73643735029497), (-10.950300520984303, -6.897977084628021), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-7.262810213332967, -2.496584292720245), (-7.444135831774321, -1.7657073137471477), (-20.0, 0.0), (-12.896298567757443, -1.1570803706709856), (-13.473488803943512, -0.42620339169788846)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-7.745011630169058, -6.258364823722503), (-14.816364413634357, -3.5793569796239844)}, {(-10.415016733609885, -8.498217881297228), (-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-11.513792343378576, -5.297736287958815), (-11.655400395303172, -4.73643735029497), (-10.950300520984303, -6.897977084628021), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-12.253004128185811, -3.318620105004037), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.28574743337305, -3.1361965536257634), (-12.253004128185811, -3.318620105004037), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-17.40818220681718, -3.5793569796239844), (-18.18730753077982, -1.9791161829547779), (-20.0, 0.0)}, {(-7.262810213332967, -2.496584292720245), (-7.444135831774321, -1.7657073137471477), (-20.0, 0.0), (-6.866182354632733, -2.6790078440985186), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-17.40818220681718, -3.5793569796239844), (-18.18730753077982, -1.9791161829547779), (-20.0, 0.0)}, {(-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-12.849239255767326, -1.535955756956557), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.253004128185811, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-14.065696597405992, -1.3395039220492593), (-6.866182354632733, -2.6790078440985186), (-20.0, 0.0)}, {(-7.262810213332967, -2.496584292720245), (-7.444135831774321, -1.7657073137471477), (-20.0, 0.0), (-6.866182354632733, -2.6790078440985186), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-10.415016733609885, -8.498217881297228), (-11.513792343378576, -5.297736287958815), (-20.0, 0.0), (-11.655400395303172, -4.73643735029497), (-10.950300520984303, -6.897977084628021), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.164716709720746, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-10.415016733609885, -8.498217881297228), (-20.0, 0.0), (-11.513792343378576, -5.297736287958815), (-11.655400395303172, -4.73643735029497), (-10.950300520984303, -6.897977084628021), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-14.065696597405992, -1.3395039220492593), (-11.473878804223169, -4.918860901673243), (-12.253004128185811, -3.318620105004037), (-20.0, 0.0)}, {(-14.065696597405992, -1.3395039220492593), (-20.0, 0.0)}, {(-10.415016733609885, -8.498217881297228), (-20.0, 0.0), (-11.513792343378576, -5.297736287958815), (-11.655400395303172, -4.73643735029497), (-12.849239255767326, -1.535955756956557), (-10.950300520984303, -6.897977084628021), (-12.80902546431919, -2.4053195746526663), (-12.253004128185811, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.253004128185811, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-16.374615061559638, -1.9791161829547779), (-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-16.374615061559638, -1.9791161829547779), (-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-14.816364413634357, -3.5793569796239844)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-10.415016733609885, -8.498217881297228), (-20.0, 0.0), (-11.513792343378576, -5.297736287958815), (-12.849239255767326, -1.535955756956557), (-10.950300520984303, -6.897977084628021), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.253004128185811, -3.318620105004037), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-7.262810213332967, -2.496584292720245), (-7.444135831774321, -1.7657073137471477), (-20.0, 0.0), (-12.896298567757443, -1.1570803706709856), (-13.473488803943512, -0.42620339169788846)}, {(-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-11.280688021901707, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-20.0, 0.0), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.28574743337305, -3.1361965536257634), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.28574743337305, -3.1361965536257634), (-12.253004128185811, -3.318620105004037), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-12.849239255767326, -1.535955756956557), (-11.655400395303172, -4.73643735029497), (-12.80902546431919, -2.4053195746526663), (-12.28574743337305, -3.1361965536257634), (-12.253004128185811, -3.318620105004037), (-12.124191460850021, -4.005560371321873), (-14.065696597405992, -1.3395039220492593)}, {(-11.473878804223169, -4.918860901673243), (-17.40818220681718, -3.5793569796239844), (-18.18730753077982, -1.9791161829547779), (-20.0, 0.0)}, {(-16.374615061559638, -1.9791161829547779), (-6.672991572311271, -6.258364823722503), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-7.745011630169058, -6.258364823722503), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-10.415016733609885, -8.498217881297228), (-16.374615061559638, -1.9791161829547779), (-20.0, 0.0), (-11.513792343378576, -5.297736287958815), (-11.655400395303172, -4.73643735029497), (-10.950300520984303, -6.897977084628021), (-14.816364413634357, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-10.415016733609885, -8.498217881297228), (-20.0, 0.0), (-11.513792343378576, -5.297736287958815), (-11.655400395303172, -4.73643735029497), (-10.950300520984303, -6.897977084628021), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}, {(-18.18730753077982, -1.9791161829547779), (-20.0, 0.0), (-6.672991572311271, -6.258364823722503), (-11.473878804223169, -4.918860901673243), (-11.655400395303172, -4.73643735029497), (-17.40818220681718, -3.5793569796239844), (-12.124191460850021, -4.005560371321873)}]
+
+# index the true solutions once, rather than every metric call
+soln_index = [KDTree(les) for les in soln]
@@ -0,0 +1,32 @@
+"""Tests of the parsing of the command line."""
+
+import pytest
+
+docopt = pytest.importorskip('docopt').docopt
+from pymoso import cli
+
+
+def parse(args):
+    return docopt(cli.__doc__, argv=cli.metric_argv(args))
+
+
+@pytest.mark.parametrize('args', [
+    ['testsolve', '--metric', 'hv', 'TPATester', 'RPERLE'],
+    ['testsolve', '--metric=hv', 'TPATester', 'RPERLE'],
+    ])
+def test_metric_name(args):
+    options = parse(args)
+    assert options['--metric'] == 'hv'
+    assert options['<tester>'] == 'TPATester'
+    assert options['<solver>'] == 'RPERLE'
+
+
+@pytest.mark.parametrize('args', [
+    ['testsolve', '--metric', 'TPATester', 'RPERLE'],
+    ['testsolve', '--metric', '--isp=2', 'TPATester', 'RPERLE'],
+    ['testsolve', '--isp=2', 'TPATester', 'RPERLE', '--metric'],
+    ])
+def test_bare_metric(args):
+    options = parse(args)
+    assert options['--metric'] == 'tester'
+    assert options['<tester>'] == 'TPATester'
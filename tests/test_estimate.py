@@ -0,0 +1,35 @@
+"""Tests that RASolver.estimate_many matches repeated estimate calls."""
+
+import pytest
+
+from pymoso.chnbase import BudgetExhausted
+from pymoso.chnutils import get_solv_prnstreams
+from pymoso.problems.probtpa import ProbTPA
+from pymoso.solvers import RPERLE
+
+## (60, 1) is infeasible, (3, 4) is feasible, and both repeat
+xlst = [(3, 4), (60, 1), (5, 5), (60, 1), (3, 4), (60, 1), (7, 7)]
+
+
+def make_solver(budget):
+    orcstream, solvstream = get_solv_prnstreams((1, 2, 3, 4, 5, 6), False)
+    solver = RPERLE(ProbTPA(orcstream), sprn=solvstream, x0=(3, 4), preempt=budget < float('inf'))
+    solver.m = 4
+    solver.budget = budget
+    return solver
+
+
+def run(solver, many):
+    try:
+        if many:
+            ests = solver.estimate_many(xlst, 30, 1)
+        else:
+            ests = [solver.estimate(x, 30, 1) for x in xlst]
+    except BudgetExhausted:
+        ests = None
+    return ests, solver.num_calls, solver.orc.rng.getstate(), solver.gbar
+
+
+@pytest.mark.parametrize('budget', [float('inf'), 8, 12])
+def test_estimate_many_matches_estimate(budget):
+    assert run(make_solver(budget), True) == run(make_solver(budget), False)
@@ -0,0 +1,30 @@
+"""Tests of par_runs."""
+
+from pymoso import chnutils
+from pymoso.solvers import RPERLE
+from pymoso.testers import TPATester
+
+
+def count_jobs(jobs, made):
+    for job in jobs:
+        made.append(job)
+        yield job
+
+
+def test_jobs_made_lazily():
+    isp = 12
+    orcstreams, solvstreams, x0stream, endseed = chnutils.get_testsolve_prnstreams(isp, (1, 2, 3, 4, 5, 6), False)
+    jobs = chnutils.get_testsolve_jobs(TPATester, RPERLE, (0, ), 300, isp, True, False, [], orcstreams, solvstreams, x0stream)
+    made = []
+    first = []
+    done = []
+
+    def sink(i, rundat):
+        if not first:
+            first.append(len(made))
+        done.append(i)
+
+    chnutils.par_runs(count_jobs(jobs, made), 2, sink)
+    ## the window holds (num_proc + 1)*chunksize jobs
+    assert first[0] <= 3
+    assert sorted(done) == list(range(isp))
@@ -0,0 +1,20 @@
+"""Tests of parallel searches of RASolvers."""
+
+import subprocess
+import sys
+
+
+def test_parsearch_with_simpar_finishes():
+    # the searches would run in pool processes whose oracles cannot
+    # start pools of their own, so they must fall back to serial
+    code = '\n'.join([
+        'from pymoso.chnutils import solve',
+        'from pymoso.problems.probtpa import ProbTPA',
+        'from pymoso.solvers import RPERLE',
+        'kw = dict(budget=300, seed=(1, 2, 3, 4, 5, 6), simpar=2, workers=2)',
+        'a = solve(ProbTPA, RPERLE, (3, 4), parsearch=True, **kw)',
+        'b = solve(ProbTPA, RPERLE, (3, 4), parsearch=False, **kw)',
+        'assert a == b',
+        ])
+    res = subprocess.run([sys.executable, '-c', code], timeout=120)
+    assert res.returncode == 0
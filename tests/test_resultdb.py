@@ -0,0 +1,27 @@
+"""Tests of the results database of the testsolve command."""
+
+import sqlite3
+
+from pymoso.commands import basecomm
+from pymoso.commands import testsolve
+
+options = {'--budget': '300', '--time-budget': None, '--seed': False, '<s>': [], '--crn': False, '--param': [], '<param>': [], '<val>': [], '--simpar': '1', '--proc': '2', '--isp': '4', '--chunk': '1', '--metric': None, '<tester>': 'TPATester', '<solver>': 'RPERLE', '<x>': [], '--format': 'bin', '--resume': False, '--odir': 'exp', '--db': 'res.db'}
+
+
+def test_db_error_keeps_files(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    calls = []
+
+    def add_run(self, *args):
+        calls.append(args)
+        raise sqlite3.OperationalError('database is locked')
+
+    monkeypatch.setattr(basecomm.ResultDB, 'add_run', add_run)
+    testsolve.TestSolve(options).run()
+    out = capsys.readouterr().out
+    ## the database is dropped after its first error
+    assert len(calls) == 1
+    assert out.count('database is locked') == 1
+    assert '-- Done!' in out
+    assert basecomm.RunFile('exp').isps() == list(range(4))
+    assert (tmp_path / 'exp' / 'exp.txt').exists()
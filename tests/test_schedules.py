@@ -0,0 +1,37 @@
+"""Tests of custom sample size and search limit schedules."""
+
+from pymoso.chnutils import solve, Schedule, GeometricSchedule, SCHEDULES
+from pymoso.problems.probtpa import ProbTPA
+from pymoso.solvers import RPERLE
+
+
+class CountSchedule(Schedule):
+    calls = 0
+
+    def __call__(self, solver, nu, init, prev):
+        CountSchedule.calls += 1
+        return super().__call__(solver, nu, init, prev)
+
+
+kw = dict(budget=300, seed=(1, 2, 3, 4, 5, 6))
+
+
+def test_schedule_object():
+    CountSchedule.calls = 0
+    a = solve(ProbTPA, RPERLE, (3, 4), mschedule=CountSchedule('m', 1.3), **kw)
+    b = solve(ProbTPA, RPERLE, (3, 4), mschedule=GeometricSchedule('m', 1.3), **kw)
+    c = solve(ProbTPA, RPERLE, (3, 4), mschedule='geometric', mrate=1.3, **kw)
+    assert CountSchedule.calls > 0
+    assert a == b == c
+
+
+def test_registered_schedule():
+    CountSchedule.calls = 0
+    SCHEDULES['count'] = CountSchedule
+    try:
+        a = solve(ProbTPA, RPERLE, (3, 4), bschedule='count', **kw)
+    finally:
+        del SCHEDULES['count']
+    b = solve(ProbTPA, RPERLE, (3, 4), **kw)
+    assert CountSchedule.calls > 0
+    assert a == b
@@ -0,0 +1,39 @@
+"""Tests that parallel replications give the results of serial ones."""
+
+import pytest
+
+from pymoso import chnutils
+from pymoso.problems.probtpa import ProbTPA
+from pymoso.solvers import RPERLE
+from pymoso.testers import TPATester
+
+seed = (1, 2, 3, 4, 5, 6)
+
+
+def run_hits(simpar, crn):
+    orcstream, solvstream = chnutils.get_solv_prnstreams(seed, crn)
+    orc = ProbTPA(orcstream)
+    orc.set_crnflag(crn)
+    orc.simpar = simpar
+    out = []
+    for x, m in [((3, 4), 10), ((5, 5), 7), ((3, 4), 3), ((60, 1), 5), ((2, 9), 1)]:
+        out.append(orc.hit(x, m))
+    orc.crn_advance()
+    out.append(orc.hit((3, 4), 9))
+    return out
+
+
+def run_solve(simpar, crn):
+    return chnutils.solve(ProbTPA, RPERLE, (3, 4), budget=500, seed=seed, simpar=simpar, crn=crn)
+
+
+def run_testsolve(simpar, crn):
+    res, endseed = chnutils.testsolve(TPATester, RPERLE, (0, ), isp=2, proc=2, simpar=simpar, crn=crn, ranx0=True, budget=500, seed=seed)
+    return [(res[i]['itersoln'], res[i]['simcalls']) for i in sorted(res)]
+
+
+@pytest.mark.parametrize('crn', [False, True])
+@pytest.mark.parametrize('simpar', [1, 2, 3, 4])
+@pytest.mark.parametrize('run', [run_hits, run_solve, run_testsolve])
+def test_simpar_matches_serial(run, simpar, crn):
+    assert run(simpar, crn) == run(1, crn)